@@ -2,6 +2,7 @@
 
 import calendar
 import logging
+import re
 import sys
 from datetime import datetime, timezone
 from typing import IO, Any, Dict, List, Optional, TextIO, Tuple
@@ -30,6 +31,9 @@ CLOUD_INIT_JOURNALCTL_FMT = "%b %d %H:%M:%S.%f %Y"
 # other
 DEFAULT_FMT = "%b %d %H:%M:%S %Y"
 
+# Duration suffix of finish events, e.g. "(duration: 0.123s)"
+DURATION_RE = re.compile(r"\s*\(duration: ([0-9.]+)s\)$")
+
 
 def parse_timestamp(timestampstr: str) -> float:
     # default syslog time does not include the current year
@@ -174,6 +178,10 @@ def parse_ci_logline(line: str) -> Optional[Dict[str, Any]]:
     if event["event_type"] == "finish":
         result = event_description.split(":")[0]
         desc = event_description.split(result)[1].lstrip(":").strip()
+        duration = DURATION_RE.search(desc)
+        if duration:
+            event["duration"] = float(duration.group(1))
+            desc = desc[: duration.start()]
         event["result"] = result
         event["description"] = desc.strip()
 
@@ -102,6 +102,10 @@ def delta_seconds(t1: datetime.datetime, t2: datetime.datetime) -> float:
 
 
 def event_duration(start: Event, finish: Event) -> float:
+    # Prefer the duration measured by the event itself over the difference
+    # between log timestamps, which may be reported after the fact.
+    if "duration" in finish:
+        return float(finish["duration"])
     return delta_seconds(event_datetime(start), event_datetime(finish))
 
 
@@ -10,7 +10,7 @@ import os
 import sys
 import time
 
-from cloudinit import reporting, stages, util
+from cloudinit import net, reporting, stages, util
 from cloudinit.config.cc_install_hotplug import install_hotplug
 from cloudinit.event import EventScope, EventType
 from cloudinit.log import loggers
@@ -232,6 +232,8 @@ def try_hotplug(subsystem, event_handler, datasource) -> None:
             len(wait_times),
         )
         try:
+            # The hotplugged device may postdate an earlier snapshot
+            net.topology.invalidate()
             LOG.debug("Refreshing metadata")
             event_handler.update_metadata()
             if not datasource.skip_hotplug_detect:
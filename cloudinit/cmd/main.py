@@ -19,14 +19,12 @@ import sys
 import traceback
 import logging
 import yaml
-from typing import Any, Optional, Tuple, Callable, Union
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Callable, Union
 
-from cloudinit import features, netinfo
+from cloudinit import features
 from cloudinit import signal_handler
-from cloudinit import sources
 from cloudinit import socket
-from cloudinit import stages
-from cloudinit import url_helper
+from cloudinit import subp
 from cloudinit import util
 from cloudinit import performance
 from cloudinit import version
@@ -34,12 +32,7 @@ from cloudinit import warnings
 from cloudinit import reporting
 from cloudinit import atomic_helper
 from cloudinit import lifecycle
-from cloudinit import handlers
 from cloudinit.log import log_util, loggers
-from cloudinit.cmd.devel import read_cfg_paths
-from cloudinit.config import cc_set_hostname
-from cloudinit.config.modules import Modules
-from cloudinit.config.schema import validate_cloudconfig_schema
 from cloudinit.lifecycle import log_with_downgradable_level
 from cloudinit.reporting import events
 from cloudinit.settings import (
@@ -49,6 +42,12 @@ from cloudinit.settings import (
     CLOUD_CONFIG,
 )
 
+if TYPE_CHECKING:
+    # Boot stage dependencies are imported by the handlers which need them,
+    # so that other subcommands do not pay their import cost.
+    from cloudinit import sources, stages
+    from cloudinit.config.modules import Modules
+
 Reason = str
 
 # Welcome message template
@@ -170,7 +169,7 @@ def extract_fns(args):
     return fn_cfgs
 
 
-def run_module_section(mods: Modules, action_name, section):
+def run_module_section(mods: "Modules", action_name, section):
     full_section_name = MOD_SECTION_TPL % (section)
     (which_ran, failures) = mods.run_section(full_section_name)
     total_attempted = len(which_ran) + len(failures)
@@ -257,6 +256,8 @@ def attempt_cmdline_url(path, network=True, cmdline=None) -> Tuple[int, str]:
         level = logging.DEBUG
         kwargs["sec_between"] = 0.1
 
+    from cloudinit import url_helper
+
     data = None
     header = b"#cloud-config"
     try:
@@ -365,6 +366,8 @@ def _should_wait_via_user_data(
     if not raw_config:
         return False, "no configuration found"
 
+    from cloudinit import handlers
+
     # Since this could be some arbitrarily large blob of binary data,
     # such as a gzipped file, only grab enough to inspect the header.
     # Since we can get a header like #cloud-config-archive, make sure
@@ -407,7 +410,7 @@ def _should_wait_via_user_data(
 
 
 def _should_wait_on_network(
-    datasource: Optional[sources.DataSource],
+    datasource: Optional["sources.DataSource"],
 ) -> Tuple[bool, Reason]:
     """Determine if we should wait on network connectivity for cloud-init.
 
@@ -444,6 +447,10 @@ def _should_wait_on_network(
 
 
 def main_init(name, args):
+    from cloudinit import net, netinfo, sources, stages
+    from cloudinit.config.modules import Modules
+    from cloudinit.config.schema import validate_cloudconfig_schema
+
     deps = [sources.DEP_FILESYSTEM, sources.DEP_NETWORK]
     if args.local:
         deps = [sources.DEP_FILESYSTEM]
@@ -475,6 +482,8 @@ def main_init(name, args):
     init = stages.Init(ds_deps=deps, reporter=args.reporter)
     # Stage 1
     init.read_cfg(extract_fns(args))
+    subp.configure_probe_cache(init.cfg.get("probe_cache"))
+    net.configure_topology_cache(init.cfg.get("probe_cache"))
     # Stage 2
     outfmt = None
     errfmt = None
@@ -729,6 +738,8 @@ def di_report_warn(datasource, cfg):
         LOG.warning("di_report/datasource_list not a list: %s", dslist)
         return
 
+    from cloudinit import sources
+
     # ds.__module__ is like cloudinit.sources.DataSourceName
     # where Name is the thing that shows up in datasource_list.
     modname = datasource.__module__.rpartition(".")[2]
@@ -767,11 +778,16 @@ def main_modules(action_name, args):
     #    the modules objects configuration
     # 5. Run the modules for the given stage name
     # 6. Done!
+    from cloudinit import net, sources, stages
+    from cloudinit.config.modules import Modules
+
     bootstage_name = "%s:%s" % (action_name, name)
     w_msg = welcome_format(bootstage_name)
     init = stages.Init(ds_deps=[], reporter=args.reporter)
     # Stage 1
     init.read_cfg(extract_fns(args))
+    subp.configure_probe_cache(init.cfg.get("probe_cache"))
+    net.configure_topology_cache(init.cfg.get("probe_cache"))
     # Stage 2
     try:
         init.fetch(existing="trust")
@@ -829,11 +845,16 @@ def main_single(name, args):
     #    the modules objects configuration
     # 5. Run the single module
     # 6. Done!
+    from cloudinit import net, sources, stages
+    from cloudinit.config.modules import Modules
+
     mod_name = args.name
     w_msg = welcome_format(name)
     init = stages.Init(ds_deps=[], reporter=args.reporter)
     # Stage 1
     init.read_cfg(extract_fns(args))
+    subp.configure_probe_cache(init.cfg.get("probe_cache"))
+    net.configure_topology_cache(init.cfg.get("probe_cache"))
     # Stage 2
     try:
         init.fetch(existing="trust")
@@ -891,6 +912,8 @@ def main_single(name, args):
 
 
 def status_wrapper(name, args):
+    from cloudinit.cmd.devel import read_cfg_paths
+
     paths = read_cfg_paths()
     data_d = paths.get_cpath("data")
     link_d = os.path.normpath(paths.run_dir)
@@ -1050,7 +1073,7 @@ def status_wrapper(name, args):
     return len(v1[mode]["errors"])
 
 
-def _maybe_persist_instance_data(init: stages.Init):
+def _maybe_persist_instance_data(init: "stages.Init"):
     """Write instance-data.json file if absent and datasource is restored."""
     if init.datasource and init.ds_restored:
         instance_data_file = init.paths.get_runpath("instance_data")
@@ -1064,6 +1087,8 @@ def _maybe_set_hostname(init, stage, retry_stage):
     @param stage: String representing current stage in which we are running.
     @param retry_stage: String represented logs upon error setting hostname.
     """
+    from cloudinit.config import cc_set_hostname
+
     cloud = init.cloudify()
     (hostname, _fqdn, _) = util.get_hostname_fqdn(
         init.cfg, cloud, metadata_only=True
@@ -1085,10 +1110,28 @@ def main_features(name, args):
     sys.stdout.write("\n".join(sorted(version.FEATURES)) + "\n")
 
 
+def report_import_times(
+    profiler: performance.ImportProfiler, reporter: events.ReportEventStack
+):
+    """Publish the import time of each top-level module as an event."""
+    for timing in profiler.collect():
+        event_name = "%s/import-%s" % (reporter.fullname, timing.name)
+        description = "importing %s" % timing.name
+        events.report_start_event(event_name, description)
+        events.report_finish_event(
+            event_name, description, duration=timing.duration
+        )
+
+
 def main(sysv_args=None):
     loggers.configure_root_logger()
     if not sysv_args:
         sysv_args = sys.argv
+    import_profiler = None
+    if "--profile-imports" in sysv_args:
+        # Start before any subcommand parsers or handlers are imported
+        import_profiler = performance.ImportProfiler()
+        import_profiler.start()
     parser = SubcommandAwareArgumentParser(prog=sysv_args.pop(0))
 
     # Top level args
@@ -1128,7 +1171,18 @@ def main(sysv_args=None):
         default=False,
     )
 
-    parser.set_defaults(reporter=None)
+    parser.add_argument(
+        "--profile-imports",
+        dest="profile_imports",
+        action="store_true",
+        help=(
+            "Report the time taken to import each module as reporting"
+            " events (default: %(default)s)."
+        ),
+        default=False,
+    )
+
+    parser.set_defaults(reporter=None, import_profiler=import_profiler)
     subparsers = parser.add_subparsers(title="Subcommands", dest="subcommand")
 
     # Each action and its sub-options (if any)
@@ -1322,9 +1376,13 @@ def main(sysv_args=None):
 
     args = parser.parse_args(args=sysv_args)
     setattr(args, "skip_log_setup", False)
-    if not args.all_stages:
-        return sub_main(args, parser)
-    return all_stages(parser)
+    try:
+        if not args.all_stages:
+            return sub_main(args, parser)
+        return all_stages(parser)
+    finally:
+        if import_profiler:
+            import_profiler.stop()
 
 
 def all_stages(parser):
@@ -1447,6 +1505,8 @@ def sub_main(args, parser):
         rdesc = "running 'cloud-init %s'" % name
         report_on = False
 
+    if args.import_profiler:
+        report_on = True
     args.reporter = events.ReportEventStack(
         rname, rdesc, reporting_enabled=report_on
     )
@@ -1454,6 +1514,10 @@ def sub_main(args, parser):
     with args.reporter:
         with performance.Timed(f"cloud-init stage: '{rname}'"):
             retval = functor(name, args)
+        if args.import_profiler:
+            report_import_times(args.import_profiler, args.reporter)
+    if subp.probe_cache.enabled:
+        LOG.debug("Subprocess probe cache: %s", subp.probe_cache.stats())
     reporting.flush_events()
 
     # handle return code for main_modules, as it is not wrapped by
@@ -58,6 +58,7 @@ def handle(name: str, cfg: Config, cloud: Cloud, args: list) -> None:
                     mkpart(disk, definition)
             except Exception as e:
                 util.logexc(LOG, "Failed partitioning operation\n%s" % e)
+            util.block_devices.invalidate()
 
     fs_setup = cfg.get("fs_setup")
     if isinstance(fs_setup, list):
@@ -73,6 +74,7 @@ def handle(name: str, cfg: Config, cloud: Cloud, args: list) -> None:
                     mkfs(definition)
             except Exception as e:
                 util.logexc(LOG, "Failed during filesystem operation\n%s" % e)
+            util.block_devices.invalidate()
 
 
 def update_disk_setup_devices(disk_setup, tformer):
@@ -7,10 +7,14 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 
 import copy
+import importlib.util
+import json
 import logging
+import os
+from functools import lru_cache
 from inspect import signature
 from types import ModuleType
-from typing import Dict, List, NamedTuple, Optional
+from typing import Dict, List, NamedTuple, Optional, Union
 
 from cloudinit import (
     config,
@@ -48,14 +52,88 @@ RENAMED_MODULES = {
     "cc_ubuntu_advantage": "cc_ubuntu_pro",  # Renamed 24.1
 }
 
+# Module metadata index generated at build time by tools/gen-module-index.
+# Absent when running from a source tree, in which case every configured
+# module is imported up front to read its meta.
+MODULE_INDEX_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "module_index.json"
+)
+MODULE_INDEX_VERSION = 1
+
+
+class LazyModule:
+    """Stand-in for a cc_* module which is imported on first use.
+
+    The module's meta is served from the module index so that activation
+    and distro checks in run_section do not import modules which will be
+    skipped. Any other attribute access, such as handle, imports the module.
+    """
+
+    def __init__(self, module_name: str, meta: dict):
+        self.__name__ = module_name
+        self.meta = meta
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, name):
+        if self._module is None:
+            module = importer.import_module(self.__name__)
+            validate_module(module, self.__name__)
+            self._module = module
+        return getattr(self._module, name)
+
+    def __repr__(self):
+        return "<lazy module '%s'>" % self.__name__
+
 
 class ModuleDetails(NamedTuple):
-    module: ModuleType
+    module: Union[ModuleType, LazyModule]
     name: str
     frequency: str
     run_args: List[str]
 
 
+def generate_module_index() -> dict:
+    """Return the metadata index of all cc_* modules shipped in config."""
+    modules = {}
+    config_dir = os.path.dirname(os.path.abspath(__file__))
+    for mod_name in sorted(util.get_modules_from_dir(config_dir).values()):
+        if not mod_name.startswith(MOD_PREFIX):
+            continue
+        mod = importer.import_module(
+            "%s.%s" % (type_utils.obj_name(config), mod_name)
+        )
+        validate_module(mod, mod_name)
+        modules[mod_name] = {
+            "distros": list(mod.meta["distros"]),
+            "frequency": mod.meta["frequency"],
+            "activate_by_schema_keys": list(
+                mod.meta.get("activate_by_schema_keys", [])
+            ),
+        }
+    return {"version": MODULE_INDEX_VERSION, "modules": modules}
+
+
+@lru_cache()
+def read_module_index(index_file: str = MODULE_INDEX_FILE) -> Dict[str, dict]:
+    """Return the module metadata index keyed by module name.
+
+    An empty dict is returned when the index is absent or unusable.
+    """
+    try:
+        index = json.loads(util.load_text_file(index_file))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        LOG.warning("Ignoring invalid module index %s: %s", index_file, e)
+        return {}
+    if not isinstance(index, dict) or (
+        index.get("version") != MODULE_INDEX_VERSION
+    ):
+        LOG.warning("Ignoring unsupported module index %s", index_file)
+        return {}
+    return index.get("modules", {})
+
+
 def form_module_name(name):
     canon_name = name.replace("-", "_")
     if canon_name.lower().endswith(".py"):
@@ -223,6 +301,19 @@ class Modules:
                     deprecated_version="24.1",
                 )
                 mod_name = RENAMED_MODULES[mod_name]
+            lazy_mod = self._lazy_module(mod_name)
+            if lazy_mod is not None:
+                if freq is None:
+                    freq = lazy_mod.meta["frequency"]
+                mostly_mods.append(
+                    ModuleDetails(
+                        module=lazy_mod,
+                        name=raw_name,
+                        frequency=freq,
+                        run_args=run_args,
+                    )
+                )
+                continue
             mod_locs, looked_locs = importer.find_module(
                 mod_name, ["", type_utils.obj_name(config)], ["handle"]
             )
@@ -255,6 +346,20 @@ class Modules:
             )
         return mostly_mods
 
+    @staticmethod
+    def _lazy_module(mod_name: str) -> Optional[LazyModule]:
+        """Return a LazyModule for mod_name when the module index covers it.
+
+        A same-named top-level module takes precedence over cloudinit.config
+        modules, so fall back to importing when one exists.
+        """
+        meta = read_module_index().get(mod_name)
+        if meta is None or importlib.util.find_spec(mod_name):
+            return None
+        return LazyModule(
+            "%s.%s" % (type_utils.obj_name(config), mod_name), meta
+        )
+
     def _run_modules(self, mostly_mods: List[ModuleDetails]):
         cc = self.init.cloudify()
         # Return which ones ran
@@ -13,10 +13,13 @@ from contextlib import suppress
 from copy import deepcopy
 from enum import Enum
 from errno import EACCES
-from functools import partial
+from functools import lru_cache, partial
 from typing import (
     TYPE_CHECKING,
+    Any,
     DefaultDict,
+    Dict,
+    FrozenSet,
     List,
     NamedTuple,
     Optional,
@@ -437,10 +440,12 @@ def _oneOf(
         yield from all_deprecations
 
 
+@lru_cache()
 def get_jsonschema_validator():
     """Get metaschema validator and format checker
 
-    Older versions of jsonschema require some compatibility changes.
+    Older versions of jsonschema require some compatibility changes. The
+    validator class is created once per process and reused.
 
     @returns: Tuple: (jsonschema.Validator, FormatChecker)
     @raises: ImportError when jsonschema is not present
@@ -677,7 +682,41 @@ def _resource_retriever(uri):
 
 
 def _get_validator(schema: dict, strict_metaschema: bool):
-    """Get a JSON schema validator for the given schema."""
+    """Get a JSON schema validator for the given schema.
+
+    Validators for schemas returned by get_schema are cached per
+    strict_metaschema value, so the schema is only checked against the
+    metaschema once per process.
+    """
+    cached = _get_cached_schema(schema)
+    if cached and strict_metaschema in cached.validators:
+        return cached.validators[strict_metaschema]
+    validator = _create_validator(schema, strict_metaschema)
+    if cached and validator:
+        cached.validators[strict_metaschema] = validator
+    return validator
+
+
+def _get_instance_validator(schema: dict, instance_schema: dict):
+    """Get a JSON schema validator for schema reduced to instance_schema.
+
+    Validators for reductions of schemas returned by get_schema are cached
+    by the allOf $refs kept, so configs providing keys of the same modules
+    share one validator.
+    """
+    cached = _get_cached_schema(schema)
+    if not cached:
+        return _create_validator(instance_schema, strict_metaschema=False)
+    key = frozenset(entry.get("$ref") for entry in instance_schema["allOf"])
+    if key not in cached.instance_validators:
+        # The full schema already passed any strict metaschema check
+        cached.instance_validators[key] = _create_validator(
+            instance_schema, strict_metaschema=False
+        )
+    return cached.instance_validators[key]
+
+
+def _create_validator(schema: dict, strict_metaschema: bool):
     try:
         (cloudinitValidator, FormatChecker) = get_jsonschema_validator()
         if strict_metaschema:
@@ -705,6 +744,49 @@ def _get_validator(schema: dict, strict_metaschema: bool):
     return validator
 
 
+def _is_top_level_only_ref(schema: dict, entry: dict) -> Optional[set]:
+    """Return property names of an allOf $ref which only describes them.
+
+    Such a subschema cannot fail validation for instances which do not
+    contain any of its properties. Return None for any other subschema.
+    """
+    ref = entry.get("$ref", "")
+    if set(entry) != {"$ref"} or not ref.startswith("#/$defs/"):
+        return None
+    subschema = schema.get("$defs", {}).get(ref[len("#/$defs/") :])
+    if not isinstance(subschema, dict) or set(subschema) - {
+        "type",
+        "properties",
+        "additionalProperties",
+    }:
+        return None
+    if subschema.get("type", "object") != "object":
+        return None
+    if subschema.get("additionalProperties", True) is not True:
+        return None
+    return set(subschema.get("properties", {}))
+
+
+def _get_instance_schema(schema: dict, config: Any) -> dict:
+    """Return schema without allOf subschemas irrelevant to config.
+
+    Subschemas which only describe top-level keys absent from config are
+    dropped, so that validation only visits keys actually provided.
+    """
+    if not isinstance(config, dict) or not isinstance(
+        schema.get("allOf"), list
+    ):
+        return schema
+    all_of = []
+    for entry in schema["allOf"]:
+        properties = _is_top_level_only_ref(schema, entry)
+        if properties is None or properties.intersection(config):
+            all_of.append(entry)
+    if len(all_of) == len(schema["allOf"]):
+        return schema
+    return {**schema, "allOf": all_of}
+
+
 @performance.timed("Validating schema")
 def validate_cloudconfig_schema(
     config: dict,
@@ -772,6 +854,10 @@ def validate_cloudconfig_schema(
     validator = _get_validator(schema, strict_metaschema)
     if not validator:
         return False
+    instance_schema = _get_instance_schema(schema, config)
+    if instance_schema is not schema:
+        validator = _get_instance_validator(schema, instance_schema)
+        schema = instance_schema
 
     errors: SchemaProblems = []
     deprecations: SchemaProblems = []
@@ -1214,16 +1300,43 @@ def get_schema_dir() -> str:
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemas")
 
 
+class _CachedSchema(NamedTuple):
+    stat: Tuple[int, int]
+    schema: dict
+    validators: Dict[bool, Any]
+    # Validators of schemas reduced by _get_instance_schema, keyed by the
+    # allOf $refs kept
+    instance_validators: Dict[FrozenSet[Optional[str]], Any]
+
+
+# Schema files already loaded by get_schema, keyed by path
+_SCHEMA_CACHE: Dict[str, _CachedSchema] = {}
+
+
+def _get_cached_schema(schema: dict) -> Optional[_CachedSchema]:
+    for cached in _SCHEMA_CACHE.values():
+        if cached.schema is schema:
+            return cached
+    return None
+
+
 def get_schema(schema_type: SchemaType = SchemaType.CLOUD_CONFIG) -> dict:
     """Return jsonschema for a specific type.
 
     Return empty schema when no specific schema file exists.
+
+    Schema files are only parsed again when they change on disk, so the
+    returned schema is shared between callers and must not be modified.
     """
     schema_file = os.path.join(
         get_schema_dir(), SCHEMA_FILES_BY_TYPE[schema_type]["latest"]
     )
-    full_schema = None
     try:
+        stat = os.stat(schema_file)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        cached = _SCHEMA_CACHE.get(schema_file)
+        if cached and cached.stat == stat_key:
+            return cached.schema
         full_schema = json.loads(load_text_file(schema_file))
     except (IOError, OSError):
         LOG.warning(
@@ -1232,6 +1345,7 @@ def get_schema(schema_type: SchemaType = SchemaType.CLOUD_CONFIG) -> dict:
             schema_file,
         )
         return {}
+    _SCHEMA_CACHE[schema_file] = _CachedSchema(stat_key, full_schema, {}, {})
     return full_schema
 
 
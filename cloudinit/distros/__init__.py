@@ -10,6 +10,8 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 
 import abc
+import hashlib
+import json
 import logging
 import os
 import re
@@ -33,8 +35,9 @@ from typing import (
     Union,
 )
 
-import cloudinit.net.netops.iproute2 as iproute2
+import cloudinit.net.netops.rtnetlink as rtnetlink
 from cloudinit import (
+    atomic_helper,
     helpers,
     importer,
     lifecycle,
@@ -45,6 +48,7 @@ from cloudinit import (
     temp_utils,
     type_utils,
     util,
+    version,
 )
 from cloudinit.distros.networking import LinuxNetworking, Networking
 from cloudinit.distros.package_management.package_manager import PackageManager
@@ -55,7 +59,7 @@ from cloudinit.lifecycle import log_with_downgradable_level
 from cloudinit.net import activators, dhcp, renderers
 from cloudinit.net.netops import NetOps
 from cloudinit.net.network_state import parse_net_config_data
-from cloudinit.net.renderer import Renderer
+from cloudinit.net.renderer import Renderer, hash_rendered_output
 
 # Used when a cloud-config module can be run on all cloud-init distributions.
 # The value 'all' is surfaced in module documentation for distro support.
@@ -147,7 +151,7 @@ class Distro(persistence.CloudInitPickleMixin, metaclass=abc.ABCMeta):
     # This is used by self.shutdown_command(), and can be overridden in
     # subclasses
     shutdown_options_map = {"halt": "-H", "poweroff": "-P", "reboot": "-r"}
-    net_ops: Type[NetOps] = iproute2.Iproute2
+    net_ops: Type[NetOps] = rtnetlink.Rtnetlink
 
     _ci_pkl_version = 1
     prefer_fqdn = False
@@ -169,7 +173,7 @@ class Distro(persistence.CloudInitPickleMixin, metaclass=abc.ABCMeta):
         self.name = name
         self.networking: Networking = self.networking_cls()
         self.dhcp_client_priority = dhcp.ALL_DHCP_CLIENTS
-        self.net_ops = iproute2.Iproute2
+        self.net_ops = rtnetlink.Rtnetlink
         self._runner = helpers.Runners(paths)
         self.package_managers: List[PackageManager] = []
         self._dhcp_client = None
@@ -318,7 +322,7 @@ class Distro(persistence.CloudInitPickleMixin, metaclass=abc.ABCMeta):
                 config_priority,
             )
             for client_configured in config_priority:
-                for client_class in dhcp.ALL_DHCP_CLIENTS:
+                for client_class in dhcp.CONFIGURABLE_DHCP_CLIENTS:
                     if client_configured == client_class.client_name:
                         found_clients.append(client_class)
                         break
@@ -450,11 +454,39 @@ class Distro(persistence.CloudInitPickleMixin, metaclass=abc.ABCMeta):
         devices is None, attempt to bring up devices returned by
         _write_network_config.
 
+        Rendering, and bringing up devices which were already brought up,
+        are skipped when the network state, renderer and rendered files are
+        unchanged since the config was last applied to this instance.
+
         Returns True if any devices failed to come up, otherwise False.
         """
         renderer = self.network_renderer
         network_state = parse_net_config_data(netconfig, renderer=renderer)
-        self._write_network_state(network_state, renderer)
+        fingerprint_file = self._network_fingerprint_file()
+        fingerprint, previous = {}, {}
+        if fingerprint_file:
+            fingerprint = self._network_fingerprint(renderer, network_state)
+            with suppress(FileNotFoundError, ValueError):
+                previous = util.load_json(
+                    util.load_text_file(fingerprint_file)
+                )
+        unchanged = bool(fingerprint) and all(
+            previous.get(key) == value for key, value in fingerprint.items()
+        )
+        brought_up = unchanged and previous.get("brought_up", False)
+        if unchanged and (brought_up or not bring_up):
+            LOG.debug(
+                "Network config is unchanged since it was last applied,"
+                " skipping rendering and bringing up interfaces"
+            )
+            return False
+        if unchanged:
+            LOG.debug(
+                "Network config is unchanged since it was last rendered,"
+                " skipping rendering"
+            )
+        else:
+            self._write_network_state(network_state, renderer)
 
         # Now try to bring them up
         if bring_up:
@@ -467,11 +499,64 @@ class Distro(persistence.CloudInitPickleMixin, metaclass=abc.ABCMeta):
                     "network interfaces"
                 )
                 return True
-            network_activator.bring_up_all_interfaces(network_state)
+            # Only remember a successful bring up so hotplug retries it
+            brought_up = bool(
+                network_activator.bring_up_all_interfaces(network_state)
+            )
         else:
             LOG.debug("Not bringing up newly configured network interfaces")
+
+        if fingerprint_file:
+            fingerprint = self._network_fingerprint(renderer, network_state)
+            if fingerprint:
+                fingerprint["brought_up"] = brought_up
+                atomic_helper.write_json(
+                    fingerprint_file, fingerprint, mode=0o600
+                )
         return False
 
+    def _network_fingerprint_file(self) -> Optional[str]:
+        """Return where the last applied network config is fingerprinted.
+
+        Only once the instance dir exists, so a new instance always renders.
+        """
+        if not isinstance(self._paths, helpers.Paths) or not os.path.islink(
+            self._paths.instance_link
+        ):
+            return None
+        return self._paths.get_ipath_cur("network_fingerprint")
+
+    def _network_fingerprint(self, renderer: Renderer, network_state) -> dict:
+        """Return what the network config renders to, or {} when the
+        renderer doesn't declare its output and must always render.
+
+        The cloud-init version and renderer config are included, as either
+        may change what the same network state renders to.
+        """
+        output = hash_rendered_output(renderer)
+        if not output:
+            return {}
+        renderer_module = type(renderer).__module__
+        renderer_config = next(
+            (
+                self.renderer_configs.get(name)
+                for name, module in renderers.NAME_TO_RENDERER.items()
+                if module.__name__ == renderer_module
+            ),
+            None,
+        )
+        return {
+            "version": version.version_string(),
+            "renderer": renderer_module,
+            "renderer_config": hashlib.sha256(
+                json.dumps(
+                    renderer_config, sort_keys=True, default=str
+                ).encode()
+            ).hexdigest(),
+            "network_state": network_state.fingerprint(),
+            "output": output,
+        }
+
     @abc.abstractmethod
     def apply_locale(self, locale, out_fn=None):
         raise NotImplementedError()
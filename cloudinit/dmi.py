@@ -132,7 +132,7 @@ def _read_kenv(key: str) -> Optional[str]:
 
     try:
         cmd = ["kenv", "-q", kmap.freebsd]
-        result = subp.subp(cmd).stdout.strip()
+        result = subp.probe(cmd).stdout.strip()
         LOG.debug("kenv returned '%s' for '%s'", result, kmap.freebsd)
         return result
     except subp.ProcessExecutionError as e:
@@ -153,7 +153,7 @@ def _read_sysctl(key: str) -> Optional[str]:
 
     try:
         cmd = ["sysctl", "-qn", kmap.openbsd]
-        result = subp.subp(cmd).stdout.strip()
+        result = subp.probe(cmd).stdout.strip()
         LOG.debug("sysctl returned '%s' for '%s'", result, kmap.openbsd)
         return result
     except subp.ProcessExecutionError as e:
@@ -169,7 +169,7 @@ def _call_dmidecode(key: str, dmidecode_path: str) -> Optional[str]:
     """
     try:
         cmd = [dmidecode_path, "--string", key]
-        result = subp.subp(cmd).stdout.strip()
+        result = subp.probe(cmd).stdout.strip()
         LOG.debug("dmidecode returned '%s' for '%s'", result, key)
         if result.replace(".", "") == "":
             return ""
@@ -335,6 +335,8 @@ class Paths(persistence.CloudInitPickleMixin):
             "instance_data_sensitive": "instance-data-sensitive.json",
             "combined_cloud_config": "combined-cloud-config.json",
             "network_config": "network-config.json",
+            # Fingerprint of the last network config rendered and brought up
+            "network_fingerprint": "network-fingerprint.json",
             "instance_id": ".instance-id",
             "manual_clean_marker": "manual-clean",
             "obj_pkl": "obj.pkl",
@@ -11,7 +11,9 @@ import ipaddress
 import logging
 import os
 import re
-from typing import Callable, Dict, List, Optional, Tuple
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
 
 from cloudinit import subp, util
 from cloudinit.net.netops.iproute2 import Iproute2
@@ -123,6 +125,215 @@ def read_sys_net_int(iface, field):
         return None
 
 
+class NetDevice(NamedTuple):
+    """The sysfs attributes of a network interface read for a snapshot.
+
+    Link state (operstate, carrier and dormant) changes as interfaces are
+    brought up, so it is not part of the snapshot and is always read from
+    sysfs.
+    """
+
+    name: str
+    # address, or bonding_slave/perm_hwaddr for a bond slave
+    mac: Optional[str]
+    addr_assign_type: Optional[int]
+    type: Optional[str]
+    name_assign_type: Optional[str]
+    devtype: Optional[str]
+    is_bridge: bool
+    is_bond: bool
+    master: Optional[str]
+    has_upper_ovs_system: bool
+    driver: Optional[str]
+    device_id: Optional[str]
+    features: str
+
+
+def _read_sysfs_attr(path: str) -> Optional[str]:
+    """Return the stripped contents of a sysfs attribute, or None."""
+    try:
+        with open(path, "rb") as stream:
+            return stream.read().decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+
+
+def _read_sysfs_int(path: str) -> Optional[int]:
+    value = _read_sysfs_attr(path)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _read_net_device(entry: os.DirEntry) -> NetDevice:
+    """Read every attribute NetTopologySnapshot answers for one device."""
+    dev_path = entry.path
+    try:
+        children = set(os.listdir(dev_path))
+    except OSError:
+        children = set()
+
+    def attr(path):
+        return _read_sysfs_attr(os.path.join(dev_path, path))
+
+    if "bonding_slave" in children and os.path.isdir(
+        os.path.join(dev_path, "bonding_slave")
+    ):
+        mac = attr("bonding_slave/perm_hwaddr")
+    else:
+        mac = attr("address")
+
+    devtype = None
+    for line in (attr("uevent") or "").splitlines():
+        if line.startswith("DEVTYPE="):
+            devtype = line[len("DEVTYPE=") :]
+
+    master = None
+    if "master" in children:
+        master = os.path.basename(
+            os.path.realpath(os.path.join(dev_path, "master"))
+        )
+
+    driver = None
+    device_id = None
+    features = ""
+    if "device" in children:
+        driver_path = os.path.join(dev_path, "device", "driver")
+        if os.path.islink(driver_path):
+            driver = os.path.basename(os.readlink(driver_path))
+        device_id = attr("device/device")
+        features = attr("device/features") or ""
+
+    return NetDevice(
+        name=entry.name,
+        mac=mac,
+        addr_assign_type=_read_sysfs_int(
+            os.path.join(dev_path, "addr_assign_type")
+        ),
+        type=attr("type"),
+        name_assign_type=attr("name_assign_type"),
+        devtype=devtype,
+        is_bridge="bridge" in children,
+        is_bond="bonding" in children,
+        master=master,
+        has_upper_ovs_system="upper_ovs-system" in children,
+        driver=driver,
+        device_id=device_id,
+        features=features,
+    )
+
+
+class NetTopologySnapshot:
+    """An immutable view of the network interfaces in sysfs.
+
+    All interfaces and the attributes cloud-init queries are read in a single
+    pass over /sys/class/net, then indexed by name, MAC address, driver and
+    master device.
+    """
+
+    def __init__(self, devices: List[NetDevice]):
+        by_mac: Dict[str, List[str]] = {}
+        by_driver: Dict[str, List[str]] = {}
+        by_master: Dict[str, List[str]] = {}
+        for device in devices:
+            if device.mac:
+                by_mac.setdefault(device.mac.lower(), []).append(device.name)
+            if device.driver:
+                by_driver.setdefault(device.driver, []).append(device.name)
+            if device.master:
+                by_master.setdefault(device.master, []).append(device.name)
+        self.by_name: Mapping[str, NetDevice] = MappingProxyType(
+            {device.name: device for device in devices}
+        )
+        self.by_mac: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {mac: tuple(names) for mac, names in by_mac.items()}
+        )
+        self.by_driver: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {driver: tuple(names) for driver, names in by_driver.items()}
+        )
+        self.by_master: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {master: tuple(names) for master, names in by_master.items()}
+        )
+
+    @classmethod
+    def read(cls, sys_class_net: str) -> "NetTopologySnapshot":
+        try:
+            with os.scandir(sys_class_net) as entries:
+                devices = [_read_net_device(entry) for entry in entries]
+        except FileNotFoundError:
+            devices = []
+        return cls(devices)
+
+    def names(self) -> List[str]:
+        return list(self.by_name)
+
+
+class NetTopologyCache:
+    """Hold one NetTopologySnapshot while enabled.
+
+    While enabled, the sysfs query helpers in this module answer from the
+    snapshot, which is read on first use. Code that renames interfaces or
+    handles hotplug events must call invalidate().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.scans = 0
+        self._snapshot: Optional[NetTopologySnapshot] = None
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.invalidate()
+
+    def invalidate(self):
+        """Read sysfs again on the next query."""
+        with self._lock:
+            self._snapshot = None
+
+    def get(self) -> Optional[NetTopologySnapshot]:
+        """Return the current snapshot, or None when disabled."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = NetTopologySnapshot.read(get_sys_class_path())
+                self.scans += 1
+            return self._snapshot
+
+
+topology = NetTopologyCache()
+
+
+def configure_topology_cache(scope: Optional[str]):
+    """Enable or disable the topology cache for the current boot stage.
+
+    :param scope: a probe_cache scope. "stage" reads sysfs again in each
+        stage, "boot" keeps the snapshot until it is invalidated. Any other
+        value disables the cache.
+    """
+    if scope not in subp.PROBE_CACHE_SCOPES:
+        topology.disable()
+        return
+    if scope == "stage":
+        topology.invalidate()
+    topology.enable()
+
+
+def _topology_device(devname) -> Optional[NetDevice]:
+    """Return the snapshot of devname, if the topology cache is enabled."""
+    snapshot = topology.get()
+    if snapshot is None:
+        return None
+    return snapshot.by_name.get(devname)
+
+
 def is_up(devname):
     # The linux kernel says to consider devices in 'unknown'
     # operstate as up for the purposes of network configuration. See
@@ -132,16 +343,25 @@ def is_up(devname):
 
 
 def is_bridge(devname):
+    device = _topology_device(devname)
+    if device is not None:
+        return device.is_bridge
     return os.path.exists(sys_dev_path(devname, "bridge"))
 
 
 def is_bond(devname):
+    device = _topology_device(devname)
+    if device is not None:
+        return device.is_bond
     return os.path.exists(sys_dev_path(devname, "bonding"))
 
 
 def get_master(devname):
     """Return the master path for devname, or None if no master"""
     path = sys_dev_path(devname, path="master")
+    device = _topology_device(devname)
+    if device is not None:
+        return path if device.master is not None else None
     if os.path.exists(path):
         return path
     return None
@@ -152,6 +372,11 @@ def master_is_bridge_or_bond(devname):
     master_path = get_master(devname)
     if master_path is None:
         return False
+    device = _topology_device(devname)
+    if device is not None and device.master is not None:
+        master = _topology_device(device.master)
+        if master is not None:
+            return master.is_bond or master.is_bridge
     bonding_path = os.path.join(master_path, "bonding")
     bridge_path = os.path.join(master_path, "bridge")
     return os.path.exists(bonding_path) or os.path.exists(bridge_path)
@@ -162,11 +387,17 @@ def master_is_openvswitch(devname):
     master_path = get_master(devname)
     if master_path is None:
         return False
+    device = _topology_device(devname)
+    if device is not None:
+        return device.has_upper_ovs_system
     ovs_path = sys_dev_path(devname, path="upper_ovs-system")
     return os.path.exists(ovs_path)
 
 
 def is_ib_interface(devname):
+    device = _topology_device(devname)
+    if device is not None:
+        return device.type == "32"
     return read_sys_net_safe(devname, "type") == "32"
 
 
@@ -232,6 +463,9 @@ def is_netfailover(devname, driver=None):
 
 def get_dev_features(devname):
     """Returns a str from reading /sys/class/net/<devname>/device/features."""
+    device = _topology_device(devname)
+    if device is not None:
+        return device.features
     features = ""
     try:
         features = read_sys_net(devname, "device/features")
@@ -288,8 +522,8 @@ def is_netfail_primary(devname, driver=None):
     Return True if all of the above is True.
     """
     # /sys/class/net/<devname>/master -> ../../<master devname>
-    master_sysfs_path = sys_dev_path(devname, path="master")
-    if not os.path.exists(master_sysfs_path):
+    master_sysfs_path = get_master(devname)
+    if master_sysfs_path is None:
         return False
 
     if driver is None:
@@ -298,7 +532,11 @@ def is_netfail_primary(devname, driver=None):
     if driver == "virtio_net":
         return False
 
-    master_devname = os.path.basename(os.path.realpath(master_sysfs_path))
+    device = _topology_device(devname)
+    if device is not None and device.master is not None:
+        master_devname = device.master
+    else:
+        master_devname = os.path.basename(os.path.realpath(master_sysfs_path))
     master_driver = device_driver(master_devname)
     if master_driver != "virtio_net":
         return False
@@ -343,19 +581,29 @@ def is_renamed(devname):
     #define NET_NAME_USER         3  /* provided by user-space */
     #define NET_NAME_RENAMED      4  /* renamed by user-space */
     """
-    name_assign_type = read_sys_net_safe(devname, "name_assign_type")
+    device = _topology_device(devname)
+    if device is not None:
+        name_assign_type = device.name_assign_type
+    else:
+        name_assign_type = read_sys_net_safe(devname, "name_assign_type")
     if name_assign_type and name_assign_type in ["3", "4"]:
         return True
     return False
 
 
 def is_vlan(devname):
+    device = _topology_device(devname)
+    if device is not None:
+        return device.devtype == "vlan"
     uevent = str(read_sys_net_safe(devname, "uevent"))
     return "DEVTYPE=vlan" in uevent.splitlines()
 
 
 def device_driver(devname):
     """Return the device driver for net device named 'devname'."""
+    device = _topology_device(devname)
+    if device is not None:
+        return device.driver
     driver = None
     driver_path = sys_dev_path(devname, "device/driver")
     # driver is a symlink to the driver *dir*
@@ -367,6 +615,9 @@ def device_driver(devname):
 
 def device_devid(devname):
     """Return the device id string for net device named 'devname'."""
+    device = _topology_device(devname)
+    if device is not None:
+        return device.device_id
     dev_id = read_sys_net_safe(devname, "device/device")
     if dev_id is False:
         return None
@@ -378,6 +629,9 @@ def get_devicelist():
     if util.is_FreeBSD() or util.is_DragonFlyBSD():
         return list(get_interfaces_by_mac().values())
 
+    snapshot = topology.get()
+    if snapshot is not None:
+        return snapshot.names()
     try:
         devs = os.listdir(get_sys_class_path())
     except OSError as e:
@@ -497,6 +751,8 @@ def find_candidate_nics_on_linux() -> List[str]:
                     error.stdout,
                     error.exit_code,
                 )
+            # udev may have renamed interfaces while settling
+            topology.invalidate()
 
     # sort into interfaces with carrier, interfaces which could have carrier,
     # and ignore interfaces that are definitely disconnected
@@ -649,7 +905,11 @@ def interface_has_own_mac(ifname, strict=False):
       0: permanent address    2: stolen from another device
     1: randomly generated   3: set using dev_set_mac_address"""
 
-    assign_type = read_sys_net_int(ifname, "addr_assign_type")
+    device = _topology_device(ifname)
+    if device is not None:
+        assign_type = device.addr_assign_type
+    else:
+        assign_type = read_sys_net_int(ifname, "addr_assign_type")
     if assign_type is None:
         # None is returned if this nic had no 'addr_assign_type' entry.
         # if strict, raise an error, if not return True.
@@ -859,12 +1119,17 @@ def _rename_interfaces(
                     % (op, params, mac, new_name, e)
                 )
 
+        topology.invalidate()
+
     if len(errors):
         raise RuntimeError("\n".join(errors))
 
 
 def get_interface_mac(ifname):
     """Returns the string value of an interface's MAC Address"""
+    device = _topology_device(ifname)
+    if device is not None:
+        return device.mac if device.mac is not None else False
     path = "address"
     if os.path.isdir(sys_dev_path(ifname, "bonding_slave")):
         # for a bond slave, get the nic's hwaddress, not the address it
@@ -879,7 +1144,7 @@ def get_ib_interface_hwaddr(ifname, ethernet_format):
     representation of the address will be returned.
     """
     # Type 32 is Infiniband.
-    if read_sys_net_safe(ifname, "type") == "32":
+    if is_ib_interface(ifname):
         mac = get_interface_mac(ifname)
         if mac and ethernet_format:
             # Use bytes 13-15 and 18-20 of the hardware address.
@@ -1,8 +1,9 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Callable, Dict, Iterable, List, Optional, Type
+from typing import Callable, Dict, Iterable, List, Optional, Set, Type
 
 from cloudinit import subp, util
 from cloudinit.net import eni, netplan, network_manager, networkd
@@ -11,6 +12,9 @@ from cloudinit.net.network_state import NetworkState
 
 LOG = logging.getLogger(__name__)
 
+# Most interfaces brought up at once, each may block on link or DHCP
+MAX_BRING_UP_WORKERS = 8
+
 
 class NoActivatorException(Exception):
     pass
@@ -42,6 +46,42 @@ def _alter_interface_callable(
         return False
 
 
+def _bring_up_order(network_state: NetworkState) -> List[List[str]]:
+    """Group interfaces so each only depends on those in earlier groups.
+
+    Bond members come before their bond, bridge ports before their bridge
+    and a vlan's raw device before the vlan.
+    """
+    interfaces = list(network_state.iter_interfaces())
+    depends: Dict[str, Set[str]] = {
+        iface["name"]: set() for iface in interfaces
+    }
+    for iface in interfaces:
+        if iface.get("vlan-raw-device"):
+            depends[iface["name"]].add(iface["vlan-raw-device"])
+        depends[iface["name"]].update(iface.get("bridge_ports") or [])
+        if iface.get("bond-master") in depends:
+            depends[iface["bond-master"]].add(iface["name"])
+    for needs in depends.values():
+        # Ignore devices outside of the config, such as existing links
+        needs.intersection_update(depends)
+
+    order: List[List[str]] = []
+    done: Set[str] = set()
+    while len(done) < len(depends):
+        ready = [
+            name
+            for name, needs in depends.items()
+            if name not in done and needs <= done
+        ]
+        if not ready:
+            # A dependency cycle can't be ordered, bring the rest up last
+            ready = [name for name in depends if name not in done]
+        order.append(ready)
+        done.update(ready)
+    return order
+
+
 class NetworkActivator(ABC):
     @staticmethod
     @abstractmethod
@@ -79,11 +119,18 @@ class NetworkActivator(ABC):
     def bring_up_all_interfaces(cls, network_state: NetworkState) -> bool:
         """Bring up all interfaces.
 
+        Interfaces are brought up concurrently once the interfaces they
+        depend on are up.
+
         Return True is successful, otherwise return False
         """
-        return cls.bring_up_interfaces(
-            [i["name"] for i in network_state.iter_interfaces()]
-        )
+        results: List[bool] = []
+        for group in _bring_up_order(network_state):
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_BRING_UP_WORKERS, len(group))
+            ) as executor:
+                results.extend(executor.map(cls.bring_up_interface, group))
+        return all(results)
 
     @staticmethod
     def wait_for_network() -> None:
@@ -186,12 +233,8 @@ class NetworkManagerActivator(NetworkActivator):
         cmd = ["nmcli", "device", "disconnect", device_name]
         return _alter_interface(cmd, device_name)
 
-    @classmethod
-    def bring_up_interfaces(cls, device_names: Iterable[str]) -> bool:
-        """Activate network
-
-        Return True on success
-        """
+    @staticmethod
+    def _reload_network_manager() -> bool:
         state = subp.subp(
             [
                 "systemctl",
@@ -208,7 +251,28 @@ class NetworkManagerActivator(NetworkActivator):
         return _alter_interface(
             ["systemctl", "try-reload-or-restart", "NetworkManager.service"],
             "all",
-        ) and all(cls.bring_up_interface(device) for device in device_names)
+        )
+
+    @classmethod
+    def bring_up_interfaces(cls, device_names: Iterable[str]) -> bool:
+        """Activate network
+
+        Return True on success
+        """
+        return cls._reload_network_manager() and all(
+            cls.bring_up_interface(device) for device in device_names
+        )
+
+    @classmethod
+    def bring_up_all_interfaces(cls, network_state: NetworkState) -> bool:
+        """Activate network, bringing up interfaces in dependency order
+
+        Return True on success
+        """
+        return (
+            cls._reload_network_manager()
+            and super().bring_up_all_interfaces(network_state)
+        )
 
 
 class NetplanActivator(NetworkActivator):
@@ -841,9 +841,16 @@ class Dhcpcd(DhcpClient):
             option number: 1 byte
             option length: 1 byte
             option data: variable length (see length field)
+
+            except for the single byte pad (0) and end (255) options
             """
             while len(data) >= index + 2:
                 code = data[index]
+                if code == 0:
+                    index += 1
+                    continue
+                if code == 255:
+                    return
                 length = data[1 + index]
                 option = data[2 + index : 2 + index + length]
                 yield code, option
@@ -1089,4 +1096,419 @@ class Udhcpc(DhcpClient):
         return []
 
 
+# RFC 2131 BOOTP message fields and the options this client requests.
+DHCP_CLIENT_PORT = 68
+DHCP_SERVER_PORT = 67
+DHCP_MAGIC_COOKIE = b"\x63\x82\x53\x63"
+DHCPDISCOVER = 1
+DHCPOFFER = 2
+DHCPREQUEST = 3
+DHCPACK = 5
+DHCPNAK = 6
+ETH_P_IP = 0x0800
+BOOTP_FORMAT = "!BBBBIHH4s4s4s4s16s64s128s"
+BOOTP_SIZE = struct.calcsize(BOOTP_FORMAT)
+OPTIONS_INDEX = BOOTP_SIZE + len(DHCP_MAGIC_COOKIE)
+DHCP_PARAMETER_REQUEST_LIST = bytes(
+    [1, 3, 6, 12, 15, 26, 28, 42, 51, 54, 58, 59, 121, 245]
+)
+
+
+def _inet_ntoa_list(value: bytes) -> str:
+    return ",".join(
+        socket.inet_ntoa(value[i : i + 4]) for i in range(0, len(value), 4)
+    )
+
+
+def _text(value: bytes) -> str:
+    return value.decode("utf-8", "replace").rstrip("\0")
+
+
+def _number(value: bytes) -> str:
+    return str(int.from_bytes(value, "big"))
+
+
+# Option code -> (dhclient lease key, decoder)
+DHCP_LEASE_OPTIONS: Dict[int, Tuple[str, Callable[[bytes], str]]] = {
+    1: ("subnet-mask", socket.inet_ntoa),
+    # Like the udhcpc script, only the first router is kept
+    3: ("routers", lambda value: socket.inet_ntoa(value[:4])),
+    6: ("domain-name-servers", _inet_ntoa_list),
+    12: ("host-name", _text),
+    15: ("domain-name", _text),
+    26: ("interface-mtu", _number),
+    28: ("broadcast-address", socket.inet_ntoa),
+    42: ("ntp-servers", _inet_ntoa_list),
+    51: ("dhcp-lease-time", _number),
+    53: ("dhcp-message-type", _number),
+    54: ("dhcp-server-identifier", socket.inet_ntoa),
+    58: ("dhcp-renewal-time", _number),
+    59: ("dhcp-rebinding-time", _number),
+}
+
+
+def _checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _udp_broadcast(payload: bytes) -> bytes:
+    """Wrap payload in the IPv4 and UDP headers of a broadcast from an
+    unconfigured client, for sending on an AF_PACKET SOCK_DGRAM socket."""
+    src = socket.inet_aton("0.0.0.0")
+    dst = socket.inet_aton("255.255.255.255")
+    udp_length = 8 + len(payload)
+    pseudo_header = (
+        src + dst + struct.pack("!BBH", 0, socket.IPPROTO_UDP, udp_length)
+    )
+    udp = (
+        struct.pack("!HHHH", DHCP_CLIENT_PORT, DHCP_SERVER_PORT, udp_length, 0)
+        + payload
+    )
+    udp_checksum = _checksum(pseudo_header + udp) or 0xFFFF
+    udp = udp[:6] + struct.pack("!H", udp_checksum) + udp[8:]
+    ip = struct.pack(
+        "!BBHHHBBH4s4s",
+        0x45,
+        0,
+        20 + udp_length,
+        0,
+        0,
+        64,
+        socket.IPPROTO_UDP,
+        0,
+        src,
+        dst,
+    )
+    ip = ip[:10] + struct.pack("!H", _checksum(ip)) + ip[12:]
+    return ip + udp
+
+
+def _udp_payload(packet: bytes) -> Optional[bytes]:
+    """Return the payload of an IPv4 UDP datagram to the client port."""
+    if len(packet) < 28 or packet[0] >> 4 != 4:
+        return None
+    if packet[9] != socket.IPPROTO_UDP:
+        return None
+    header_length = (packet[0] & 0xF) * 4
+    _sport, dport, length = struct.unpack_from("!HHH", packet, header_length)
+    if dport != DHCP_CLIENT_PORT:
+        return None
+    return packet[header_length + 8 : header_length + length]
+
+
+class BuiltinDhcpClient(DhcpClient):
+    """Obtain a DHCPv4 lease in-process rather than spawning a client.
+
+    DISCOVER and REQUEST are broadcast on an AF_PACKET socket bound to the
+    interface, so no address or daemon is needed, and the ACK is returned
+    using the lease keys written by dhclient and dhcpcd.
+    """
+
+    client_name = "builtin"
+
+    def __init__(self):
+        if not hasattr(socket, "AF_PACKET"):
+            raise NoDHCPLeaseMissingDhclientError()
+        self.dhcp_client_path = ""
+        self.leases: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def build_dhcp_packet(
+        xid: int, mac: bytes, options: List[Tuple[int, bytes]]
+    ) -> bytes:
+        """Return a BOOTREQUEST carrying options.
+
+        @param xid: the transaction id the server replies with
+        @param mac: the client's hardware address
+        @param options: list of (code, value) tuples
+        """
+        empty = b"\0" * 4
+        packet = struct.pack(
+            BOOTP_FORMAT,
+            1,  # BOOTREQUEST
+            1,  # htype: ethernet
+            len(mac),
+            0,
+            xid,
+            0,
+            0,
+            empty,
+            empty,
+            empty,
+            empty,
+            mac,
+            b"",
+            b"",
+        )
+        packet += DHCP_MAGIC_COOKIE
+        for code, value in options:
+            packet += bytes([code, len(value)]) + value
+        return packet + b"\xff"
+
+    @staticmethod
+    def parse_dhcp_options(packet: bytes) -> Dict[int, bytes]:
+        """Return the options of a DHCP packet by option code.
+
+        Pad options are skipped and options split over several instances
+        are concatenated per RFC 3396.
+        """
+        options: Dict[int, bytes] = {}
+        index = OPTIONS_INDEX
+        while index < len(packet):
+            code = packet[index]
+            if code == 255:
+                break
+            if code == 0:
+                index += 1
+                continue
+            if index + 1 >= len(packet):
+                break
+            length = packet[index + 1]
+            value = packet[index + 2 : index + 2 + length]
+            options[code] = options.get(code, b"") + value
+            index += 2 + length
+        return options
+
+    @staticmethod
+    def parse_classless_static_routes(value: bytes) -> str:
+        """Convert the option 121 value to the dhcpcd static routes format.
+
+        @param value: rfc3442 encoded routes
+        @returns: string of "destination/width gateway" pairs for all valid
+            routes until the first parsing error.
+
+        e.g.:
+
+        sr=parse_classless_static_routes(
+            bytes([0, 10, 0, 0, 1, 32, 168, 63, 129, 16, 10, 0, 0, 1])
+        )
+        sr="0.0.0.0/0 10.0.0.1 168.63.129.16/32 10.0.0.1"
+        """
+        routes = []
+        index = 0
+        while index < len(value):
+            width = value[index]
+            significant = (width + 7) // 8
+            end = index + 1 + significant + 4
+            if width > 32 or end > len(value):
+                LOG.warning(
+                    "Malformed classless static routes option: %s",
+                    value.hex(":"),
+                )
+                break
+            destination = value[index + 1 : index + 1 + significant]
+            routes.append(
+                "%s/%d %s"
+                % (
+                    socket.inet_ntoa(destination.ljust(4, b"\0")),
+                    width,
+                    socket.inet_ntoa(value[end - 4 : end]),
+                )
+            )
+            index = end
+        return " ".join(routes)
+
+    @staticmethod
+    def parse_dhcp_lease(packet: bytes, interface: str) -> Dict[str, Any]:
+        """Convert a DHCPACK to the datastructure we create from dhclient
+
+        Options without a dhclient name are kept as colon separated hex in
+        unknown-<code> keys, except option 245 which is the Azure
+        wireserver address.
+        """
+        lease: Dict[str, Any] = {
+            "interface": interface,
+            "fixed-address": socket.inet_ntoa(packet[16:20]),
+        }
+        options = BuiltinDhcpClient.parse_dhcp_options(packet)
+        for code, value in options.items():
+            try:
+                if code in DHCP_LEASE_OPTIONS:
+                    name, decode = DHCP_LEASE_OPTIONS[code]
+                    lease[name] = decode(value)
+                elif code == 121:
+                    lease["static_routes"] = (
+                        BuiltinDhcpClient.parse_classless_static_routes(value)
+                    )
+                else:
+                    lease["unknown-%d" % code] = ":".join(
+                        "%x" % byte for byte in value
+                    )
+            except (OSError, ValueError) as e:
+                LOG.debug("Ignoring malformed DHCP option %s: %s", code, e)
+        opt_245 = Dhcpcd.parse_unknown_options_from_packet(packet, 245)
+        if opt_245 and len(opt_245) == 4:
+            lease["unknown-245"] = socket.inet_ntoa(opt_245)
+        return lease
+
+    def _exchange(
+        self,
+        sock: socket.socket,
+        interface: str,
+        request: bytes,
+        xid: int,
+        mac: bytes,
+        reply_types: Tuple[int, ...],
+        deadline: float,
+    ) -> bytes:
+        """Broadcast request, retransmitting with exponential backoff until
+        a reply of one of reply_types arrives or the deadline passes."""
+        frame = _udp_broadcast(request)
+        address = (interface, ETH_P_IP, 0, 0, b"\xff" * 6)
+        interval = 1.0
+        while time.monotonic() < deadline:
+            sock.sendto(frame, address)
+            resend_at = min(time.monotonic() + interval, deadline)
+            interval *= 2
+            while True:
+                remaining = resend_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    reply = _udp_payload(sock.recv(65535))
+                except socket.timeout:
+                    break
+                if (
+                    not reply
+                    or len(reply) < OPTIONS_INDEX
+                    or reply[0] != 2  # BOOTREPLY
+                    or struct.unpack_from("!I", reply, 4)[0] != xid
+                    or reply[28 : 28 + len(mac)] != mac
+                    or reply[BOOTP_SIZE:OPTIONS_INDEX] != DHCP_MAGIC_COOKIE
+                ):
+                    continue
+                message_type = self.parse_dhcp_options(reply).get(53)
+                if message_type and message_type[0] in reply_types:
+                    return reply
+        raise NoDHCPLeaseError(
+            "No DHCP reply received on %s after %ss"
+            % (interface, self.timeout)
+        )
+
+    def dhcp_discovery(
+        self,
+        interface: str,
+        dhcp_log_func: Optional[Callable[[str, str, str], None]] = None,
+        distro=None,
+    ) -> Dict[str, Any]:
+        """Obtain a lease on the interface without a dhcp client process.
+
+        @param interface: Name of the network interface on which to send a
+            dhcp request
+        @param dhcp_log_func: Callable accepting the interface and a
+            transcript of the exchange as stdout, with an empty stderr.
+        @param distro: a distro object for network interface manipulation
+        @return: dict of lease options from the DHCPACK
+        """
+        LOG.debug("Performing a dhcp discovery on %s", interface)
+        if is_ib_interface(interface):
+            # The 20 byte IPoIB broadcast address can't be expressed in an
+            # AF_PACKET address, use dhclient, dhcpcd or udhcpc instead
+            raise NoDHCPLeaseError(
+                "%s does not support Infiniband interface %s"
+                % (self.client_name, interface)
+            )
+
+        # Like the other clients, the interface must be up to send packets
+        distro.net_ops.link_up(interface)
+
+        mac = bytes.fromhex(get_interface_mac(interface).replace(":", ""))
+        xid = int.from_bytes(os.urandom(4), "big")
+        deadline = time.monotonic() + self.timeout
+        transcript = []
+        request_list = (55, DHCP_PARAMETER_REQUEST_LIST)
+        try:
+            with socket.socket(
+                socket.AF_PACKET, socket.SOCK_DGRAM, socket.htons(ETH_P_IP)
+            ) as sock:
+                sock.bind((interface, ETH_P_IP))
+                transcript.append("DHCPDISCOVER on %s" % interface)
+                discover = self.build_dhcp_packet(
+                    xid, mac, [(53, bytes([DHCPDISCOVER])), request_list]
+                )
+                offer = self._exchange(
+                    sock, interface, discover, xid, mac, (DHCPOFFER,), deadline
+                )
+                offered = socket.inet_ntoa(offer[16:20])
+                server = self.parse_dhcp_options(offer).get(54, b"")
+                transcript.append(
+                    "DHCPOFFER of %s from %s"
+                    % (offered, _inet_ntoa_list(server))
+                )
+                request = self.build_dhcp_packet(
+                    xid,
+                    mac,
+                    [
+                        (53, bytes([DHCPREQUEST])),
+                        (50, offer[16:20]),
+                        (54, server),
+                        request_list,
+                    ],
+                )
+                transcript.append(
+                    "DHCPREQUEST for %s on %s" % (offered, interface)
+                )
+                ack = self._exchange(
+                    sock,
+                    interface,
+                    request,
+                    xid,
+                    mac,
+                    (DHCPACK, DHCPNAK),
+                    deadline,
+                )
+                nak = self.parse_dhcp_options(ack)[53] == bytes([DHCPNAK])
+                transcript.append(
+                    "%s of %s from %s"
+                    % (
+                        "DHCPNAK" if nak else "DHCPACK",
+                        offered,
+                        _inet_ntoa_list(server),
+                    )
+                )
+        except OSError as error:
+            LOG.debug("DHCP exchange on %s failed: %s", interface, error)
+            raise NoDHCPLeaseError from error
+        finally:
+            if dhcp_log_func is not None:
+                dhcp_log_func(interface, "\n".join(transcript), "")
+
+        if nak:
+            raise NoDHCPLeaseError(
+                "DHCPNAK received on %s for %s" % (interface, offered)
+            )
+        lease = self.parse_dhcp_lease(ack, interface)
+        self.leases[interface] = lease
+        return lease
+
+    def get_newest_lease(self, interface: str) -> Dict[str, Any]:
+        """Return the lease obtained on the interface by this client.
+
+        @param interface: which interface to return the lease for
+        @raises: NoDHCPLeaseError when no lease was obtained on the interface
+        """
+        try:
+            return self.leases[interface]
+        except KeyError as e:
+            raise NoDHCPLeaseError(
+                "No lease obtained on %s by %s" % (interface, self.client_name)
+            ) from e
+
+    @staticmethod
+    def parse_static_routes(routes: str) -> List[Tuple[str, str]]:
+        return Dhcpcd.parse_static_routes(routes)
+
+
 ALL_DHCP_CLIENTS: List[Type[DhcpClient]] = [Dhcpcd, IscDhclient, Udhcpc]
+
+# The builtin client is only used when named in dhcp_client_priority
+CONFIGURABLE_DHCP_CLIENTS: List[Type[DhcpClient]] = ALL_DHCP_CLIENTS + [
+    BuiltinDhcpClient
+]
@@ -729,6 +729,12 @@ class Renderer(renderer.Renderer):
 
         return "\n\n".join(["\n".join(s) for s in sections]) + "\n"
 
+    def output_paths(self, target=None) -> List[str]:
+        return [
+            subp.target_path(target, self.eni_path),
+            subp.target_path(target, self.netrules_path),
+        ]
+
     def render_network_state(
         self,
         network_state: NetworkState,
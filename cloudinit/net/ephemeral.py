@@ -9,8 +9,8 @@ from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 import cloudinit.net as net
 import cloudinit.netinfo as netinfo
 from cloudinit.net.dhcp import NoDHCPLeaseError, maybe_perform_dhcp_discovery
-from cloudinit.subp import ProcessExecutionError
-from cloudinit.url_helper import UrlError, wait_for_url
+from cloudinit.subp import ProcessExecutionError, probe_cache
+from cloudinit.url_helper import UrlError, close_session_pool, wait_for_url
 
 LOG = logging.getLogger(__name__)
 
@@ -109,11 +109,18 @@ class EphemeralIPv4Network:
         except ProcessExecutionError:
             self.__exit__(None, None, None)
             raise
+        finally:
+            probe_cache.invalidate(*netinfo.NET_PROBE_COMMANDS)
+            net.topology.invalidate()
 
     def __exit__(self, excp_type, excp_value, excp_traceback):
         """Teardown anything we set up."""
         for cmd in self.cleanup_cmds:
             cmd()
+        # Pooled keep-alive connections are bound to the torn down address
+        close_session_pool()
+        probe_cache.invalidate(*netinfo.NET_PROBE_COMMANDS)
+        net.topology.invalidate()
 
     def _bringup_device(self):
         """Perform the ip commands to fully set up the device.
@@ -271,9 +278,12 @@ class EphemeralIPv6Network:
         """
         if net.read_sys_net(self.interface, "operstate") != "up":
             self.distro.net_ops.link_up(self.interface)
+            probe_cache.invalidate(*netinfo.NET_PROBE_COMMANDS)
+            net.topology.invalidate()
 
     def __exit__(self, *_args):
         """No need to set the link to down state"""
+        close_session_pool()
 
 
 class EphemeralDHCPv4:
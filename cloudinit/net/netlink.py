@@ -0,0 +1,484 @@
+# This file is part of cloud-init. See LICENSE file for license information.
+
+"""Request interface, address and route information from the kernel, and
+change it, over an rtnetlink socket."""
+
+import errno
+import logging
+import os
+import socket
+import struct
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from cloudinit import util
+
+LOG = logging.getLogger(__name__)
+
+# http://man7.org/linux/man-pages/man7/netlink.7.html
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_SETLINK = 19
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+RTM_GETROUTE = 26
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+MAX_SIZE = 65535
+
+NLMSGHDR_FMT = "IHHII"
+IFINFOMSG_FMT = "BHiII"
+IFADDRMSG_FMT = "BBBBi"
+RTMSG_FMT = "BBBBBBBBI"
+RTATTR_FMT = "HH"
+NLMSGHDR_SIZE = struct.calcsize(NLMSGHDR_FMT)
+IFINFOMSG_SIZE = struct.calcsize(IFINFOMSG_FMT)
+IFADDRMSG_SIZE = struct.calcsize(IFADDRMSG_FMT)
+RTMSG_SIZE = struct.calcsize(RTMSG_FMT)
+RTATTR_SIZE = struct.calcsize(RTATTR_FMT)
+PAD_ALIGNMENT = 4
+
+# http://man7.org/linux/man-pages/man7/rtnetlink.7.html
+NLM_F_REQUEST = 0x1
+NLM_F_ACK = 0x4
+NLM_F_DUMP_INTR = 0x10
+NLM_F_DUMP = 0x300
+NLM_F_REPLACE = 0x100
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+NLM_F_APPEND = 0x800
+
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_BROADCAST = 4
+
+RTA_DST = 1
+RTA_OIF = 4
+RTA_GATEWAY = 5
+RTA_PRIORITY = 6
+RTA_PREFSRC = 7
+RTA_MULTIPATH = 9
+RTA_CACHEINFO = 12
+RTA_TABLE = 15
+
+IFF_UP = 0x1
+IFF_LOWER_UP = 0x10000
+ARPHRD_ETHER = 1
+
+RT_TABLE_MAIN = 254
+RT_SCOPE_UNIVERSE = 0
+RT_SCOPE_LINK = 253
+RT_SCOPE_NOWHERE = 255
+RTPROT_BOOT = 3
+RTN_UNICAST = 1
+
+NetlinkHeader = namedtuple(
+    "NetlinkHeader", ["length", "type", "flags", "seq", "pid"]
+)
+NetlinkLink = namedtuple(
+    "NetlinkLink", ["index", "ifname", "type", "flags", "address"]
+)
+NetlinkAddress = namedtuple(
+    "NetlinkAddress",
+    ["index", "family", "prefixlen", "scope", "address", "local", "broadcast"],
+)
+NetlinkRoute = namedtuple(
+    "NetlinkRoute",
+    [
+        "family",
+        "dst_len",
+        "table",
+        "type",
+        "dst",
+        "gateway",
+        "oif",
+        "priority",
+        "expires",
+    ],
+)
+
+
+class NetlinkCreateSocketError(RuntimeError):
+    """Raised if netlink socket fails during create or bind."""
+
+
+class NetlinkRequestError(RuntimeError):
+    """Raised if the kernel rejects or interrupts an rtnetlink request."""
+
+    def __init__(self, msg, errno_value=None):
+        super().__init__(msg)
+        self.errno = errno_value
+
+
+def create_rtnetlink_socket(timeout=5):
+    """Creates a netlink socket to send rtnetlink requests on.
+
+    Unlike create_bound_netlink_socket, the socket joins no multicast group
+    and blocks (up to timeout seconds) waiting for replies.
+
+    :returns: netlink socket
+    :raises: NetlinkCreateSocketError
+    """
+    try:
+        netlink_socket = socket.socket(
+            socket.AF_NETLINK,
+            socket.SOCK_RAW | socket.SOCK_CLOEXEC,
+            socket.NETLINK_ROUTE,
+        )
+    except (AttributeError, socket.error) as e:
+        msg = "Exception during rtnetlink socket create: %s" % e
+        raise NetlinkCreateSocketError(msg) from e
+    try:
+        netlink_socket.bind((0, 0))
+        netlink_socket.settimeout(timeout)
+    except socket.error as e:
+        netlink_socket.close()
+        msg = "Exception during rtnetlink socket bind: %s" % e
+        raise NetlinkCreateSocketError(msg) from e
+    return netlink_socket
+
+
+def _align(length):
+    return (length + PAD_ALIGNMENT - 1) & ~(PAD_ALIGNMENT - 1)
+
+
+def pack_rta_attr(rta_type, data):
+    """Pack a single padded rta attribute."""
+    length = RTATTR_SIZE + len(data)
+    attr = struct.pack(RTATTR_FMT, length, rta_type) + data
+    return attr + b"\0" * (_align(length) - length)
+
+
+def unpack_rta_attrs(data, offset=0) -> Dict[int, bytes]:
+    """Unpack every rta attribute in data from offset onwards.
+
+    :returns: dict of attribute data keyed by rta type. Later attributes
+        of the same type replace earlier ones.
+    """
+    attrs = {}
+    while offset + RTATTR_SIZE <= len(data):
+        length, rta_type = struct.unpack_from(RTATTR_FMT, data, offset)
+        if length < RTATTR_SIZE:
+            break
+        attrs[rta_type] = data[offset + RTATTR_SIZE : offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def _format_hwaddr(data):
+    return ":".join("%02x" % b for b in data)
+
+
+def _unpack_u32(data):
+    return struct.unpack("I", data[:4])[0]
+
+
+def _parse_link(payload) -> NetlinkLink:
+    _family, link_type, index, flags, _change = struct.unpack_from(
+        IFINFOMSG_FMT, payload
+    )
+    attrs = unpack_rta_attrs(payload, IFINFOMSG_SIZE)
+    ifname = util.decode_binary(attrs.get(IFLA_IFNAME, b""), "utf-8")
+    return NetlinkLink(
+        index=index,
+        ifname=ifname.strip("\0"),
+        type=link_type,
+        flags=flags,
+        address=_format_hwaddr(attrs.get(IFLA_ADDRESS, b"")),
+    )
+
+
+def _parse_address(payload) -> NetlinkAddress:
+    family, prefixlen, _flags, scope, index = struct.unpack_from(
+        IFADDRMSG_FMT, payload
+    )
+    attrs = unpack_rta_attrs(payload, IFADDRMSG_SIZE)
+
+    def ntop(rta_type):
+        if rta_type not in attrs:
+            return None
+        return socket.inet_ntop(family, attrs[rta_type])
+
+    return NetlinkAddress(
+        index=index,
+        family=family,
+        prefixlen=prefixlen,
+        scope=scope,
+        address=ntop(IFA_ADDRESS),
+        local=ntop(IFA_LOCAL),
+        broadcast=ntop(IFA_BROADCAST),
+    )
+
+
+def _parse_route(payload) -> NetlinkRoute:
+    (
+        family,
+        dst_len,
+        _src_len,
+        _tos,
+        table,
+        _protocol,
+        _scope,
+        route_type,
+        _flags,
+    ) = struct.unpack_from(RTMSG_FMT, payload)
+    attrs = unpack_rta_attrs(payload, RTMSG_SIZE)
+    gateway = attrs.get(RTA_GATEWAY)
+    oif = _unpack_u32(attrs[RTA_OIF]) if RTA_OIF in attrs else None
+    if RTA_MULTIPATH in attrs:
+        # Like "ip -o route", report the last nexthop of a multipath route
+        nexthops = attrs[RTA_MULTIPATH]
+        offset = 0
+        while offset + 8 <= len(nexthops):
+            nh_len, _nh_flags, _hops, nh_index = struct.unpack_from(
+                "HBBi", nexthops, offset
+            )
+            if nh_len < 8:
+                break
+            nh_attrs = unpack_rta_attrs(nexthops[offset : offset + nh_len], 8)
+            gateway = nh_attrs.get(RTA_GATEWAY, gateway)
+            oif = nh_index
+            offset += _align(nh_len)
+    expires = 0
+    if RTA_CACHEINFO in attrs and len(attrs[RTA_CACHEINFO]) >= 12:
+        # struct rta_cacheinfo: rta_clntref, rta_lastuse, rta_expires, ...
+        expires = struct.unpack_from("i", attrs[RTA_CACHEINFO], 8)[0]
+    return NetlinkRoute(
+        family=family,
+        dst_len=dst_len,
+        table=(_unpack_u32(attrs[RTA_TABLE]) if RTA_TABLE in attrs else table),
+        type=route_type,
+        dst=(
+            socket.inet_ntop(family, attrs[RTA_DST])
+            if RTA_DST in attrs
+            else None
+        ),
+        gateway=socket.inet_ntop(family, gateway) if gateway else None,
+        oif=oif,
+        priority=(
+            _unpack_u32(attrs[RTA_PRIORITY]) if RTA_PRIORITY in attrs else None
+        ),
+        expires=expires,
+    )
+
+
+class RtnetlinkClient:
+    """Send rtnetlink dump and change requests over one netlink socket.
+
+    Change requests passed together to transact() are sent in a single
+    datagram and every acknowledgement is collected before returning.
+
+    :raises: NetlinkCreateSocketError if the socket cannot be created and
+        NetlinkRequestError if the kernel rejects a request.
+    """
+
+    def __init__(self):
+        self._socket = create_rtnetlink_socket()
+        self._seq = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+
+    def close(self):
+        self._socket.close()
+
+    def _pack(self, msg_type, flags, body, attrs=()) -> Tuple[int, bytes]:
+        self._seq += 1
+        payload = body + b"".join(
+            pack_rta_attr(rta_type, data) for rta_type, data in attrs
+        )
+        header = struct.pack(
+            NLMSGHDR_FMT,
+            NLMSGHDR_SIZE + len(payload),
+            msg_type,
+            flags | NLM_F_REQUEST,
+            self._seq,
+            0,
+        )
+        return self._seq, header + payload
+
+    def _recv_messages(self):
+        try:
+            data = self._socket.recv(MAX_SIZE)
+        except socket.timeout as e:
+            raise NetlinkRequestError(
+                "Timed out waiting for rtnetlink reply", errno.ETIMEDOUT
+            ) from e
+        except OSError as e:
+            raise NetlinkRequestError(
+                "Failed reading rtnetlink reply: %s" % e, e.errno
+            ) from e
+        offset = 0
+        while offset + NLMSGHDR_SIZE <= len(data):
+            header = NetlinkHeader(
+                *struct.unpack_from(NLMSGHDR_FMT, data, offset)
+            )
+            if header.length < NLMSGHDR_SIZE:
+                break
+            yield header, data[offset + NLMSGHDR_SIZE : offset + header.length]
+            offset += _align(header.length)
+
+    def _send(self, packed):
+        try:
+            self._socket.sendto(packed, (0, 0))
+        except OSError as e:
+            raise NetlinkRequestError(
+                "Failed sending rtnetlink request: %s" % e, e.errno
+            ) from e
+
+    @staticmethod
+    def _check_error(payload):
+        error = -struct.unpack_from("i", payload)[0] if payload else 0
+        if error:
+            raise NetlinkRequestError(
+                "rtnetlink request failed: %s" % os.strerror(error), error
+            )
+
+    def dump(self, msg_type, body) -> List[Tuple[int, bytes]]:
+        """Send a dump request and return every (type, payload) reply."""
+        seq, packed = self._pack(msg_type, NLM_F_DUMP, body)
+        self._send(packed)
+        replies: List[Tuple[int, bytes]] = []
+        while True:
+            for header, payload in self._recv_messages():
+                if header.seq != seq:
+                    continue
+                if header.flags & NLM_F_DUMP_INTR:
+                    raise NetlinkRequestError(
+                        "rtnetlink dump interrupted", errno.EINTR
+                    )
+                if header.type == NLMSG_DONE:
+                    self._check_error(payload)
+                    return replies
+                if header.type == NLMSG_ERROR:
+                    self._check_error(payload)
+                    continue
+                replies.append((header.type, payload))
+
+    def transact(self, requests: List[Tuple[int, int, bytes, list]]):
+        """Send change requests in one batch and wait for every ack.
+
+        :param requests: list of (msg_type, flags, body, attrs) tuples, where
+            attrs is a list of (rta_type, data) tuples.
+        :raises: NetlinkRequestError for the first request the kernel
+            rejected. Requests after a rejected one may have been applied.
+        """
+        pending = {}
+        batch = b""
+        for msg_type, flags, body, attrs in requests:
+            seq, packed = self._pack(msg_type, flags | NLM_F_ACK, body, attrs)
+            pending[seq] = msg_type
+            batch += packed
+        self._send(batch)
+        error = None
+        while pending:
+            for header, payload in self._recv_messages():
+                if header.type != NLMSG_ERROR or header.seq not in pending:
+                    continue
+                del pending[header.seq]
+                try:
+                    self._check_error(payload)
+                except NetlinkRequestError as e:
+                    error = error or e
+        if error:
+            raise error
+
+    def get_links(self) -> List[NetlinkLink]:
+        body = struct.pack(IFINFOMSG_FMT, socket.AF_UNSPEC, 0, 0, 0, 0)
+        return [
+            _parse_link(payload)
+            for msg_type, payload in self.dump(RTM_GETLINK, body)
+            if msg_type == RTM_NEWLINK
+        ]
+
+    def get_addresses(self) -> List[NetlinkAddress]:
+        body = struct.pack(IFADDRMSG_FMT, socket.AF_UNSPEC, 0, 0, 0, 0)
+        return [
+            _parse_address(payload)
+            for msg_type, payload in self.dump(RTM_GETADDR, body)
+            if msg_type == RTM_NEWADDR
+        ]
+
+    def get_routes(self, family) -> List[NetlinkRoute]:
+        body = struct.pack(RTMSG_FMT, family, 0, 0, 0, 0, 0, 0, 0, 0)
+        return [
+            _parse_route(payload)
+            for msg_type, payload in self.dump(RTM_GETROUTE, body)
+            if msg_type == RTM_NEWROUTE
+        ]
+
+
+def link_request(index, up) -> Tuple[int, int, bytes, list]:
+    """Build an RTM_NEWLINK request setting the link of index up or down."""
+    body = struct.pack(
+        IFINFOMSG_FMT, socket.AF_UNSPEC, 0, index, IFF_UP if up else 0, IFF_UP
+    )
+    return RTM_NEWLINK, 0, body, []
+
+
+def address_request(
+    msg_type, index, address, prefixlen, broadcast: Optional[str] = None
+) -> Tuple[int, int, bytes, list]:
+    """Build an RTM_NEWADDR or RTM_DELADDR request for an IPv4 address."""
+    body = struct.pack(
+        IFADDRMSG_FMT, socket.AF_INET, prefixlen, 0, RT_SCOPE_UNIVERSE, index
+    )
+    packed = socket.inet_pton(socket.AF_INET, address)
+    attrs = [(IFA_LOCAL, packed), (IFA_ADDRESS, packed)]
+    if broadcast:
+        attrs.append(
+            (IFA_BROADCAST, socket.inet_pton(socket.AF_INET, broadcast))
+        )
+    flags = NLM_F_CREATE | NLM_F_EXCL if msg_type == RTM_NEWADDR else 0
+    return msg_type, flags, body, attrs
+
+
+def route_request(
+    msg_type,
+    flags,
+    index,
+    dst,
+    dst_len,
+    gateway: Optional[str] = None,
+    source_address: Optional[str] = None,
+) -> Tuple[int, int, bytes, list]:
+    """Build an RTM_NEWROUTE or RTM_DELROUTE request for an IPv4 route in
+    the main table, choosing protocol and scope the way "ip route" does."""
+    if msg_type == RTM_DELROUTE:
+        protocol, scope, route_type = 0, RT_SCOPE_NOWHERE, 0
+    else:
+        protocol, route_type = RTPROT_BOOT, RTN_UNICAST
+        scope = RT_SCOPE_UNIVERSE if gateway else RT_SCOPE_LINK
+    body = struct.pack(
+        RTMSG_FMT,
+        socket.AF_INET,
+        dst_len,
+        0,
+        0,
+        RT_TABLE_MAIN,
+        protocol,
+        scope,
+        route_type,
+        0,
+    )
+    attrs = [(RTA_OIF, struct.pack("I", index))]
+    if dst_len:
+        attrs.append((RTA_DST, socket.inet_pton(socket.AF_INET, dst)))
+    if gateway:
+        attrs.append((RTA_GATEWAY, socket.inet_pton(socket.AF_INET, gateway)))
+    if source_address:
+        attrs.append(
+            (RTA_PREFSRC, socket.inet_pton(socket.AF_INET, source_address))
+        )
+    return msg_type, flags, body, attrs
@@ -0,0 +1,218 @@
+import ipaddress
+import logging
+import socket
+from typing import Callable, List, Optional, Tuple
+
+from cloudinit import subp
+from cloudinit.net import netlink
+from cloudinit.net.netops.iproute2 import Iproute2
+
+LOG = logging.getLogger(__name__)
+
+_NETLINK_ERRORS = (
+    OSError,
+    ValueError,
+    netlink.NetlinkCreateSocketError,
+    netlink.NetlinkRequestError,
+)
+
+
+def _transact(interface: str, build: Callable[[int], List[tuple]]) -> bool:
+    """Send the requests build(ifindex) returns for interface in one batch.
+
+    Returns False when rtnetlink could not apply them, so that the caller
+    can fall back to the ip command and its error reporting.
+    """
+    try:
+        index = socket.if_nametoindex(interface)
+        requests = build(index)
+        with netlink.RtnetlinkClient() as client:
+            client.transact(requests)
+    except _NETLINK_ERRORS as e:
+        LOG.debug(
+            "Falling back to ip, rtnetlink request on %s failed: %s",
+            interface,
+            e,
+        )
+        return False
+    return True
+
+
+def _route_dst(route: str) -> Tuple[str, int]:
+    if route == "default":
+        return "0.0.0.0", 0
+    dst = ipaddress.IPv4Interface(route)
+    return str(dst.ip), dst.network.prefixlen
+
+
+def _gateway(gateway: Optional[str]) -> Optional[str]:
+    if gateway == "0.0.0.0":
+        return None
+    return gateway
+
+
+class Rtnetlink(Iproute2):
+    """Configure links, IPv4 addresses and routes over rtnetlink.
+
+    Each operation falls back to the equivalent ip command when rtnetlink
+    is unavailable or rejects the request.
+    """
+
+    @staticmethod
+    def link_up(
+        interface: str, family: Optional[str] = None
+    ) -> subp.SubpResult:
+        if _transact(
+            interface, lambda index: [netlink.link_request(index, True)]
+        ):
+            return subp.SubpResult("", "")
+        return Iproute2.link_up(interface, family)
+
+    @staticmethod
+    def link_down(
+        interface: str, family: Optional[str] = None
+    ) -> subp.SubpResult:
+        if _transact(
+            interface, lambda index: [netlink.link_request(index, False)]
+        ):
+            return subp.SubpResult("", "")
+        return Iproute2.link_down(interface, family)
+
+    @staticmethod
+    def add_route(
+        interface: str,
+        route: str,
+        *,
+        gateway: Optional[str] = None,
+        source_address: Optional[str] = None,
+    ):
+        def build(index):
+            dst, dst_len = _route_dst(route)
+            return [
+                netlink.route_request(
+                    netlink.RTM_NEWROUTE,
+                    netlink.NLM_F_CREATE | netlink.NLM_F_REPLACE,
+                    index,
+                    dst,
+                    dst_len,
+                    gateway=_gateway(gateway),
+                    source_address=source_address,
+                )
+            ]
+
+        if not _transact(interface, build):
+            Iproute2.add_route(
+                interface,
+                route,
+                gateway=gateway,
+                source_address=source_address,
+            )
+
+    @staticmethod
+    def append_route(interface: str, address: str, gateway: str):
+        def build(index):
+            dst, dst_len = _route_dst(address)
+            return [
+                netlink.route_request(
+                    netlink.RTM_NEWROUTE,
+                    netlink.NLM_F_CREATE | netlink.NLM_F_APPEND,
+                    index,
+                    dst,
+                    dst_len,
+                    gateway=_gateway(gateway),
+                )
+            ]
+
+        if not _transact(interface, build):
+            Iproute2.append_route(interface, address, gateway)
+
+    @staticmethod
+    def del_route(
+        interface: str,
+        address: str,
+        *,
+        gateway: Optional[str] = None,
+        source_address: Optional[str] = None,
+    ):
+        def build(index):
+            dst, dst_len = _route_dst(address)
+            return [
+                netlink.route_request(
+                    netlink.RTM_DELROUTE,
+                    0,
+                    index,
+                    dst,
+                    dst_len,
+                    gateway=_gateway(gateway),
+                    source_address=source_address,
+                )
+            ]
+
+        if not _transact(interface, build):
+            Iproute2.del_route(
+                interface,
+                address,
+                gateway=gateway,
+                source_address=source_address,
+            )
+
+    @staticmethod
+    def get_default_route() -> str:
+        try:
+            with netlink.RtnetlinkClient() as client:
+                routes = client.get_routes(socket.AF_INET)
+            lines = []
+            for route in routes:
+                if (
+                    route.table != netlink.RT_TABLE_MAIN
+                    or route.type != netlink.RTN_UNICAST
+                    or route.dst_len
+                ):
+                    continue
+                words = ["default"]
+                if route.gateway:
+                    words += ["via", route.gateway]
+                if route.oif is not None:
+                    words += ["dev", socket.if_indextoname(route.oif)]
+                if route.priority is not None:
+                    words += ["metric", str(route.priority)]
+                lines.append(" ".join(words) + "\n")
+        except _NETLINK_ERRORS as e:
+            LOG.debug("Falling back to ip, rtnetlink route dump failed: %s", e)
+            return Iproute2.get_default_route()
+        return "".join(lines)
+
+    @staticmethod
+    def add_addr(
+        interface: str, address: str, broadcast: Optional[str] = None
+    ):
+        def build(index):
+            addr = ipaddress.IPv4Interface(address)
+            return [
+                netlink.address_request(
+                    netlink.RTM_NEWADDR,
+                    index,
+                    str(addr.ip),
+                    addr.network.prefixlen,
+                    broadcast,
+                )
+            ]
+
+        if not _transact(interface, build):
+            Iproute2.add_addr(interface, address, broadcast)
+
+    @staticmethod
+    def del_addr(interface: str, address: str):
+        def build(index):
+            addr = ipaddress.IPv4Interface(address)
+            return [
+                netlink.address_request(
+                    netlink.RTM_DELADDR,
+                    index,
+                    str(addr.ip),
+                    addr.network.prefixlen,
+                )
+            ]
+
+        if not _transact(interface, build):
+            Iproute2.del_addr(interface, address)
@@ -373,6 +373,9 @@ class Renderer(renderer.Renderer):
                 LOG.debug("Failed to list features from netplan info: %s", e)
         return self._features
 
+    def output_paths(self, target=None) -> List[str]:
+        return [os.path.join(subp.target_path(target), self.netplan_path)]
+
     def render_network_state(
         self,
         network_state: NetworkState,
@@ -577,6 +577,12 @@ class Renderer(renderer.Renderer):
             # Well, what can we do...
             return con_id
 
+    def output_paths(self, target=None) -> List[str]:
+        return [
+            os.path.dirname(nm_conn_filename("", target)),
+            cloud_init_nm_conf_filename(target),
+        ]
+
     def render_network_state(
         self,
         network_state: NetworkState,
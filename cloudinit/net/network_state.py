@@ -6,6 +6,8 @@
 
 import copy
 import functools
+import hashlib
+import json
 import logging
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
@@ -146,6 +148,20 @@ class NetworkState:
     def version(self):
         return self._version
 
+    def fingerprint(self) -> str:
+        """Return a digest of the parsed state, independent of renderer.
+
+        Configs which parse to the same state render identically, so an
+        unchanged fingerprint means there is nothing new to render.
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [self._version, self._network_state],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
     @property
     def dns_nameservers(self):
         try:
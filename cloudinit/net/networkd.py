@@ -337,6 +337,11 @@ class Renderer(renderer.Renderer):
         util.write_file(net_fn, conf)
         util.chownbyname(net_fn, net_fn_owner, net_fn_owner)
 
+    def output_paths(self, target=None) -> List[str]:
+        if target:
+            return [subp.target_path(target) + self.network_conf_dir]
+        return [self.network_conf_dir]
+
     def render_network_state(
         self,
         network_state: NetworkState,
@@ -6,9 +6,12 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 
 import abc
+import hashlib
 import io
-from typing import Optional
+import os
+from typing import Dict, List, Optional
 
+from cloudinit import util
 from cloudinit.net.network_state import NetworkState
 from cloudinit.net.udev import generate_udev_rule
 
@@ -42,6 +45,14 @@ class Renderer(abc.ABC):
                 )
         return content.getvalue()
 
+    def output_paths(self, target=None) -> List[str]:
+        """Return the files and directories render_network_state writes.
+
+        Renderers which don't declare their output are always rendered,
+        even when the network config is unchanged.
+        """
+        return []
+
     @abc.abstractmethod
     def render_network_state(
         self,
@@ -50,3 +61,26 @@ class Renderer(abc.ABC):
         target=None,
     ) -> None:
         """Render network state."""
+
+
+def hash_rendered_output(renderer: Renderer, target=None) -> Dict[str, str]:
+    """Return the sha256 of each file in the renderer's output paths.
+
+    Directories are hashed one level deep and missing paths are omitted,
+    so that any file added, edited or removed changes the result.
+    """
+    hashes = {}
+    for path in renderer.output_paths(target):
+        if os.path.isdir(path):
+            files = sorted(
+                entry.path for entry in os.scandir(path) if entry.is_file()
+            )
+        elif os.path.isfile(path):
+            files = [path]
+        else:
+            continue
+        for file in files:
+            hashes[file] = hashlib.sha256(
+                util.load_binary_file(file)
+            ).hexdigest()
+    return hashes
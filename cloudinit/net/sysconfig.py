@@ -6,7 +6,7 @@ import io
 import logging
 import os
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from cloudinit import subp, util
 from cloudinit.distros.parsers import networkmanager_conf, resolv_conf
@@ -1071,6 +1071,28 @@ class Renderer(renderer.Renderer):
                         contents[cpath] = iface_cfg.routes.to_string(proto)
         return contents
 
+    def output_paths(self, target=None) -> List[str]:
+        """The interface and route directory and the other files written,
+        except for resolv.conf which other services rewrite."""
+        paths = [
+            subp.target_path(target, path)
+            for path in (
+                self.netrules_path,
+                self.networkmanager_conf_path,
+                self.templates.get("control"),
+            )
+            if path
+        ]
+        if self.templates.get("iface_templates"):
+            base_sysconf_dir = subp.target_path(target, self.sysconf_dir)
+            paths.append(
+                os.path.dirname(
+                    self.templates["iface_templates"]
+                    % {"base": base_sysconf_dir, "name": ""}
+                )
+            )
+        return paths
+
     def render_network_state(
         self,
         network_state: NetworkState,
@@ -11,16 +11,21 @@
 import json
 import logging
 import re
+import socket
 from copy import copy, deepcopy
 from ipaddress import IPv4Network
 from typing import Dict, List, TypedDict
 
 from cloudinit import lifecycle, subp, util
+from cloudinit.net import netlink
 from cloudinit.net.network_state import net_prefix_to_ipv4_mask
 from cloudinit.simpletable import SimpleTable
 
 LOG = logging.getLogger(__name__)
 
+# Probe commands whose output changes when interfaces, addresses or routes do
+NET_PROBE_COMMANDS = ("ip", "ifconfig", "netstat")
+
 # Example netdev format:
 # {'eth0': {'hwaddr': '00:16:3e:16:db:54',
 #           'ipv4': [{'bcast': '10.85.130.255',
@@ -40,6 +45,20 @@ LOG = logging.getLogger(__name__)
 #         'up': True}}
 DEFAULT_NETDEV_INFO = {"ipv4": [], "ipv6": [], "hwaddr": "", "up": False}
 
+# Names iproute2 prints for rtnetlink address scopes and route types
+RT_SCOPE_NAMES = {0: "global", 200: "site", 253: "link", 254: "host"}
+RTN_TYPE_NAMES = {
+    2: "local",
+    3: "broadcast",
+    4: "anycast",
+    5: "multicast",
+    6: "blackhole",
+    7: "unreachable",
+    8: "prohibit",
+    9: "throw",
+    10: "nat",
+}
+
 
 class Interface(TypedDict):
     up: bool
@@ -102,6 +121,50 @@ def _netdev_info_iproute_json(ipaddr_json):
     return devs
 
 
+def _netdev_info_netlink(client: netlink.RtnetlinkClient):
+    """Get network device dicts from rtnetlink link and address dumps.
+
+    Returns the same dict of device info as _netdev_info_iproute_json.
+    """
+    devs = {}
+    names = {}
+    for link in client.get_links():
+        names[link.index] = link.ifname
+        up_flags = netlink.IFF_UP | netlink.IFF_LOWER_UP
+        devs[link.ifname] = {
+            "hwaddr": (
+                link.address if link.type == netlink.ARPHRD_ETHER else ""
+            ),
+            "up": link.flags & up_flags == up_flags,
+            "ipv4": [],
+            "ipv6": [],
+        }
+    for addr in client.get_addresses():
+        if addr.index not in names:
+            continue
+        # Like iproute2, an address differing from the local address is
+        # the peer of a point-to-point link
+        local = addr.local or addr.address or ""
+        has_peer = addr.local and addr.address and addr.address != local
+        scope = RT_SCOPE_NAMES.get(addr.scope, str(addr.scope))
+        dev_info = devs[names[addr.index]]
+        if addr.family == socket.AF_INET:
+            dev_info["ipv4"].append(
+                {
+                    "ip": local,
+                    "mask": str(
+                        IPv4Network(f"0.0.0.0/{addr.prefixlen}").netmask
+                    ),
+                    "bcast": addr.broadcast or "",
+                    "scope": scope,
+                }
+            )
+        elif addr.family == socket.AF_INET6:
+            ip = local if has_peer else f"{local}/{addr.prefixlen}"
+            dev_info["ipv6"].append({"ip": ip, "scope6": scope})
+    return devs
+
+
 @lifecycle.deprecate_call(
     deprecated_version="22.1",
     extra_message="Required by old iproute2 versions that don't "
@@ -290,6 +353,24 @@ def _netdev_info_ifconfig(ifconfig_data):
     return devs
 
 
+def _query_netlink(query):
+    """Run query(client) over rtnetlink.
+
+    Returns None when rtnetlink is unavailable or the query fails, so that
+    callers fall back to the ip, ifconfig or netstat commands.
+    """
+    if util.is_BSD():
+        return None
+    try:
+        with netlink.RtnetlinkClient() as client:
+            return query(client)
+    except netlink.NetlinkCreateSocketError:
+        return None
+    except netlink.NetlinkRequestError as e:
+        LOG.debug("Falling back to net tools, rtnetlink query failed: %s", e)
+        return None
+
+
 def netdev_info(
     empty="",
 ) -> Dict[str, Dict[str, Interface]]:
@@ -330,21 +411,24 @@ def netdev_info(
 
     """
     devs = {}
-    if util.is_NetBSD():
-        (ifcfg_out, _err) = subp.subp(["ifconfig", "-a"], rcs=[0, 1])
+    netlink_devs = _query_netlink(_netdev_info_netlink)
+    if netlink_devs is not None:
+        devs = netlink_devs
+    elif util.is_NetBSD():
+        (ifcfg_out, _err) = subp.probe(["ifconfig", "-a"], rcs=[0, 1])
         devs = _netdev_info_ifconfig_netbsd(ifcfg_out)
     elif subp.which("ip"):
         # Try iproute first of all
         try:
-            (ipaddr_out, _err) = subp.subp(["ip", "--json", "addr"])
+            (ipaddr_out, _err) = subp.probe(["ip", "--json", "addr"])
             devs = _netdev_info_iproute_json(ipaddr_out)
         except subp.ProcessExecutionError:
             # Can be removed when "ip --json" is available everywhere
-            (ipaddr_out, _err) = subp.subp(["ip", "addr", "show"])
+            (ipaddr_out, _err) = subp.probe(["ip", "addr", "show"])
             devs = _netdev_info_iproute(ipaddr_out)
     elif subp.which("ifconfig"):
         # Fall back to net-tools if iproute2 is not present
-        (ifcfg_out, _err) = subp.subp(["ifconfig", "-a"], rcs=[0, 1])
+        (ifcfg_out, _err) = subp.probe(["ifconfig", "-a"], rcs=[0, 1])
         devs = _netdev_info_ifconfig(ifcfg_out)
     else:
         LOG.warning(
@@ -430,7 +514,7 @@ def _netdev_route_info_iproute(iproute_data):
         entry["flags"] = "".join(flags)
         routes["ipv4"].append(entry)
     try:
-        (iproute_data6, _err6) = subp.subp(
+        (iproute_data6, _err6) = subp.probe(
             ["ip", "--oneline", "-6", "route", "list", "table", "all"],
             rcs=[0, 1],
         )
@@ -464,6 +548,78 @@ def _netdev_route_info_iproute(iproute_data):
     return routes
 
 
+def _route_token(route, host_len):
+    """Return the first word iproute2 prints for an rtnetlink route."""
+    if route.type != netlink.RTN_UNICAST:
+        return RTN_TYPE_NAMES.get(route.type, str(route.type))
+    if not route.dst_len:
+        return "default"
+    if route.dst_len == host_len:
+        return route.dst
+    return f"{route.dst}/{route.dst_len}"
+
+
+def _netdev_route_info_netlink(client: netlink.RtnetlinkClient):
+    """Get network route dicts from rtnetlink route dumps.
+
+    Returns the same dict of routes as _netdev_route_info_iproute: the IPv4
+    routes of the main table and the IPv6 routes of every table.
+    """
+    names = {link.index: link.ifname for link in client.get_links()}
+    routes: Dict[str, List[dict]] = {"ipv4": [], "ipv6": []}
+    for route in client.get_routes(socket.AF_INET):
+        if route.table != netlink.RT_TABLE_MAIN:
+            continue
+        entry = {
+            "destination": "0.0.0.0",
+            "flags": "",
+            "gateway": "",
+            "genmask": "0.0.0.0",
+            "iface": "",
+            "metric": "",
+        }
+        flags = ["U"]
+        token = _route_token(route, 32)
+        if token != "default":
+            addr, _, cidr = token.partition("/")
+            if not cidr:
+                cidr = "32"
+                flags.append("H")
+            entry["destination"] = addr
+            entry["genmask"] = net_prefix_to_ipv4_mask(cidr)
+            entry["gateway"] = "0.0.0.0"
+        if route.gateway:
+            entry["gateway"] = route.gateway
+            flags.insert(1, "G")
+        if route.oif is not None:
+            entry["iface"] = names.get(route.oif, f"if{route.oif}")
+        if route.priority is not None:
+            entry["metric"] = str(route.priority)
+        entry["flags"] = "".join(flags)
+        routes["ipv4"].append(entry)
+    for route in client.get_routes(socket.AF_INET6):
+        entry = {}
+        token = _route_token(route, 128)
+        if token == "default":
+            entry["destination"] = "::/0"
+            entry["flags"] = "UG"
+        else:
+            entry["destination"] = token
+            entry["gateway"] = "::"
+            entry["flags"] = "U"
+        if route.gateway:
+            entry["gateway"] = route.gateway
+            entry["flags"] = "UG"
+        if route.oif is not None:
+            entry["iface"] = names.get(route.oif, f"if{route.oif}")
+        if route.priority is not None:
+            entry["metric"] = str(route.priority)
+        if route.expires:
+            entry["flags"] = entry["flags"] + "e"
+        routes["ipv6"].append(entry)
+    return routes
+
+
 def _netdev_route_info_netstat(route_data):
     routes = {}
     routes["ipv4"] = []
@@ -508,7 +664,7 @@ def _netdev_route_info_netstat(route_data):
         routes["ipv4"].append(entry)
 
     try:
-        (route_data6, _err6) = subp.subp(
+        (route_data6, _err6) = subp.probe(
             ["netstat", "-A", "inet6", "--route", "--numeric"], rcs=[0, 1]
         )
     except subp.ProcessExecutionError:
@@ -551,13 +707,16 @@ def _netdev_route_info_netstat(route_data):
 
 def route_info():
     routes = {}
-    if subp.which("ip"):
+    netlink_routes = _query_netlink(_netdev_route_info_netlink)
+    if netlink_routes is not None:
+        routes = netlink_routes
+    elif subp.which("ip"):
         # Try iproute first of all
-        (iproute_out, _err) = subp.subp(["ip", "-o", "route", "list"])
+        (iproute_out, _err) = subp.probe(["ip", "-o", "route", "list"])
         routes = _netdev_route_info_iproute(iproute_out)
     elif subp.which("netstat"):
         # Fall back to net-tools if iproute2 is not present
-        (route_out, _err) = subp.subp(
+        (route_out, _err) = subp.probe(
             ["netstat", "--route", "--numeric", "--extend"], rcs=[0, 1]
         )
         routes = _netdev_route_info_netstat(route_out)
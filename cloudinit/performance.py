@@ -1,6 +1,9 @@
 import functools
 import logging
+import sys
+import threading
 import time
+from typing import List, NamedTuple
 
 LOG = logging.getLogger(__name__)
 
@@ -105,3 +108,108 @@ def timed(msg: str, *, threshold: float = 0.01, log_mode: str = "threshold"):
         return decorator
 
     return wrapper
+
+
+class ImportTiming(NamedTuple):
+    """Import time of a single module.
+
+    :param name: The imported module name
+    :param duration: Seconds spent executing the module, including the time
+        spent importing any modules it imported
+    :param depth: How many imports were in progress when this one started
+    """
+
+    name: str
+    duration: float
+    depth: int
+
+
+class ImportProfiler:
+    """
+    A meta path finder which records how long each module takes to import.
+
+    The profiler does not locate modules itself. While started it takes the
+    place of the other finders on sys.meta_path, asks each of them for a
+    spec in turn and wraps the loader's exec_module to time it. Each finder
+    is asked once, so a module which is not found is not looked up again.
+    Modules imported before start() is called are not recorded.
+
+    usage:
+
+        ```
+        profiler = ImportProfiler()
+        profiler.start()
+        import cloudinit.stages
+        profiler.stop()
+        for timing in profiler.collect():
+            print(timing.name, timing.duration)
+        ```
+    """
+
+    def __init__(self):
+        self.timings: List[ImportTiming] = []
+        self._local = threading.local()
+        self._finders: list = []
+
+    def start(self):
+        if self not in sys.meta_path:
+            self._finders = list(sys.meta_path)
+            sys.meta_path[:] = [self]
+
+    def stop(self):
+        if self in sys.meta_path:
+            # Keep any finders added while profiling after the original ones
+            added = [
+                finder
+                for finder in sys.meta_path
+                if finder is not self and finder not in self._finders
+            ]
+            sys.meta_path[:] = self._finders + added
+            self._finders = []
+
+    def collect(self) -> List[ImportTiming]:
+        """Return and forget top-level import timings recorded so far.
+
+        Imports nested in another import are included in the duration of
+        the top-level import which triggered them.
+        """
+        timings, self.timings = self.timings, []
+        return [timing for timing in timings if timing.depth == 0]
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in self._finders:
+            if not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Builtin and frozen importers are shared classes rather than
+        # per-module instances, so leave them untimed.
+        if (
+            loader is None
+            or isinstance(loader, type)
+            or not hasattr(loader, "exec_module")
+        ):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            start = time.monotonic()
+            try:
+                exec_module(module)
+            finally:
+                self._local.depth = depth
+                self.timings.append(
+                    ImportTiming(fullname, time.monotonic() - start, depth)
+                )
+
+        try:
+            setattr(loader, "exec_module", timed_exec_module)
+        except AttributeError:
+            pass
+        return spec
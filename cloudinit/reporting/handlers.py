@@ -14,7 +14,7 @@ from datetime import datetime, timezone
 from threading import Event
 from typing import Union
 
-from cloudinit import dmi, performance, url_helper, util
+from cloudinit import dmi, performance, util
 from cloudinit.registry import DictRegistry
 
 LOG = logging.getLogger(__name__)
@@ -81,6 +81,7 @@ class WebHookHandler(ReportingHandler):
         retries=None,
     ):
         super(WebHookHandler, self).__init__()
+        from cloudinit import url_helper
 
         if any([consumer_key, token_key, token_secret, consumer_secret]):
             oauth_helper = url_helper.OauthUrlHelper(
@@ -0,0 +1,564 @@
+# This file is part of cloud-init. See LICENSE file for license information.
+"""Read seed filesystems without mounting them.
+
+Datasources such as ConfigDrive, NoCloud, OVF and Azure read a handful of
+small files from an ISO9660 or vfat filesystem on a block device. Mounting it
+requires running mount and umount, may load kernel modules and can stall
+waiting on udev. Instead, the files are read in-process and copied to a
+directory, which util.mount_cb then hands to its callback as though it was
+the mountpoint.
+"""
+
+import abc
+import logging
+import os
+import re
+import shutil
+import struct
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+ISO9660 = "iso9660"
+VFAT = "vfat"
+
+# Mount types which may be read in-process, mapped to the filesystem read.
+# None allows any filesystem which can be read.
+MOUNT_TYPES = {
+    "": None,
+    "auto": None,
+    "iso9660": ISO9660,
+    "cd9660": ISO9660,
+    "vfat": VFAT,
+    "fat": VFAT,
+    "msdos": VFAT,
+    "msdosfs": VFAT,
+}
+
+# Seed filesystems hold a few small files. Anything larger is mounted.
+MAX_EXTRACT_SIZE = 64 * 1024 * 1024
+
+# Bound the work done on corrupt or hostile filesystems.
+MAX_DEPTH = 32
+MAX_ENTRIES = 10000
+
+
+class UnsupportedFilesystem(ValueError):
+    """The device does not hold a filesystem which can be read in-process."""
+
+
+class Entry(NamedTuple):
+    """A file or directory in a seed filesystem."""
+
+    # Path relative to the root of the filesystem, separated by "/"
+    path: str
+    is_dir: bool
+    size: int
+    # The (offset, length) byte ranges of the device holding its contents
+    extents: Tuple[Tuple[int, int], ...] = ()
+
+
+def _check_name(name: str) -> str:
+    if not name or name in (".", "..") or "/" in name or "\0" in name:
+        raise UnsupportedFilesystem("Invalid file name %r" % name)
+    return name
+
+
+class Filesystem(abc.ABC):
+    fstype = ""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._entry_count = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        self.stream.seek(offset)
+        data = self.stream.read(length)
+        if len(data) != length:
+            raise UnsupportedFilesystem(
+                "Short read of %d bytes at offset %d" % (length, offset)
+            )
+        return data
+
+    def read_entry(self, entry: Entry) -> bytes:
+        return b"".join(
+            self.read(offset, length) for offset, length in entry.extents
+        )
+
+    @abc.abstractmethod
+    def entries(self) -> Iterator[Entry]:
+        """Walk the filesystem, yielding directories before their contents."""
+
+    def _count_entry(self):
+        self._entry_count += 1
+        if self._entry_count > MAX_ENTRIES:
+            raise UnsupportedFilesystem(
+                "More than %d files in filesystem" % MAX_ENTRIES
+            )
+
+
+class IsoFilesystem(Filesystem):
+    """ISO9660 reader using Rock Ridge or Joliet names when present.
+
+    Names are chosen as the Linux isofs driver does by default: Rock Ridge
+    names are preferred over Joliet names, and plain ISO9660 names are
+    lowercased with their version and any trailing dot removed.
+    """
+
+    fstype = ISO9660
+    SECTOR_SIZE = 2048
+    # The escape sequences identifying a Joliet supplementary descriptor
+    JOLIET_ESCAPES = (b"%/@", b"%/C", b"%/E")
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__(stream)
+        primary = joliet = None
+        for sector in range(16, 16 + 64):
+            desc = self.read(sector * self.SECTOR_SIZE, self.SECTOR_SIZE)
+            if desc[1:6] != b"CD001":
+                raise UnsupportedFilesystem("No ISO9660 volume descriptor")
+            if desc[0] == 255:
+                break
+            if desc[0] == 1 and primary is None:
+                primary = desc
+            elif desc[0] == 2 and desc[88:91] in self.JOLIET_ESCAPES:
+                joliet = desc
+        if primary is None:
+            raise UnsupportedFilesystem("No ISO9660 primary volume descriptor")
+        self.block_size = struct.unpack_from("<H", primary, 128)[0]
+        if self.block_size not in (512, 1024, 2048):
+            raise UnsupportedFilesystem(
+                "Unsupported ISO9660 block size %d" % self.block_size
+            )
+        self.root = self._parse_record(primary[156:190])
+        self.joliet = False
+        # The number of bytes to skip at the start of each system use area,
+        # or None when the filesystem has no Rock Ridge extensions.
+        self.susp_skip = self._find_rock_ridge()
+        if self.susp_skip is None and joliet is not None:
+            self.joliet = True
+            self.root = self._parse_record(joliet[156:190])
+
+    @staticmethod
+    def _parse_record(record: bytes) -> dict:
+        if len(record) < 34 or record[0] > len(record):
+            raise UnsupportedFilesystem("Invalid ISO9660 directory record")
+        name_len = record[32]
+        name_end = 33 + name_len
+        if name_end > record[0]:
+            raise UnsupportedFilesystem("Invalid ISO9660 directory record")
+        return {
+            "extent": struct.unpack_from("<I", record, 2)[0],
+            "size": struct.unpack_from("<I", record, 10)[0],
+            "flags": record[25],
+            "interleaved": record[26] or record[27],
+            "name": record[33:name_end],
+            # A padding byte follows names of even length
+            "system_use": record[name_end + (1 - name_len % 2) : record[0]],
+        }
+
+    def _records(self, directory: dict) -> Iterator[dict]:
+        data = self.read(
+            directory["extent"] * self.block_size, directory["size"]
+        )
+        pos = 0
+        while pos < len(data):
+            length = data[pos]
+            if length == 0:
+                # Records do not span sectors, so the rest is padding
+                pos = (pos // self.SECTOR_SIZE + 1) * self.SECTOR_SIZE
+                continue
+            yield self._parse_record(data[pos : pos + length])
+            pos += length
+
+    def _find_rock_ridge(self) -> Optional[int]:
+        for record in self._records(self.root):
+            # The "SP" entry begins the system use area of the root's "."
+            su = record["system_use"]
+            if su[:2] == b"SP" and len(su) >= 7 and su[4:6] == b"\xbe\xef":
+                return su[6]
+            return None
+        return None
+
+    def _susp_entries(
+        self, system_use: bytes
+    ) -> Iterator[Tuple[bytes, bytes]]:
+        data = system_use[self.susp_skip or 0 :]
+        for _ in range(16):
+            continuation = None
+            pos = 0
+            while pos + 4 <= len(data):
+                length = data[pos + 2]
+                if length < 4 or pos + length > len(data):
+                    break
+                signature = data[pos : pos + 2]
+                entry = data[pos : pos + length]
+                pos += length
+                if signature == b"ST":
+                    break
+                if signature == b"CE" and length >= 28:
+                    continuation = struct.unpack_from("<I4xI4xI", entry, 4)
+                else:
+                    yield signature, entry
+            if not continuation:
+                return
+            block, offset, length = continuation
+            data = self.read(block * self.block_size + offset, length)
+        raise UnsupportedFilesystem("Too many Rock Ridge continuation areas")
+
+    def _name(self, record: dict) -> Optional[str]:
+        """Return the name of a record, or None if it should be hidden."""
+        if self.susp_skip is not None:
+            alternate = b""
+            for signature, entry in self._susp_entries(record["system_use"]):
+                if signature == b"NM" and not entry[4] & 0x06:
+                    alternate += entry[5:]
+                elif signature == b"RE":
+                    # A relocated directory is listed under its real parent
+                    return None
+                elif signature in (b"CL", b"SL"):
+                    raise UnsupportedFilesystem(
+                        "Unsupported Rock Ridge %s entry" % signature.decode()
+                    )
+            if alternate:
+                return _check_name(alternate.decode("utf-8", "replace"))
+        if self.joliet:
+            name = record["name"].decode("utf-16-be", "replace")
+            return _check_name(re.sub(r";\d*$", "", name))
+        name = record["name"].decode("latin-1").split(";")[0]
+        return _check_name(name.rstrip(".").lower())
+
+    def entries(self) -> Iterator[Entry]:
+        yield from self._walk(self.root, "", 0, set())
+
+    def _walk(self, directory, prefix, depth, seen) -> Iterator[Entry]:
+        if depth > MAX_DEPTH or directory["extent"] in seen:
+            raise UnsupportedFilesystem("ISO9660 directory loop or too deep")
+        seen.add(directory["extent"])
+        for record in self._records(directory):
+            if record["name"] in (b"\0", b"\1"):
+                continue
+            if record["flags"] & 0x04:
+                # Associated files are hidden by default
+                continue
+            if record["flags"] & 0x80 or record["interleaved"]:
+                raise UnsupportedFilesystem(
+                    "Unsupported multi-extent or interleaved ISO9660 file"
+                )
+            name = self._name(record)
+            if name is None:
+                continue
+            self._count_entry()
+            path = prefix + name
+            if record["flags"] & 0x02:
+                yield Entry(path, True, 0)
+                yield from self._walk(record, path + "/", depth + 1, seen)
+            else:
+                yield Entry(
+                    path,
+                    False,
+                    record["size"],
+                    (
+                        (
+                            (
+                                record["extent"] * self.block_size,
+                                record["size"],
+                            ),
+                        )
+                        if record["size"]
+                        else ()
+                    ),
+                )
+
+
+class FatFilesystem(Filesystem):
+    """FAT12, FAT16 and FAT32 reader using long file names when present.
+
+    Short names are shown with the case recorded for them by Windows NT and
+    Linux, as the Linux vfat driver does by default.
+    """
+
+    fstype = VFAT
+    # The largest file allocation table which will be read
+    MAX_FAT_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__(stream)
+        boot = self.read(0, 512)
+        if boot[510:512] != b"\x55\xaa":
+            raise UnsupportedFilesystem("No FAT boot sector signature")
+        (
+            self.sector_size,
+            sectors_per_cluster,
+            reserved_sectors,
+            fat_count,
+            root_entries,
+            total_sectors,
+            media,
+            fat_sectors,
+        ) = struct.unpack_from("<HBHBHHBH", boot, 11)
+        if (
+            boot[0] not in (0xEB, 0xE9)
+            or not (media == 0xF0 or media >= 0xF8)
+            or self.sector_size not in (512, 1024, 2048, 4096)
+            or sectors_per_cluster not in (1, 2, 4, 8, 16, 32, 64, 128)
+            or not reserved_sectors
+            or not fat_count
+        ):
+            raise UnsupportedFilesystem("Invalid FAT boot sector")
+        if not total_sectors:
+            total_sectors = struct.unpack_from("<I", boot, 32)[0]
+        if not fat_sectors:
+            fat_sectors = struct.unpack_from("<I", boot, 36)[0]
+        self.cluster_size = sectors_per_cluster * self.sector_size
+        root_sectors = -(-root_entries * 32 // self.sector_size)
+        self.root_offset = (
+            reserved_sectors + fat_count * fat_sectors
+        ) * self.sector_size
+        self.root_size = root_sectors * self.sector_size
+        first_data_sector = (
+            reserved_sectors + fat_count * fat_sectors + root_sectors
+        )
+        self.data_offset = first_data_sector * self.sector_size
+        if total_sectors <= first_data_sector:
+            raise UnsupportedFilesystem("Invalid FAT boot sector")
+        self.cluster_count = (
+            total_sectors - first_data_sector
+        ) // sectors_per_cluster
+        if self.cluster_count < 4085:
+            self.fat_bits = 12
+        elif self.cluster_count < 65525:
+            self.fat_bits = 16
+        else:
+            self.fat_bits = 32
+            self.root_cluster = struct.unpack_from("<I", boot, 44)[0]
+        fat_size = fat_sectors * self.sector_size
+        if not fat_size or fat_size > self.MAX_FAT_SIZE:
+            raise UnsupportedFilesystem(
+                "Unsupported FAT size of %d bytes" % fat_size
+            )
+        self.fat = self.read(reserved_sectors * self.sector_size, fat_size)
+
+    def _next_cluster(self, cluster: int) -> Optional[int]:
+        try:
+            if self.fat_bits == 12:
+                value = struct.unpack_from(
+                    "<H", self.fat, cluster + cluster // 2
+                )[0]
+                value = value >> 4 if cluster & 1 else value & 0xFFF
+                end = 0xFF8
+            elif self.fat_bits == 16:
+                value = struct.unpack_from("<H", self.fat, cluster * 2)[0]
+                end = 0xFFF8
+            else:
+                value = (
+                    struct.unpack_from("<I", self.fat, cluster * 4)[0]
+                    & 0x0FFFFFFF
+                )
+                end = 0x0FFFFFF8
+        except struct.error as e:
+            raise UnsupportedFilesystem("Invalid FAT cluster chain") from e
+        return None if value >= end else value
+
+    def _chain(self, cluster: int, size: Optional[int] = None):
+        """Return the byte ranges of a cluster chain, merging adjacent ones.
+
+        With a size, the chain is trimmed to it. Without one, the chain is
+        read to its end, as for directories.
+        """
+        extents: List[Tuple[int, int]] = []
+        remaining = size
+        for _ in range(self.cluster_count):
+            if not 2 <= cluster < self.cluster_count + 2:
+                raise UnsupportedFilesystem("Invalid FAT cluster %d" % cluster)
+            offset = self.data_offset + (cluster - 2) * self.cluster_size
+            length = self.cluster_size
+            if remaining is not None:
+                length = min(length, remaining)
+                remaining -= length
+            if extents and sum(extents[-1]) == offset:
+                extents[-1] = (extents[-1][0], extents[-1][1] + length)
+            else:
+                extents.append((offset, length))
+            next_cluster = self._next_cluster(cluster)
+            if next_cluster is None or remaining == 0:
+                break
+            cluster = next_cluster
+        else:
+            raise UnsupportedFilesystem("FAT cluster chain loop")
+        if remaining:
+            raise UnsupportedFilesystem("FAT cluster chain too short")
+        return tuple(extents)
+
+    @staticmethod
+    def _short_name(entry: bytes) -> str:
+        base = entry[0:8].rstrip(b" ")
+        if base[:1] == b"\x05":
+            base = b"\xe5" + base[1:]
+        ext = entry[8:11].rstrip(b" ")
+        name = base.decode("cp437")
+        extension = ext.decode("cp437")
+        if entry[12] & 0x08:
+            name = name.lower()
+        if entry[12] & 0x10:
+            extension = extension.lower()
+        return name + "." + extension if extension else name
+
+    @staticmethod
+    def _checksum(entry: bytes) -> int:
+        checksum = 0
+        for byte in entry[0:11]:
+            checksum = (((checksum & 1) << 7) + (checksum >> 1) + byte) & 0xFF
+        return checksum
+
+    def _dir_entries(self, data: bytes) -> Iterator[Tuple[str, bytes]]:
+        long_name: List[bytes] = []
+        long_checksum = None
+        for pos in range(0, len(data) - 31, 32):
+            entry = data[pos : pos + 32]
+            if entry[0] == 0:
+                return
+            if entry[0] == 0xE5:
+                long_name = []
+                continue
+            if entry[11] == 0x0F:
+                if entry[0] & 0x40:
+                    long_name = []
+                    long_checksum = entry[13]
+                long_name.insert(0, entry[1:11] + entry[14:26] + entry[28:32])
+                continue
+            name = None
+            if long_name and long_checksum == self._checksum(entry):
+                name = (
+                    b"".join(long_name)
+                    .decode("utf-16-le", "replace")
+                    .split("\0")[0]
+                )
+            long_name = []
+            if entry[11] & 0x08:
+                # Volume label
+                continue
+            if entry[0:1] == b"." and entry[0:11].strip(b". ") == b"":
+                continue
+            yield _check_name(name or self._short_name(entry)), entry
+
+    def _read_chain(self, cluster: int) -> bytes:
+        return b"".join(
+            self.read(offset, length)
+            for offset, length in self._chain(cluster)
+        )
+
+    def entries(self) -> Iterator[Entry]:
+        if self.fat_bits == 32:
+            root = self._read_chain(self.root_cluster)
+        else:
+            root = self.read(self.root_offset, self.root_size)
+        yield from self._walk(root, "", 0)
+
+    def _walk(self, data: bytes, prefix: str, depth: int) -> Iterator[Entry]:
+        if depth > MAX_DEPTH:
+            raise UnsupportedFilesystem("FAT directories nested too deep")
+        for name, entry in self._dir_entries(data):
+            self._count_entry()
+            path = prefix + name
+            cluster = struct.unpack_from("<H", entry, 26)[0]
+            if self.fat_bits == 32:
+                cluster |= struct.unpack_from("<H", entry, 20)[0] << 16
+            if entry[11] & 0x10:
+                yield Entry(path, True, 0)
+                if cluster:
+                    yield from self._walk(
+                        self._read_chain(cluster), path + "/", depth + 1
+                    )
+            else:
+                size = struct.unpack_from("<I", entry, 28)[0]
+                yield Entry(
+                    path,
+                    False,
+                    size,
+                    self._chain(cluster, size) if size else (),
+                )
+
+
+FILESYSTEMS = {ISO9660: IsoFilesystem, VFAT: FatFilesystem}
+
+
+def readable_types(mtypes: Optional[List[str]]) -> List[str]:
+    """Return the filesystems which may be read for the given mount types."""
+    fstypes: List[str] = []
+    for mtype in mtypes or ["auto"]:
+        if mtype not in MOUNT_TYPES:
+            continue
+        fstype = MOUNT_TYPES[mtype]
+        for candidate in [fstype] if fstype else FILESYSTEMS:
+            if candidate not in fstypes:
+                fstypes.append(candidate)
+    return fstypes
+
+
+def open_filesystem(stream: BinaryIO, fstypes: List[str]) -> Filesystem:
+    """Return a reader for the first of fstypes found on stream."""
+    errors = []
+    for fstype in fstypes:
+        try:
+            return FILESYSTEMS[fstype](stream)
+        except UnsupportedFilesystem as e:
+            errors.append("%s: %s" % (fstype, e))
+    raise UnsupportedFilesystem("; ".join(errors) or "No readable types")
+
+
+def extract(
+    device: str,
+    target: str,
+    mtypes: Optional[List[str]] = None,
+    max_size: int = MAX_EXTRACT_SIZE,
+) -> str:
+    """Copy the files of the filesystem on device into the target directory.
+
+    Only filesystems allowed by the mount types in mtypes are read. File
+    contents are read in the order they are stored on the device.
+
+    @return: The type of filesystem read.
+    @raises UnsupportedFilesystem: The device does not hold a filesystem
+        which can be read, or its files total more than max_size bytes.
+    @raises OSError: The device or target could not be accessed.
+    """
+    fstypes = readable_types(mtypes)
+    with open(device, "rb") as stream:
+        filesystem = open_filesystem(stream, fstypes)
+        entries = list(filesystem.entries())
+        total = sum(entry.size for entry in entries)
+        if total > max_size:
+            raise UnsupportedFilesystem(
+                "Files total %d bytes, more than %d" % (total, max_size)
+            )
+        files = sorted(
+            (entry for entry in entries if not entry.is_dir),
+            key=lambda entry: entry.extents[:1],
+        )
+        written = []
+        try:
+            for entry in entries:
+                if entry.is_dir:
+                    path = os.path.join(target, entry.path)
+                    os.makedirs(path, exist_ok=True)
+                    written.append(path)
+            for entry in files:
+                path = os.path.join(target, entry.path)
+                written.append(path)
+                with open(path, "wb") as stream_out:
+                    stream_out.write(filesystem.read_entry(entry))
+        except Exception:
+            for path in reversed(written):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.lexists(path):
+                    os.unlink(path)
+            raise
+    LOG.debug(
+        "Read %d files from %s filesystem on %s",
+        len(files),
+        filesystem.fstype,
+        device,
+    )
+    return filesystem.fstype
@@ -95,6 +95,10 @@ class DataSourceEc2(sources.DataSource):
     url_max_wait = 240
     url_timeout = 50
 
+    # Default number of concurrent requests used to crawl the metadata tree.
+    # Overridden by the metadata_crawl_workers datasource config key.
+    metadata_crawl_workers = 1
+
     _api_token = None  # API token for accessing the metadata service
     _network_config = sources.UNSET  # Used to cache calculated network cfg v1
 
@@ -558,6 +562,22 @@ class DataSourceEc2(sources.DataSource):
 
         return self._network_config
 
+    def _get_metadata_crawl_workers(self) -> int:
+        """Return the number of concurrent requests used to crawl metadata."""
+        workers = self.ds_cfg.get(
+            "metadata_crawl_workers", self.metadata_crawl_workers
+        )
+        try:
+            return max(1, int(workers))
+        except (TypeError, ValueError):
+            LOG.warning(
+                "Config metadata_crawl_workers '%s' is not an int, using"
+                " default '%s'",
+                workers,
+                self.metadata_crawl_workers,
+            )
+            return self.metadata_crawl_workers
+
     def crawl_metadata(self):
         """Crawl metadata service when available.
 
@@ -578,6 +598,7 @@ class DataSourceEc2(sources.DataSource):
             skip_cb = skip_404_tag_errors
         else:
             exc_cb = exc_cb_ud = skip_cb = None
+        crawl_workers = self._get_metadata_crawl_workers()
         try:
             raw_userdata = ec2.get_instance_userdata(
                 api_version,
@@ -594,6 +615,7 @@ class DataSourceEc2(sources.DataSource):
                 headers_redact=redact,
                 exception_cb=exc_cb,
                 retrieval_exception_ignore_cb=skip_cb,
+                max_workers=crawl_workers,
             )
             if self.cloud_name == CloudNames.AWS:
                 identity = ec2.get_instance_identity(
@@ -602,6 +624,7 @@ class DataSourceEc2(sources.DataSource):
                     headers_cb=self._get_headers,
                     headers_redact=redact,
                     exception_cb=exc_cb,
+                    max_workers=crawl_workers,
                 )
                 crawled_metadata["dynamic"] = {"instance-identity": identity}
         except Exception:
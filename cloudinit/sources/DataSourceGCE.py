@@ -6,6 +6,7 @@ import datetime
 import json
 import logging
 from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor
 
 from cloudinit import dmi, net, sources, url_helper, util
 from cloudinit.distros import ug_util
@@ -58,6 +59,47 @@ class GoogleMetadataFetcher:
                 LOG.debug("url %s returned code %s", path, resp.code)
         return value
 
+    def get_values(self, requests):
+        """Fetch each (path, is_text, is_recursive) request concurrently.
+
+        Return the values in the order requested.
+        """
+        if not requests:
+            return []
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            return list(
+                executor.map(lambda args: self.get_value(*args), requests)
+            )
+
+    def get_tree(self, path=""):
+        """Fetch everything below path as a single JSON document.
+
+        Return the parsed document, or None if it could not be read.
+        """
+        url = self.metadata_address + path + "?recursive=true"
+        try:
+            resp = url_helper.readurl(
+                url=url,
+                headers=HEADERS,
+                retries=self.num_retries,
+                sec_between=self.sec_between_retries,
+            )
+        except url_helper.UrlError as exc:
+            LOG.debug("url %s raised exception %s", url, exc)
+            return None
+        if resp.code != 200:
+            LOG.debug("url %s returned code %s", url, resp.code)
+            return None
+        try:
+            tree = json.loads(resp.contents)
+        except ValueError as exc:
+            LOG.debug("url %s returned invalid JSON: %s", url, exc)
+            return None
+        if not isinstance(tree, dict):
+            LOG.debug("url %s did not return a JSON object", url)
+            return None
+        return tree
+
 
 class DataSourceGCE(sources.DataSource):
 
@@ -247,6 +289,16 @@ def _parse_public_keys(public_keys_data, default_user=None):
     return public_keys
 
 
+# URL_MAP: (our-key, path, required, is_text, is_recursive)
+URL_MAP = [
+    ("instance-id", "instance/id", True, True, False),
+    ("availability-zone", "instance/zone", True, True, False),
+    ("local-hostname", "instance/hostname", True, True, False),
+    ("instance-data", "instance/attributes", False, False, True),
+    ("project-data", "project/attributes", False, False, True),
+]
+
+
 def read_md(address=None, url_params=None, platform_check=True):
 
     if address is None:
@@ -270,33 +322,66 @@ def read_md(address=None, url_params=None, platform_check=True):
         ret["reason"] = 'address "%s" is not resolvable' % address
         return ret
 
-    # url_map: (our-key, path, required, is_text, is_recursive)
-    url_map = [
-        ("instance-id", ("instance/id",), True, True, False),
-        ("availability-zone", ("instance/zone",), True, True, False),
-        ("local-hostname", ("instance/hostname",), True, True, False),
-        ("instance-data", ("instance/attributes",), False, False, True),
-        ("project-data", ("project/attributes",), False, False, True),
-    ]
     metadata_fetcher = GoogleMetadataFetcher(
         address, url_params.num_retries, url_params.sec_between_retries
     )
+    # Read everything in one request, falling back to a request per key
+    # for metadata servers which do not support recursive reads.
+    tree = metadata_fetcher.get_tree()
+    md = _md_from_tree(tree) if tree is not None else None
+    if md is None:
+        LOG.debug("Reading GCE metadata keys individually")
+        values = metadata_fetcher.get_values(
+            [
+                (path, is_text, is_recursive)
+                for _, path, _, is_text, is_recursive in URL_MAP
+            ]
+        )
+        md = {}
+        for (mkey, _path, required, _is_text, is_recursive), value in zip(
+            URL_MAP, values
+        ):
+            if required and value is None:
+                msg = "required key %s returned nothing. not GCE"
+                ret["reason"] = msg % mkey
+                return ret
+            if is_recursive:
+                value = json.loads(value or "{}")
+            md[mkey] = value
+
+    ret["meta-data"], ret["user-data"] = _parse_md(md)
+    ret["success"] = True
+
+    return ret
+
+
+def _md_from_tree(tree):
+    """Return the URL_MAP keys from a recursive read of all metadata.
+
+    Return None if a required key is missing.
+    """
     md = {}
-    # Iterate over url_map keys to get metadata items.
-    for mkey, paths, required, is_text, is_recursive in url_map:
-        value = None
-        for path in paths:
-            new_value = metadata_fetcher.get_value(path, is_text, is_recursive)
-            if new_value is not None:
-                value = new_value
-        if required and value is None:
-            msg = "required key %s returned nothing. not GCE"
-            ret["reason"] = msg % mkey
-            return ret
+    for mkey, path, required, _is_text, is_recursive in URL_MAP:
+        value = tree
+        for part in path.split("/"):
+            value = value.get(part) if isinstance(value, dict) else None
+        if is_recursive:
+            value = value if isinstance(value, dict) else {}
+        elif value is not None:
+            value = str(value)
+        elif required:
+            LOG.debug("Recursive metadata read is missing %s", path)
+            return None
         md[mkey] = value
+    return md
 
-    instance_data = json.loads(md["instance-data"] or "{}")
-    project_data = json.loads(md["project-data"] or "{}")
+
+def _parse_md(md):
+    """Return the meta-data and user-data of the URL_MAP keys in md."""
+    md = dict(md)
+    user_data = None
+    instance_data = md["instance-data"]
+    project_data = md["project-data"]
     valid_keys = [instance_data.get("sshKeys"), instance_data.get("ssh-keys")]
     block_project = instance_data.get("block-project-ssh-keys", "").lower()
     if block_project != "true" and not instance_data.get("sshKeys"):
@@ -316,18 +401,9 @@ def read_md(address=None, url_params=None, platform_check=True):
             ud = b64decode(ud)
         elif encoding:
             LOG.warning("unknown user-data-encoding: %s, ignoring", encoding)
-        ret["user-data"] = ud
-
-    # Update md with parsed instance-data
-    md["instance-data"] = instance_data
+        user_data = ud
 
-    # Update md with parsed project-data
-    md["project-data"] = project_data
-
-    ret["meta-data"] = md
-    ret["success"] = True
-
-    return ret
+    return md, user_data
 
 
 def platform_reports_gce():
@@ -13,6 +13,7 @@ import os
 import socket
 import stat
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Flag, auto
 from json.decoder import JSONDecodeError
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
@@ -33,6 +34,9 @@ LXD_SOCKET_PATH = "/dev/lxd/sock"
 LXD_SOCKET_API_VERSION = "1.0"
 LXD_URL = "http://lxd"
 
+# Upper bound on concurrent config key requests sharing one socket session
+MAX_CONFIG_FETCH_WORKERS = 4
+
 # Config key mappings to alias as top-level instance data keys
 CONFIG_KEY_ALIASES = {
     "cloud-init.user-data": "user-data",
@@ -48,7 +52,7 @@ def _get_fallback_interface_name() -> str:
     default_name = "eth0"
     if subp.which("systemd-detect-virt"):
         try:
-            virt_type, _ = subp.subp(["systemd-detect-virt"])
+            virt_type, _ = subp.probe(["systemd-detect-virt"])
         except subp.ProcessExecutionError as err:
             LOG.warning(
                 "Unable to run systemd-detect-virt: %s."
@@ -120,17 +124,40 @@ class SocketHTTPConnection(HTTPConnection):
 
 
 class SocketConnectionPool(HTTPConnectionPool):
-    def __init__(self, socket_path):
+    def __init__(self, socket_path, maxsize=1):
         self.socket_path = socket_path
-        super().__init__("localhost")
+        super().__init__("localhost", maxsize=maxsize)
 
     def _new_conn(self):
         return SocketHTTPConnection(self.socket_path)
 
 
 class LXDSocketAdapter(HTTPAdapter):
+    """Route requests over one keep-alive pool of /dev/lxd/sock connections.
+
+    The pool is created on first use and reused for every request made
+    through this adapter, so a metadata crawl does not reconnect to the
+    socket per route.
+    """
+
+    def __init__(self, socket_path=LXD_SOCKET_PATH, maxsize=1):
+        self.socket_path = socket_path
+        self.maxsize = maxsize
+        self._pool: Optional[SocketConnectionPool] = None
+        super().__init__()
+
     def get_connection(self, url, proxies=None):
-        return SocketConnectionPool(LXD_SOCKET_PATH)
+        if self._pool is None:
+            self._pool = SocketConnectionPool(
+                self.socket_path, maxsize=self.maxsize
+            )
+        return self._pool
+
+    def close(self):
+        super().close()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
 
     # Fix for requests 2.32.2+:
     # https://github.com/psf/requests/pull/6710
@@ -355,14 +382,30 @@ class _MetaDataReader:
         # the dict path {LXD_SOCKET_API_VERSION: {config: {...}}.
         config_routes = _get_json_response(session, config_url)
 
+        # Fetch config keys concurrently over the shared socket session,
+        # then process the responses in sorted order below.
+        routes = sorted(config_routes)
+        route_urls = [
+            url_helper.combine_url(LXD_URL, route) for route in routes
+        ]
+        responses: List[requests.Response] = []
+        if route_urls:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_CONFIG_FETCH_WORKERS, len(route_urls))
+            ) as executor:
+                responses = list(
+                    executor.map(
+                        lambda url: _do_request(session, url, do_raise=False),
+                        route_urls,
+                    )
+                )
+
         # Sorting keys to ensure we always process in alphabetical order.
         # cloud-init.* keys will sort before user.* keys which is preferred
         # precedence.
-        for config_route in sorted(config_routes):
-            config_route_url = url_helper.combine_url(LXD_URL, config_route)
-            config_route_response = _do_request(
-                session, config_route_url, do_raise=False
-            )
+        for config_route, config_route_url, config_route_response in zip(
+            routes, route_urls, responses
+        ):
             response_text = config_route_response.content.decode("utf-8")
             if not config_route_response.ok:
                 LOG.debug(
@@ -395,7 +438,10 @@ class _MetaDataReader:
 
     def __call__(self, *, metadata_keys: MetaDataKeys) -> dict:
         with requests.Session() as session:
-            session.mount(self._version_url, LXDSocketAdapter())
+            session.mount(
+                self._version_url,
+                LXDSocketAdapter(maxsize=MAX_CONFIG_FETCH_WORKERS),
+            )
             # Document API version read
             md: dict = {"_metadata_api_version": self.api_version}
             if MetaDataKeys.META_DATA in metadata_keys:
@@ -39,6 +39,44 @@ EXCLUDED_VARS = (
     "SRANDOM",
     "__v",
 )
+# Variables which the shell treats specially when assigned, e.g. because
+# they are readonly. parse_context_sh leaves them to the shell.
+SHELL_SPECIAL_VARS = (
+    "BASHOPTS",
+    "BASHPID",
+    "BASH_ARGV0",
+    "BASH_COMPAT",
+    "BASH_LINENO",
+    "BASH_SOURCE",
+    "BASH_SUBSHELL",
+    "BASH_VERSINFO",
+    "BASH_XTRACEFD",
+    "DIRSTACK",
+    "EUID",
+    "FUNCNAME",
+    "GROUPS",
+    "HISTCMD",
+    "OPTIND",
+    "PPID",
+    "SHELLOPTS",
+    "UID",
+)
+ANSI_C_ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "e": "\x1b",
+    "E": "\x1b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+    "?": "?",
+}
+SHELL_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
 
 class DataSourceOpenNebula(sources.DataSource):
@@ -150,6 +188,10 @@ class BrokenContextDiskDir(Exception):
     pass
 
 
+class UnsupportedShellSyntax(ValueError):
+    """context.sh uses shell syntax which parse_context_sh does not handle"""
+
+
 class OpenNebulaNetwork:
     def __init__(
         self,
@@ -455,6 +497,194 @@ def parse_shell_config(
     return ret
 
 
+class ContextParser:
+    """Parse the variable assignments which OpenNebula writes to context.sh
+
+    Only assignments, optionally exported, and comments are understood.
+    Values may combine unquoted, single quoted, double quoted and $'...'
+    strings. Anything which would need a shell to evaluate, such as
+    parameter expansion or command substitution, raises
+    UnsupportedShellSyntax.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> str:
+        return self.content[self.pos + offset : self.pos + offset + 1]
+
+    def unsupported(self, reason: str):
+        line = self.content.count("\n", 0, self.pos) + 1
+        return UnsupportedShellSyntax("%s on line %d" % (reason, line))
+
+    def skip_blanks(self):
+        while self.peek() in (" ", "\t"):
+            self.pos += 1
+        if self.content.startswith("\\\n", self.pos):
+            self.pos += 2
+            self.skip_blanks()
+
+    def parse(self) -> Dict[str, str]:
+        variables: Dict[str, str] = {}
+        while self.pos < len(self.content):
+            self.skip_blanks()
+            char = self.peek()
+            if char == "\n":
+                self.pos += 1
+            elif char == "#":
+                end = self.content.find("\n", self.pos)
+                self.pos = len(self.content) if end == -1 else end
+            elif char:
+                self.parse_command(variables)
+        return variables
+
+    def parse_command(self, variables: Dict[str, str]):
+        """Parse the assignments up to the end of a command"""
+        name = self.parse_name()
+        if name == "export" and self.peek() in (" ", "\t"):
+            self.skip_blanks()
+            name = self.parse_name()
+        while True:
+            if self.peek() != "=":
+                raise self.unsupported("Command or incomplete assignment")
+            if name in SHELL_SPECIAL_VARS:
+                raise self.unsupported("Assignment to %s" % name)
+            self.pos += 1
+            value = self.parse_word()
+            if name not in EXCLUDED_VARS:
+                variables[name] = value
+            self.skip_blanks()
+            char = self.peek()
+            if char == ";":
+                self.pos += 1
+                return
+            if char in ("", "\n", "#"):
+                return
+            name = self.parse_name()
+
+    def parse_name(self) -> str:
+        match = SHELL_NAME_RE.match(self.content, self.pos)
+        if not match:
+            raise self.unsupported("Expected a variable name")
+        self.pos = match.end()
+        return match.group(0)
+
+    def parse_word(self) -> str:
+        value: List[str] = []
+        while True:
+            char = self.peek()
+            if char in ("", " ", "\t", "\n", ";"):
+                return "".join(value)
+            elif char == "'":
+                end = self.content.find("'", self.pos + 1)
+                if end == -1:
+                    raise self.unsupported("Unterminated single quote")
+                value.append(self.content[self.pos + 1 : end])
+                self.pos = end + 1
+            elif char == '"':
+                value.append(self.parse_double_quoted())
+            elif char == "$" and self.peek(1) == "'":
+                value.append(self.parse_ansi_c_quoted())
+            elif char == "\\":
+                escaped = self.peek(1)
+                if not escaped:
+                    raise self.unsupported("Trailing backslash")
+                if escaped != "\n":
+                    value.append(escaped)
+                self.pos += 2
+            elif char in "$`~<>()&|{}":
+                raise self.unsupported("Unquoted %r" % char)
+            else:
+                value.append(char)
+                self.pos += 1
+
+    def parse_double_quoted(self) -> str:
+        value: List[str] = []
+        self.pos += 1
+        while True:
+            char = self.peek()
+            if not char:
+                raise self.unsupported("Unterminated double quote")
+            self.pos += 1
+            if char == '"':
+                return "".join(value)
+            elif char == "\\":
+                escaped = self.peek()
+                if escaped in ("$", "`", '"', "\\"):
+                    value.append(escaped)
+                elif escaped != "\n":
+                    value.append("\\" + escaped)
+                self.pos += 1
+            elif char == "$" and self.peek() != '"':
+                raise self.unsupported("Expansion in double quotes")
+            elif char == "`":
+                raise self.unsupported("Command substitution")
+            else:
+                value.append(char)
+
+    def parse_ansi_c_quoted(self) -> str:
+        value: List[str] = []
+        self.pos += 2
+        while True:
+            char = self.peek()
+            if not char:
+                raise self.unsupported("Unterminated $' quote")
+            self.pos += 1
+            if char == "'":
+                return "".join(value)
+            if char != "\\":
+                value.append(char)
+                continue
+            escaped = self.peek()
+            self.pos += 1
+            if escaped in ANSI_C_ESCAPES:
+                value.append(ANSI_C_ESCAPES[escaped])
+            elif escaped and escaped in "01234567":
+                self.pos -= 1
+                value.append(self.parse_code(8, 3))
+            elif escaped == "x":
+                value.append(self.parse_code(16, 2))
+            elif (
+                escaped == "c"
+                and self.peek().isascii()
+                and (self.peek().isalpha())
+            ):
+                value.append(chr(ord(self.peek()) & 0x1F))
+                self.pos += 1
+            elif escaped in ("u", "U", "c", ""):
+                raise self.unsupported("Unsupported $' escape")
+            else:
+                value.append("\\" + escaped)
+
+    def parse_code(self, base: int, max_digits: int) -> str:
+        """Return the ASCII character of an octal or hex escape"""
+        digits = "01234567" if base == 8 else "0123456789abcdefABCDEF"
+        start = self.pos
+        while (
+            self.pos - start < max_digits
+            and self.peek()
+            and self.peek() in digits
+        ):
+            self.pos += 1
+        if self.pos == start:
+            raise self.unsupported("Empty $' escape")
+        code = int(self.content[start : self.pos], base)
+        if not 0 < code < 0x80:
+            # The shell inserts bytes, which need not be valid text
+            raise self.unsupported("Non-ASCII $' escape")
+        return chr(code)
+
+
+def parse_context_sh(content: str) -> Dict[str, str]:
+    """Return the variables which content assigns, without running it
+
+    Raise UnsupportedShellSyntax if content is more than a list of
+    variable assignments, so that parse_shell_config can run it instead.
+    """
+    return ContextParser(content).parse()
+
+
 def read_context_disk_dir(
     source_dir: str, distro: Any, asuser: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -492,7 +722,11 @@ def read_context_disk_dir(
         try:
             path = os.path.join(source_dir, "context.sh")
             content = util.load_text_file(path)
-            context = parse_shell_config(content, asuser=asuser)
+            try:
+                context = parse_context_sh(content)
+            except UnsupportedShellSyntax as e:
+                LOG.debug("Running context.sh in a shell: %s", e)
+                context = parse_shell_config(content, asuser=asuser)
         except subp.ProcessExecutionError as e:
             raise BrokenContextDiskDir(
                 "Error processing context.sh: %s" % (e)
@@ -14,11 +14,13 @@ Notes:
 """
 
 import base64
+import functools
 import glob
 import ipaddress
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from cloudinit import atomic_helper, dmi, net, sources, util
@@ -522,17 +524,30 @@ def read_opc_metadata(
         for version in [2, 1]
         for metadata_pattern in metadata_patterns
     ]
-
-    LOG.debug("Attempting to fetch IMDS metadata from: %s", urls)
-    start_time = time.monotonic()
-    url_that_worked, instance_response = wait_for_url(
-        urls=urls,
+    wait = functools.partial(
+        wait_for_url,
         max_wait=max_wait,
         timeout=timeout,
         headers_cb=_headers_cb,
         sleep_time=0.1,
         connect_synchronously=True,
     )
+
+    LOG.debug("Attempting to fetch IMDS metadata from: %s", urls)
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        vnics_future = None
+        if fetch_vnics_data:
+            # Fetch the vnics data at the same time, trying the endpoints in
+            # the same order so that both usually come from the same one.
+            vnics_future = executor.submit(
+                wait, urls=[url.replace("instance", "vnics") for url in urls]
+            )
+        url_that_worked, instance_response = wait(urls=urls)
+        vnics_url: Any = False
+        vnics_response: Any = None
+        if vnics_future:
+            vnics_url, vnics_response = vnics_future.result()
     if not url_that_worked:
         LOG.warning(
             "Failed to fetch IMDS metadata from any of: %s",
@@ -551,17 +566,17 @@ def read_opc_metadata(
 
     vnics_data = None
     if fetch_vnics_data:
-        # This allows us to go over the max_wait time by the timeout length,
-        # but if we were able to retrieve instance metadata, that seems
-        # like a worthwhile tradeoff rather than having incomplete metadata.
-        vnics_url, vnics_response = wait_for_url(
-            urls=[url_that_worked.replace("instance", "vnics")],
-            max_wait=max_wait - (time.monotonic() - start_time),
-            timeout=timeout,
-            headers_cb=_headers_cb,
-            sleep_time=0.1,
-            connect_synchronously=True,
-        )
+        expected_vnics_url = url_that_worked.replace("instance", "vnics")
+        if vnics_url != expected_vnics_url:
+            # The vnics data must come from the endpoint which served the
+            # instance data. This allows us to go over the max_wait time by
+            # the timeout length, but if we were able to retrieve instance
+            # metadata, that seems like a worthwhile tradeoff rather than
+            # having incomplete metadata.
+            vnics_url, vnics_response = wait(
+                urls=[expected_vnics_url],
+                max_wait=max_wait - (time.monotonic() - start_time),
+            )
         if vnics_url:
             vnics_data = json.loads(vnics_response.decode("utf-8"))
             LOG.debug(
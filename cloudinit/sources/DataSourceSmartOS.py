@@ -250,6 +250,14 @@ class DataSourceSmartOS(sources.DataSource):
         # Open once for many requests, rather than once for each request
         self.md_client.open_transport()
 
+        # Values cached on an earlier boot may be stale. Fetch every key in
+        # one burst rather than one round trip at a time.
+        self.md_client.clear_cache()
+        self.md_client.prefetch(
+            [smartos_noun for smartos_noun, _ in SMARTOS_ATTRIB_MAP.values()]
+            + list(SMARTOS_ATTRIB_JSON.values())
+        )
+
         for ci_noun, attribute in SMARTOS_ATTRIB_MAP.items():
             smartos_noun, strip = attribute
             md[ci_noun] = self.md_client.get(smartos_noun, strip=strip)
@@ -329,6 +337,13 @@ class DataSourceSmartOS(sources.DataSource):
         self._set_provisioned()
         return True
 
+    def _unpickle(self, ci_pkl_version: int) -> None:
+        super()._unpickle(ci_pkl_version)
+        if isinstance(self.md_client, JoyentMetadataClient) and not hasattr(
+            self.md_client, "cache"
+        ):
+            self.md_client.cache = {}
+
     def _get_subplatform(self):
         return "serial (%s)" % SERIAL_DEVICE
 
@@ -382,11 +397,23 @@ class JoyentMetadataClient:
         r"( (?P<payload>.+))?)"
     )
 
+    # How many requests may be awaiting a response at once
+    pipeline_depth = 8
+
     def __init__(self, smartos_type=None, fp=None):
         if smartos_type is None:
             smartos_type = get_smartos_environ()
         self.smartos_type = smartos_type
         self.fp = fp
+        # Values of keys already fetched, or None if not found
+        self.cache = {}
+
+    def __getstate__(self):
+        # Metadata may change between boots, so the cached values are not
+        # persisted.
+        state = self.__dict__.copy()
+        state["cache"] = {}
+        return state
 
     def _checksum(self, body):
         return "{0:08x}".format(
@@ -465,8 +492,7 @@ class JoyentMetadataClient:
             )
         LOG.debug("Negotiation complete")
 
-    def request(self, rtype, param=None):
-        request_id = "{0:08x}".format(random.randint(0, 0xFFFFFFFF))
+    def _frame(self, request_id, rtype, param=None):
         message_body = " ".join(
             (
                 request_id,
@@ -475,31 +501,86 @@ class JoyentMetadataClient:
         )
         if param:
             message_body += " " + base64.b64encode(param.encode()).decode()
-        msg = "V2 {0} {1} {2}\n".format(
+        return "V2 {0} {1} {2}\n".format(
             len(message_body), self._checksum(message_body), message_body
         )
-        LOG.debug('Writing "%s" to metadata transport.', msg)
+
+    def _read_response(self, outstanding):
+        """Read a response to one of the outstanding request ids.
+
+        Return the request id it answers and its value.
+        """
+        response = self._readline()
+        LOG.debug('Read "%s" from metadata transport.', response)
+        match = self.line_regex.match(response)
+        if not match:
+            # Responses arrive in the order requests were sent, so one
+            # without a request id, such as FAILURE, answers the oldest.
+            return outstanding[0], None
+        request_id = match.group("request_id")
+        if request_id not in outstanding:
+            raise JoyentMetadataFetchException(
+                "Request ID mismatch (expected: {0}; got {1}).".format(
+                    ", ".join(outstanding), request_id
+                )
+            )
+        if match.group("status") != "SUCCESS":
+            return request_id, None
+        return request_id, self._get_value_from_frame(request_id, response)
+
+    def request_many(self, requests):
+        """Send requests without waiting for each response in turn.
+
+        Up to pipeline_depth requests are written before a response is
+        read, and responses are matched to requests by request id. Return
+        the value of each (rtype, param) request, in order.
+        """
+        first_id = random.randint(0, 0xFFFFFFFF)
+        request_ids = [
+            "{0:08x}".format((first_id + index) & 0xFFFFFFFF)
+            for index in range(len(requests))
+        ]
 
         need_close = False
         if not self.fp:
             self.open_transport()
             need_close = True
 
-        self._write(msg)
-        response = self._readline()
+        values = {}
+        outstanding = []
+        for request_id, (rtype, param) in zip(request_ids, requests):
+            if len(outstanding) >= self.pipeline_depth:
+                answered, values[answered] = self._read_response(outstanding)
+                outstanding.remove(answered)
+            msg = self._frame(request_id, rtype, param)
+            LOG.debug('Writing "%s" to metadata transport.', msg)
+            self._write(msg)
+            outstanding.append(request_id)
+        while outstanding:
+            answered, values[answered] = self._read_response(outstanding)
+            outstanding.remove(answered)
+
         if need_close:
             self.close_transport()
+        return [values[request_id] for request_id in request_ids]
 
-        LOG.debug('Read "%s" from metadata transport.', response)
+    def request(self, rtype, param=None):
+        return self.request_many([(rtype, param)])[0]
 
-        if "SUCCESS" not in response:
-            return None
+    def clear_cache(self):
+        self.cache = {}
 
-        value = self._get_value_from_frame(request_id, response)
-        return value
+    def prefetch(self, keys):
+        """Fetch the values of keys in one burst for later calls to get."""
+        keys = [key for key in dict.fromkeys(keys) if key not in self.cache]
+        if keys:
+            values = self.request_many([("GET", key) for key in keys])
+            self.cache.update(zip(keys, values))
 
     def get(self, key, default=None, strip=False):
-        result = self.request(rtype="GET", param=key)
+        if key not in self.cache:
+            self.cache[key] = self.request(rtype="GET", param=key)
+        result = self.cache[key]
         if result is None:
             return default
         if result and strip:
@@ -522,6 +603,7 @@ class JoyentMetadataClient:
         param = b" ".join(
             [base64.b64encode(i.encode()) for i in (key, val)]
         ).decode()
+        self.cache.pop(key, None)
         return self.request(rtype="PUT", param=param)
 
     def close_transport(self):
@@ -690,6 +772,12 @@ class JoyentMetadataLegacySerialClient(JoyentMetadataSerialClient):
 
             self.base64_keys = b64_keys
 
+    def prefetch(self, keys):
+        # Also fetch the keys which decide whether values are base64
+        super(JoyentMetadataLegacySerialClient, self).prefetch(
+            list(keys) + ["base64_all", "base64_keys"]
+        )
+
     def _get(self, key, default=None, strip=False):
         return super(JoyentMetadataLegacySerialClient, self).get(
             key, default=default, strip=strip
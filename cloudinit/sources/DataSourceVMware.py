@@ -27,7 +27,8 @@ import os
 import socket
 import sys
 import time
-from typing import Dict, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
 
 from cloudinit import atomic_helper, dmi, net, netinfo, sources, util
 from cloudinit.event import EventScope, EventType, userdata_to_events
@@ -180,6 +181,10 @@ class DataSourceVMware(sources.DataSource):
         self.rpctool = None
         self.rpctool_fn = None
 
+        # The guestinfo values read or written during the current boot stage,
+        # keyed by guestinfo key.
+        self.guestinfo_cache: Dict[str, Optional[str]] = {}
+
         # A list includes all possible data transports, each tuple represents
         # one data transport type. This datasource will try to get data from
         # each of transports follows the tuples order in this list.
@@ -198,6 +203,8 @@ class DataSourceVMware(sources.DataSource):
         for attr in ("rpctool", "rpctool_fn"):
             if not hasattr(self, attr):
                 setattr(self, attr, None)
+        if not hasattr(self, "guestinfo_cache"):
+            self.guestinfo_cache = {}
         if not hasattr(self, "cfg"):
             setattr(self, "cfg", {})
         if not hasattr(self, "possible_data_access_method_list"):
@@ -223,6 +230,13 @@ class DataSourceVMware(sources.DataSource):
                 DEFAULT_NETWORK_DRIVERS
             )
 
+    def __getstate__(self):
+        # Guestinfo may change between boots, so the cached values are not
+        # persisted.
+        state = super().__getstate__()
+        state["guestinfo_cache"] = {}
+        return state
+
     def __str__(self):
         root = sources.DataSource.__str__(self)
         return "%s [seed=%s]" % (root, self.data_access_method)
@@ -299,7 +313,9 @@ class DataSourceVMware(sources.DataSource):
 
         # Reflect any possible local IPv4 or IPv6 addresses in the guest
         # info.
-        advertise_local_ip_addrs(host_info, self.rpctool, self.rpctool_fn)
+        advertise_local_ip_addrs(
+            host_info, self.rpctool, self.rpctool_fn, self.guestinfo_cache
+        )
 
         # Ensure the metadata gets updated with information about the
         # host, including the network interfaces, default IP addresses,
@@ -383,6 +399,7 @@ class DataSourceVMware(sources.DataSource):
             enabled_events,
             self.rpctool,
             self.rpctool_fn,
+            self.guestinfo_cache,
         )
 
     def init_extra_hotplug_udev_rules(self):
@@ -447,7 +464,10 @@ class DataSourceVMware(sources.DataSource):
 
         if self.data_access_method == DATA_ACCESS_METHOD_GUESTINFO:
             guestinfo_redact_keys(
-                keys_to_redact, self.rpctool, self.rpctool_fn
+                keys_to_redact,
+                self.rpctool,
+                self.rpctool_fn,
+                self.guestinfo_cache,
             )
 
     def get_envvar_data_fn(self):
@@ -491,12 +511,14 @@ class DataSourceVMware(sources.DataSource):
             return (None, None, None)
 
         def query_guestinfo(rpctool, rpctool_fn):
-            md, ud, vd = None, None, None
             LOG.info("query guestinfo with %s", rpctool)
-            md = guestinfo("metadata", rpctool, rpctool_fn)
-            ud = guestinfo("userdata", rpctool, rpctool_fn)
-            vd = guestinfo("vendordata", rpctool, rpctool_fn)
-            return md, ud, vd
+            data = guestinfo_keys(
+                ("metadata", "userdata", "vendordata"),
+                rpctool,
+                rpctool_fn,
+                self.guestinfo_cache,
+            )
+            return data["metadata"], data["userdata"], data["vendordata"]
 
         try:
             # The first attempt to query guestinfo could occur via either
@@ -646,7 +668,7 @@ def get_none_if_empty_val(val):
     return val
 
 
-def advertise_local_ip_addrs(host_info, rpctool, rpctool_fn):
+def advertise_local_ip_addrs(host_info, rpctool, rpctool_fn, cache=None):
     """
     advertise_local_ip_addrs gets the local IP address information from
     the provided host_info map and sets the addresses in the guestinfo
@@ -657,19 +679,23 @@ def advertise_local_ip_addrs(host_info, rpctool, rpctool_fn):
 
     # Reflect any possible local IPv4 or IPv6 addresses in the guest
     # info.
-    local_ipv4 = host_info.get(LOCAL_IPV4)
-    if local_ipv4:
-        guestinfo_set_value(LOCAL_IPV4, local_ipv4, rpctool, rpctool_fn)
-        LOG.info("advertised local ipv4 address %s in guestinfo", local_ipv4)
-
-    local_ipv6 = host_info.get(LOCAL_IPV6)
-    if local_ipv6:
-        guestinfo_set_value(LOCAL_IPV6, local_ipv6, rpctool, rpctool_fn)
-        LOG.info("advertised local ipv6 address %s in guestinfo", local_ipv6)
+    addrs = {
+        key: host_info[key]
+        for key in (LOCAL_IPV4, LOCAL_IPV6)
+        if host_info.get(key)
+    }
+    results = guestinfo_set_values(addrs, rpctool, rpctool_fn, cache)
+    for key, addr in addrs.items():
+        if results[key]:
+            LOG.info("advertised %s address %s in guestinfo", key, addr)
 
 
 def advertise_update_events(
-    supported_update_events, enabled_update_events, rpctool, rpctool_fn
+    supported_update_events,
+    enabled_update_events,
+    rpctool,
+    rpctool_fn,
+    cache=None,
 ):
     """
     advertise_update_events publishes the types of supported and
@@ -703,26 +729,21 @@ def advertise_update_events(
         return ",".join(event_scopes_and_types_list)
 
     supported_events_string = get_events_string(supported_update_events)
+    enabled_events_string = get_events_string(enabled_update_events)
+    events = {}
     if supported_events_string:
-        guestinfo_set_value(
-            SUPPORTED_UPDATE_EVENTS_GUEST_INFO_KEY,
-            supported_events_string,
-            rpctool,
-            rpctool_fn,
+        events[SUPPORTED_UPDATE_EVENTS_GUEST_INFO_KEY] = (
+            supported_events_string
         )
+    if enabled_events_string:
+        events[ENABLED_UPDATE_EVENTS_GUEST_INFO_KEY] = enabled_events_string
+    guestinfo_set_values(events, rpctool, rpctool_fn, cache)
+    if supported_events_string:
         LOG.info(
             "advertised supported update events in guestinfo: %s",
             supported_events_string,
         )
-
-    enabled_events_string = get_events_string(enabled_update_events)
     if enabled_events_string:
-        guestinfo_set_value(
-            ENABLED_UPDATE_EVENTS_GUEST_INFO_KEY,
-            enabled_events_string,
-            rpctool,
-            rpctool_fn,
-        )
         LOG.info(
             "advertised enabled update events in guestinfo: %s",
             enabled_events_string,
@@ -791,6 +812,61 @@ def guestinfo(key, rpctool, rpctool_fn):
     return decode(get_guestinfo_key_name(key), enc_type, val)
 
 
+def guestinfo_keys(keys, rpctool, rpctool_fn, cache=None):
+    """
+    guestinfo_keys returns a dict of the decoded guestinfo values for the
+    provided keys. The values are queried together, followed by the
+    encodings of any values which were found.
+    """
+    values = guestinfo_get_values(keys, rpctool, rpctool_fn, cache)
+    encodings = guestinfo_get_values(
+        [key + ".encoding" for key in keys if values[key]],
+        rpctool,
+        rpctool_fn,
+        cache,
+    )
+    return {
+        key: (
+            decode(
+                get_guestinfo_key_name(key),
+                encodings[key + ".encoding"],
+                values[key],
+            )
+            if values[key]
+            else None
+        )
+        for key in keys
+    }
+
+
+def guestinfo_get_values(keys, rpctool, rpctool_fn, cache=None):
+    """
+    Returns a dict of the guestinfo values for the specified keys.
+
+    Each rpctool invocation queries a single key, so the keys are queried
+    concurrently. Keys already present in the cache are not queried again,
+    and the cache is updated with the values of those that are.
+    """
+    if cache is None:
+        cache = {}
+    pending = [key for key in keys if key not in cache]
+    if len(pending) == 1:
+        cache[pending[0]] = guestinfo_get_value(
+            pending[0], rpctool, rpctool_fn
+        )
+    elif pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {
+                key: executor.submit(
+                    guestinfo_get_value, key, rpctool, rpctool_fn
+                )
+                for key in pending
+            }
+        for key, future in futures.items():
+            cache[key] = future.result()
+    return {key: cache[key] for key in keys}
+
+
 def guestinfo_get_value(key, rpctool, rpctool_fn):
     """
     Returns a guestinfo value for the specified key.
@@ -878,7 +954,49 @@ def guestinfo_set_value(key, value, rpctool, rpctool_fn):
     return None
 
 
-def guestinfo_redact_keys(keys, rpctool, rpctool_fn):
+def guestinfo_set_values(values, rpctool, rpctool_fn, cache=None):
+    """
+    Sets the guestinfo value of each key in the values dict, returning a
+    dict of whether setting each key succeeded.
+
+    The keys are set concurrently. Keys which the cache shows already read
+    back as the new value are not set again, and the cache is updated with
+    the values of those that are.
+    """
+    if cache is None:
+        cache = {}
+    results = {}
+    pending = {}
+    for key, value in values.items():
+        if key in cache and cache[key] == get_none_if_empty_val(value):
+            LOG.debug("Skipping unchanged guestinfo key=%s", key)
+            results[key] = True
+        else:
+            pending[key] = value
+    if len(pending) == 1:
+        ((key, value),) = pending.items()
+        results[key] = bool(
+            guestinfo_set_value(key, value, rpctool, rpctool_fn)
+        )
+    elif pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {
+                key: executor.submit(
+                    guestinfo_set_value, key, value, rpctool, rpctool_fn
+                )
+                for key, value in pending.items()
+            }
+        for key, future in futures.items():
+            results[key] = bool(future.result())
+    for key, value in pending.items():
+        if results[key]:
+            cache[key] = get_none_if_empty_val(value)
+        else:
+            cache.pop(key, None)
+    return results
+
+
+def guestinfo_redact_keys(keys, rpctool, rpctool_fn, cache=None):
     """
     guestinfo_redact_keys redacts guestinfo of all of the keys in the given
     list. each key will have its value set to "---". Since the value is valid
@@ -888,16 +1006,15 @@ def guestinfo_redact_keys(keys, rpctool, rpctool_fn):
         return
     if type(keys) not in (list, tuple):
         keys = [keys]
+    values = {}
     for key in keys:
-        key_name = get_guestinfo_key_name(key)
-        LOG.info("clearing %s", key_name)
-        if not guestinfo_set_value(
-            key, GUESTINFO_EMPTY_YAML_VAL, rpctool, rpctool_fn
-        ):
-            LOG.error("failed to clear %s", key_name)
-        LOG.info("clearing %s.encoding", key_name)
-        if not guestinfo_set_value(key + ".encoding", "", rpctool, rpctool_fn):
-            LOG.error("failed to clear %s.encoding", key_name)
+        LOG.info("clearing %s", get_guestinfo_key_name(key))
+        values[key] = GUESTINFO_EMPTY_YAML_VAL
+        values[key + ".encoding"] = ""
+    results = guestinfo_set_values(values, rpctool, rpctool_fn, cache)
+    for key, cleared in results.items():
+        if not cleared:
+            LOG.error("failed to clear %s", get_guestinfo_key_name(key))
 
 
 def load_json_or_yaml(data):
@@ -15,6 +15,7 @@ import logging
 import os
 import pickle
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum, unique
 from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
@@ -26,6 +27,7 @@ from cloudinit import (
     net,
     performance,
     type_utils,
+    url_helper,
     user_data,
     util,
 )
@@ -298,6 +300,11 @@ class DataSource(CloudInitPickleMixin, metaclass=abc.ABCMeta):
 
     _dirty_cache = False
 
+    # Set True by find_source while probing concurrently so that candidates
+    # which are not selected never write instance-data.json or obj.pkl.
+    # The selected datasource persists its data once chosen.
+    _defer_persist_instance_data = False
+
     # N-tuple of keypaths or keynames redact from instance-data.json for
     # non-root users
     sensitive_metadata_keys: Tuple[str, ...] = (
@@ -511,7 +518,8 @@ class DataSource(CloudInitPickleMixin, metaclass=abc.ABCMeta):
         # exceptions later if/when they get used incorrectly.
         if not return_value:
             return return_value
-        self.persist_instance_data()
+        if not self._defer_persist_instance_data:
+            self.persist_instance_data()
         return return_value
 
     def persist_instance_data(self, write_cache=True):
@@ -1069,6 +1077,114 @@ def normalize_pubkey_data(pubkey_data):
     return []
 
 
+def _probe_source(
+    name, cls, mode, sys_cfg, distro, paths, reporter, defer_persist=False
+) -> Optional[DataSource]:
+    """Instantiate datasource cls and attempt to crawl its metadata.
+
+    @return: The datasource instance on success, None otherwise.
+    """
+    myrep = events.ReportEventStack(
+        name="search-%s" % name.replace("DataSource", ""),
+        description="searching for %s data from %s" % (mode, name),
+        message="no %s data found from %s" % (mode, name),
+        parent=reporter,
+    )
+    try:
+        with myrep:
+            LOG.debug("Seeing if we can get any data from %s", cls)
+            s = cls(sys_cfg, distro, paths)
+            s._defer_persist_instance_data = defer_persist
+            if s.update_metadata_if_supported([EventType.BOOT_NEW_INSTANCE]):
+                myrep.message = "found %s data from %s" % (mode, name)
+                return s
+    except Exception:
+        util.logexc(LOG, "Getting data from %s failed", cls)
+    return None
+
+
+def _probe_source_cancellable(
+    cancellation: url_helper.RequestCancellation, name, *args, **kwargs
+) -> Optional[DataSource]:
+    """Run _probe_source, aborting its url requests once cancelled."""
+    if cancellation.cancelled:
+        LOG.debug("Skipping %s: a data source was already found", name)
+        return None
+    with url_helper.cancellable_requests(cancellation):
+        return _probe_source(name, *args, **kwargs)
+
+
+def get_probe_workers(sys_cfg) -> int:
+    """Return the number of datasources which may be probed concurrently.
+
+    Configured by the datasource_probe_workers system config key. Values
+    less than 2 (the default) retain serial datasource discovery.
+    """
+    workers = sys_cfg.get("datasource_probe_workers", 1)
+    try:
+        return max(1, int(workers))
+    except (TypeError, ValueError):
+        LOG.warning(
+            "Ignoring invalid datasource_probe_workers value: %s", workers
+        )
+        return 1
+
+
+def _find_source_parallel(
+    ds_names, ds_list, mode, sys_cfg, distro, paths, reporter, workers
+) -> Optional[Tuple[DataSource, str]]:
+    """Probe datasources concurrently, honoring datasource_list priority.
+
+    Every candidate runs ds_detect and _get_data in a bounded thread pool,
+    but results are consumed in list order: a lower priority datasource is
+    only selected once all higher priority candidates have failed. Once a
+    winner is selected, probes of lower priority candidates which have not
+    yet started are cancelled, and the url requests of those still running
+    are aborted so that they do not keep querying metadata services or
+    delay exit until their own timeouts expire.
+    """
+    LOG.debug(
+        "Probing up to %d data sources concurrently: %s", workers, ds_names
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="ds-probe"
+    )
+    futures: List[Future] = []
+    cancellations = [url_helper.RequestCancellation() for _ in ds_list]
+    try:
+        for name, cls, cancellation in zip(ds_names, ds_list, cancellations):
+            futures.append(
+                executor.submit(
+                    _probe_source_cancellable,
+                    cancellation,
+                    name,
+                    cls,
+                    mode,
+                    sys_cfg,
+                    distro,
+                    paths,
+                    reporter,
+                    defer_persist=True,
+                )
+            )
+        for name, future in zip(ds_names, futures):
+            s = future.result()
+            if s:
+                for pending, cancellation in zip(futures, cancellations):
+                    pending.cancel()
+                    cancellation.cancel()
+                s._defer_persist_instance_data = False
+                s.persist_instance_data()
+                return (s, name)
+    finally:
+        # Do not block on lower priority probes which are still running,
+        # their url requests fail once cancelled
+        for cancellation in cancellations:
+            cancellation.cancel()
+        executor.shutdown(wait=False)
+    return None
+
+
 def find_source(
     sys_cfg, distro, paths, ds_deps, cfg_list, pkg_list, reporter
 ) -> Tuple[DataSource, str]:
@@ -1077,24 +1193,23 @@ def find_source(
     mode = "network" if DEP_NETWORK in ds_deps else "local"
     LOG.debug("Searching for %s data source in: %s", mode, ds_names)
 
-    for name, cls in zip(ds_names, ds_list):
-        myrep = events.ReportEventStack(
-            name="search-%s" % name.replace("DataSource", ""),
-            description="searching for %s data from %s" % (mode, name),
-            message="no %s data found from %s" % (mode, name),
-            parent=reporter,
+    workers = min(get_probe_workers(sys_cfg), len(ds_list))
+    # Local datasources may bring up ephemeral networking or mount devices,
+    # which is not safe to do concurrently, so only network mode probes
+    # run in parallel.
+    if workers > 1 and mode == "network":
+        found = _find_source_parallel(
+            ds_names, ds_list, mode, sys_cfg, distro, paths, reporter, workers
         )
-        try:
-            with myrep:
-                LOG.debug("Seeing if we can get any data from %s", cls)
-                s = cls(sys_cfg, distro, paths)
-                if s.update_metadata_if_supported(
-                    [EventType.BOOT_NEW_INSTANCE]
-                ):
-                    myrep.message = "found %s data from %s" % (mode, name)
-                    return (s, type_utils.obj_name(cls))
-        except Exception:
-            util.logexc(LOG, "Getting data from %s failed", cls)
+        if found:
+            return found
+    else:
+        for name, cls in zip(ds_names, ds_list):
+            s = _probe_source(
+                name, cls, mode, sys_cfg, distro, paths, reporter
+            )
+            if s:
+                return (s, type_utils.obj_name(cls))
 
     msg = "Did not find any data source, searched classes: (%s)" % ", ".join(
         ds_names
@@ -2,19 +2,186 @@
 #
 # This file is part of cloud-init. See LICENSE file for license information.
 
+import base64
+import binascii
+import hashlib
 import logging
 import re
-from typing import List, Optional
+import struct
+from typing import List, Optional, Tuple
 
 from cloudinit import ssh_util, subp
 
 LOG = logging.getLogger(__name__)
 
 _CERTIFICATE_BLOCK_RE = re.compile(
-    r"-----BEGIN CERTIFICATE-----.*?-----END CERTIFICATE-----",
+    r"-----BEGIN CERTIFICATE-----(.*?)-----END CERTIFICATE-----",
     re.DOTALL,
 )
 
+# DER tags of the ASN.1 types walked to reach SubjectPublicKeyInfo
+_DER_BIT_STRING = 0x03
+_DER_OID = 0x06
+_DER_SEQUENCE = 0x30
+_DER_EXPLICIT_VERSION = 0xA0
+
+_RSA_ENCRYPTION_OID = "1.2.840.113549.1.1.1"
+_EC_PUBLIC_KEY_OID = "1.2.840.10045.2.1"
+_ED25519_OID = "1.3.101.112"
+_EC_CURVE_NAMES = {
+    "1.2.840.10045.3.1.7": "nistp256",
+    "1.3.132.0.34": "nistp384",
+    "1.3.132.0.35": "nistp521",
+}
+
+
+def _read_der(
+    data: bytes, offset: int, expected_tag: Optional[int] = None
+) -> Tuple[int, bytes, int]:
+    """Read the DER element at offset.
+
+    :return: Tuple of tag, value and the offset following the element.
+    :raises ValueError: if the element is truncated, malformed or does
+        not have the expected tag.
+    """
+    if offset + 2 > len(data):
+        raise ValueError("Truncated DER element")
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        num_octets = length & 0x7F
+        if not 0 < num_octets <= 4 or offset + num_octets > len(data):
+            raise ValueError("Invalid DER length")
+        length = int.from_bytes(data[offset : offset + num_octets], "big")
+        offset += num_octets
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Truncated DER element")
+    if expected_tag is not None and tag != expected_tag:
+        raise ValueError(
+            "Expected DER tag 0x%02x but found 0x%02x" % (expected_tag, tag)
+        )
+    return tag, data[offset:end], end
+
+
+def _read_der_sequence(value: bytes) -> List[Tuple[int, bytes]]:
+    """Return the (tag, value) of each element in a DER SEQUENCE value."""
+    elements = []
+    offset = 0
+    while offset < len(value):
+        tag, element, offset = _read_der(value, offset)
+        elements.append((tag, element))
+    return elements
+
+
+def _decode_oid(value: bytes) -> str:
+    """Return the dotted representation of a DER OBJECT IDENTIFIER."""
+    if not value or value[-1] & 0x80:
+        raise ValueError("Invalid DER object identifier")
+    subidentifiers = []
+    subidentifier = 0
+    for octet in value:
+        subidentifier = (subidentifier << 7) | (octet & 0x7F)
+        if not octet & 0x80:
+            subidentifiers.append(subidentifier)
+            subidentifier = 0
+    first = min(subidentifiers[0] // 40, 2)
+    arcs = [first, subidentifiers[0] - 40 * first] + subidentifiers[1:]
+    return ".".join(str(arc) for arc in arcs)
+
+
+def _pem_to_der(certificate: str) -> bytes:
+    """Return the DER encoding of the first PEM certificate block.
+
+    :raises ValueError: if there is no certificate block or it is not
+        valid base64.
+    """
+    match = _CERTIFICATE_BLOCK_RE.search(certificate)
+    if not match:
+        raise ValueError("No PEM certificate block found")
+    try:
+        return base64.b64decode("".join(match.group(1).split()), validate=True)
+    except binascii.Error as e:
+        raise ValueError("Invalid PEM certificate encoding: %s" % e) from e
+
+
+def _read_subject_public_key_info(
+    der: bytes,
+) -> Tuple[str, Optional[bytes], bytes]:
+    """Walk an X.509 certificate to its SubjectPublicKeyInfo.
+
+    :return: Tuple of the key algorithm OID, the encoded named curve OID
+        (if any) and the subject public key.
+    :raises ValueError: if der is not a well-formed X.509 certificate.
+    """
+    _, certificate, end = _read_der(der, 0, _DER_SEQUENCE)
+    if end != len(der):
+        raise ValueError("Unexpected data after certificate")
+    fields = _read_der_sequence(certificate)
+    if len(fields) != 3 or fields[0][0] != _DER_SEQUENCE:
+        raise ValueError("Invalid certificate structure")
+    tbs_fields = _read_der_sequence(fields[0][1])
+    if tbs_fields and tbs_fields[0][0] == _DER_EXPLICIT_VERSION:
+        tbs_fields = tbs_fields[1:]
+    # serialNumber, signature, issuer, validity, subject precede the key
+    if len(tbs_fields) < 6 or tbs_fields[5][0] != _DER_SEQUENCE:
+        raise ValueError("Invalid TBSCertificate structure")
+    spki = _read_der_sequence(tbs_fields[5][1])
+    if (
+        len(spki) != 2
+        or spki[0][0] != _DER_SEQUENCE
+        or spki[1][0] != _DER_BIT_STRING
+    ):
+        raise ValueError("Invalid SubjectPublicKeyInfo structure")
+    algorithm = _read_der_sequence(spki[0][1])
+    if not algorithm or algorithm[0][0] != _DER_OID:
+        raise ValueError("Invalid public key algorithm")
+    parameters = None
+    if len(algorithm) > 1 and algorithm[1][0] == _DER_OID:
+        parameters = algorithm[1][1]
+    bit_string = spki[1][1]
+    if not bit_string or bit_string[0] != 0:
+        raise ValueError("Invalid subject public key")
+    return _decode_oid(algorithm[0][1]), parameters, bit_string[1:]
+
+
+def _ssh_string(value: bytes) -> bytes:
+    return struct.pack(">I", len(value)) + value
+
+
+def _openssh_key_from_certificate(certificate: str) -> str:
+    """Encode the public key of a PEM certificate in OpenSSH format.
+
+    :raises ValueError: if the certificate cannot be parsed or its key
+        algorithm is not supported.
+    """
+    oid, parameters, public_key = _read_subject_public_key_info(
+        _pem_to_der(certificate)
+    )
+    if oid == _RSA_ENCRYPTION_OID:
+        _, rsa_key, _ = _read_der(public_key, 0, _DER_SEQUENCE)
+        integers = _read_der_sequence(rsa_key)
+        if len(integers) != 2:
+            raise ValueError("Invalid RSA public key")
+        # DER INTEGER contents are already in SSH mpint form.
+        modulus, exponent = (value for _, value in integers)
+        key_type = "ssh-rsa"
+        blob = _ssh_string(exponent) + _ssh_string(modulus)
+    elif oid == _EC_PUBLIC_KEY_OID and parameters is not None:
+        curve = _EC_CURVE_NAMES.get(_decode_oid(parameters))
+        if curve is None:
+            raise ValueError("Unsupported elliptic curve")
+        key_type = "ecdsa-sha2-" + curve
+        blob = _ssh_string(curve.encode()) + _ssh_string(public_key)
+    elif oid == _ED25519_OID:
+        key_type = "ssh-ed25519"
+        blob = _ssh_string(public_key)
+    else:
+        raise ValueError("Unsupported public key algorithm %s" % oid)
+    encoded = base64.b64encode(_ssh_string(key_type.encode()) + blob)
+    return "%s %s\n" % (key_type, encoded.decode())
+
 
 def sanitize_openssh_key(key: str) -> str:
     r"""Sanitize an OpenSSH key by removing embedded CRLF sequences.
@@ -64,7 +231,7 @@ def is_x509_certificate(cert: str) -> bool:
     """Check if the input string is an x509 certificate in PEM format.
 
     This validates that the certificate is a valid x509 certificate by
-    attempting to parse it with openssl.
+    parsing its DER structure up to the subject public key.
     """
     if not cert:
         LOG.debug("Empty certificate provided.")
@@ -80,12 +247,10 @@ def is_x509_certificate(cert: str) -> bool:
         LOG.debug("No END CERTIFICATE marker.")
         return False
 
-    # Attempt to parse the certificate with openssl to validate it.
     try:
-        cmd = ["openssl", "x509", "-noout", "-text"]
-        subp.subp(cmd, data=cert)
+        _read_subject_public_key_info(_pem_to_der(cert))
         return True
-    except subp.ProcessExecutionError as e:
+    except ValueError as e:
         LOG.debug("Certificate could not be parsed: %s", e)
         return False
 
@@ -124,9 +289,37 @@ def extract_x509_certificates(data: Optional[str]) -> List[str]:
     return certificates
 
 
+def get_x509_fingerprint(certificate: str) -> str:
+    """Return the SHA1 fingerprint of an x509 certificate in PEM format.
+
+    The fingerprint is formatted as the Azure control plane passes it:
+    upper case hex digits without separators, e.g.
+    '073E19D14D1C799224C6A0FD8DDAB6A8BF27D473'.
+
+    :raises ValueError: if the certificate cannot be decoded.
+    """
+    return (
+        hashlib.sha1(_pem_to_der(certificate))  # nosec B324
+        .hexdigest()
+        .upper()
+    )
+
+
 def convert_x509_to_openssh(certificate: str) -> str:
-    """Convert an x509 certificate to OpenSSH public key format."""
+    """Convert an x509 certificate to OpenSSH public key format.
+
+    RSA, ECDSA and Ed25519 keys are converted in-process. Any other key
+    is converted with openssl and ssh-keygen.
+    """
     LOG.debug("Converting x509 certificate to OpenSSH public key format.")
+    try:
+        ssh_key = _openssh_key_from_certificate(certificate)
+    except ValueError as e:
+        LOG.debug("Converting with openssl and ssh-keygen: %s", e)
+    else:
+        LOG.debug("Successfully converted x509 certificate to OpenSSH format.")
+        return ssh_key
+
     openssl_cmd = ["openssl", "x509", "-noout", "-pubkey"]
     try:
         pub_key, _ = subp.subp(openssl_cmd, data=certificate)
@@ -8,6 +8,7 @@ import logging
 import os
 import textwrap
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from time import sleep, time
@@ -340,6 +341,12 @@ class AzureEndpointHttpClient:
             "x-ms-guest-agent-public-x509-cert": certificate,
         }
 
+    def set_certificate(self, certificate) -> None:
+        """Use certificate for subsequent secure requests."""
+        self.extra_secure_headers["x-ms-guest-agent-public-x509-cert"] = (
+            certificate
+        )
+
     def get(self, url, secure=False) -> url_helper.UrlResponse:
         headers = self.headers
         if secure:
@@ -398,24 +405,34 @@ class GoalState:
                 report_diagnostic_event(msg, logger_func=LOG.warning)
                 raise InvalidGoalStateXMLException(msg)
 
-        self.certificates_xml = None
-        url = self._text_from_xpath(
+        self.certificates_xml: Optional[bytes] = None
+        self.certificates_url = self._text_from_xpath(
             "./Container/RoleInstanceList/RoleInstance"
             "/Configuration/Certificates"
         )
-        if url is not None and need_certificate:
-            with events.ReportEventStack(
-                name="get-certificates-xml",
-                description="get certificates xml",
-                parent=azure_ds_reporter,
-            ):
-                self.certificates_xml = self.azure_endpoint_client.get(
-                    url, secure=True
-                ).contents
-                if self.certificates_xml is None:
-                    raise InvalidGoalStateXMLException(
-                        "Azure endpoint returned empty certificates xml."
-                    )
+        if need_certificate:
+            self.fetch_certificates_xml()
+
+    def fetch_certificates_xml(self) -> None:
+        """Fetch the certificates XML referenced by the GoalState, if any.
+
+        The endpoint client must be configured with the transport
+        certificate used to encrypt the certificates XML.
+        """
+        if self.certificates_url is None:
+            return
+        with events.ReportEventStack(
+            name="get-certificates-xml",
+            description="get certificates xml",
+            parent=azure_ds_reporter,
+        ):
+            self.certificates_xml = self.azure_endpoint_client.get(
+                self.certificates_url, secure=True
+            ).contents
+            if self.certificates_xml is None:
+                raise InvalidGoalStateXMLException(
+                    "Azure endpoint returned empty certificates xml."
+                )
 
     def _text_from_xpath(self, xpath):
         element = self.root.find(xpath)
@@ -480,30 +497,16 @@ class OpenSSLManager:
             self.certificate = certificate
         LOG.debug("New certificate generated.")
 
-    @staticmethod
-    @azure_ds_telemetry_reporter
-    def _run_x509_action(action, cert):
-        cmd = ["openssl", "x509", "-noout", action]
-        result, _ = subp.subp(cmd, data=cert)
-        return result
-
     @azure_ds_telemetry_reporter
     def _get_ssh_key_from_cert(self, certificate):
         return certs.convert_x509_to_openssh(certificate)
 
     @azure_ds_telemetry_reporter
     def _get_fingerprint_from_cert(self, certificate):
-        r"""openssl x509 formats fingerprints as so:
-        'SHA1 Fingerprint=07:3E:19:D1:4D:1C:79:92:24:C6:A0:FD:8D:DA:\
-        B6:A8:BF:27:D4:73\n'
-
-        Azure control plane passes that fingerprint as so:
-        '073E19D14D1C799224C6A0FD8DDAB6A8BF27D473'
+        """Return the SHA1 fingerprint of certificate as Azure control plane
+        passes it: '073E19D14D1C799224C6A0FD8DDAB6A8BF27D473'
         """
-        raw_fp = self._run_x509_action("-fingerprint", certificate)
-        eq = raw_fp.find("=")
-        octets = raw_fp[eq + 1 : -1].split(":")
-        return "".join(octets)
+        return certs.get_x509_fingerprint(certificate)
 
     @azure_ds_telemetry_reporter
     def _decrypt_certs_from_xml(self, certificates_xml):
@@ -733,32 +736,51 @@ class WALinuxAgentShim:
         Azure, and then uses pubkey_info to filter and obtain the user's
         pubkeys from the GoalState.
 
+        The transport certificate is generated while the GoalState is
+        fetched. The provisioning iso is only ejected once the user's pubkeys
+        have been obtained, so it is kept if they could not be.
+
         @param pubkey_info: List of pubkey values and fingerprints which are
             used to filter and obtain the user's pubkey values from the
             GoalState.
         @return: The list of user's authorized pubkey values.
         """
-        http_client_certificate = None
-        if self.openssl_manager is None and pubkey_info is not None:
-            self.openssl_manager = OpenSSLManager()
-            http_client_certificate = self.openssl_manager.certificate
         if self.azure_endpoint_client is None:
-            self.azure_endpoint_client = AzureEndpointHttpClient(
-                http_client_certificate
-            )
-        goal_state = self._fetch_goal_state_from_azure(
-            need_certificate=http_client_certificate is not None
-        )
+            self.azure_endpoint_client = AzureEndpointHttpClient(None)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            openssl_future = None
+            if self.openssl_manager is None and pubkey_info is not None:
+                openssl_future = executor.submit(OpenSSLManager)
+            try:
+                goal_state = self._fetch_goal_state_from_azure(
+                    need_certificate=False
+                )
+            finally:
+                # Keep a generated certificate for clean_up even when the
+                # GoalState could not be fetched.
+                if (
+                    openssl_future is not None
+                    and openssl_future.exception() is None
+                ):
+                    self.openssl_manager = openssl_future.result()
+            if openssl_future is not None:
+                self.azure_endpoint_client.set_certificate(
+                    openssl_future.result().certificate
+                )
+
         ssh_keys = None
         if pubkey_info is not None:
-            ssh_keys = self._get_user_pubkeys(goal_state, pubkey_info)
-        health_reporter = GoalStateHealthReporter(
-            goal_state, self.azure_endpoint_client, self.endpoint
-        )
-
+            ssh_keys = self._fetch_user_pubkeys(
+                goal_state,
+                pubkey_info,
+                need_certificate=openssl_future is not None,
+            )
         if iso_dev is not None:
             self.eject_iso(iso_dev, distro=distro)
 
+        health_reporter = GoalStateHealthReporter(
+            goal_state, self.azure_endpoint_client, self.endpoint
+        )
         health_reporter.send_ready_signal()
         return ssh_keys
 
@@ -853,6 +875,19 @@ class WALinuxAgentShim:
         report_diagnostic_event(msg, logger_func=LOG.debug)
         return goal_state
 
+    @azure_ds_telemetry_reporter
+    def _fetch_user_pubkeys(
+        self, goal_state: GoalState, pubkey_info: list, need_certificate: bool
+    ) -> list:
+        """Fetch the GoalState certificates XML, if needed, and return the
+        VM admin user's authorized pubkeys.
+
+        @param need_certificate: switch to know if certificates is needed.
+        """
+        if need_certificate:
+            goal_state.fetch_certificates_xml()
+        return self._get_user_pubkeys(goal_state, pubkey_info)
+
     @azure_ds_telemetry_reporter
     def _get_user_pubkeys(
         self, goal_state: GoalState, pubkey_info: list
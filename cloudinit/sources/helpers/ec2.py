@@ -9,6 +9,7 @@
 import functools
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from cloudinit import url_helper, util
 
@@ -52,11 +53,22 @@ class MetadataLeafDecoder:
 # See: http://docs.aws.amazon.com/AWSEC2/latest/UserGuide/
 #         ec2-instance-metadata.html
 class MetadataMaterializer:
-    def __init__(self, blob, base_url, caller, leaf_decoder=None):
+    """Crawl a metadata tree into a nested dict.
+
+    With max_workers greater than 1, the tree is crawled breadth first and
+    all directory listings and leaves at each depth are fetched
+    concurrently through caller. The materialized result is identical to
+    the serial depth-first crawl.
+    """
+
+    def __init__(
+        self, blob, base_url, caller, leaf_decoder=None, max_workers=1
+    ):
         self._blob = blob
         self._md = None
         self._base_url = base_url
         self._caller = caller
+        self._max_workers = max_workers
         if leaf_decoder is None:
             self._leaf_decoder = MetadataLeafDecoder()
         else:
@@ -108,9 +120,71 @@ class MetadataMaterializer:
     def materialize(self):
         if self._md is not None:
             return self._md
-        self._md = self._materialize(self._blob, self._base_url)
+        if self._max_workers > 1:
+            self._md = self._materialize_concurrently(
+                self._blob, self._base_url
+            )
+        else:
+            self._md = self._materialize(self._blob, self._base_url)
         return self._md
 
+    def _materialize_concurrently(self, blob, base_url):
+        root: dict = {}
+        # Directories pending a crawl at the current depth:
+        #   (listing blob, directory url, dict to populate)
+        level = [(blob, base_url, root)]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while level:
+                child_fetches = []
+                leaf_fetches = []
+                for dir_blob, dir_url, joined in level:
+                    (leaves, children) = self._parse(dir_blob)
+                    for c in children:
+                        child_url = url_helper.combine_url(dir_url, c)
+                        if not child_url.endswith("/"):
+                            child_url += "/"
+                        child_fetches.append(
+                            (
+                                joined,
+                                c,
+                                child_url,
+                                executor.submit(self._caller, child_url),
+                            )
+                        )
+                    for field, resource in leaves.items():
+                        leaf_url = url_helper.combine_url(dir_url, resource)
+                        leaf_fetches.append(
+                            (
+                                joined,
+                                dir_url,
+                                field,
+                                executor.submit(self._caller, leaf_url),
+                            )
+                        )
+                try:
+                    level = []
+                    # Populate children before leaves, as _materialize does,
+                    # so duplicate keys resolve identically.
+                    for joined, c, child_url, future in child_fetches:
+                        joined[c] = {}
+                        level.append((future.result(), child_url, joined[c]))
+                    for joined, dir_url, field, future in leaf_fetches:
+                        leaf_contents = self._leaf_decoder(
+                            field, future.result()
+                        )
+                        if field in joined:
+                            LOG.warning(
+                                "Duplicate key found in results from %s",
+                                dir_url,
+                            )
+                        else:
+                            joined[field] = leaf_contents
+                except Exception:
+                    for fetch in child_fetches + leaf_fetches:
+                        fetch[-1].cancel()
+                    raise
+        return root
+
     def _materialize(self, blob, base_url):
         (leaves, children) = self._parse(blob)
         child_contents = {}
@@ -192,6 +266,7 @@ def _get_instance_metadata(
     headers_redact=None,
     exception_cb=None,
     retrieval_exception_ignore_cb=None,
+    max_workers=1,
 ):
     md_url = url_helper.combine_url(metadata_address, api_version, tree)
     caller = functools.partial(
@@ -220,7 +295,11 @@ def _get_instance_metadata(
     try:
         response = caller(md_url)
         materializer = MetadataMaterializer(
-            response.contents, md_url, mcaller, leaf_decoder=leaf_decoder
+            response.contents,
+            md_url,
+            mcaller,
+            leaf_decoder=leaf_decoder,
+            max_workers=max_workers,
         )
         md = materializer.materialize()
         if not isinstance(md, (dict)):
@@ -242,6 +321,7 @@ def get_instance_metadata(
     headers_redact=None,
     exception_cb=None,
     retrieval_exception_ignore_cb=None,
+    max_workers=1,
 ):
     # Note, 'meta-data' explicitly has trailing /.
     # this is required for CloudStack (LP: #1356855)
@@ -257,6 +337,7 @@ def get_instance_metadata(
         headers_cb=headers_cb,
         exception_cb=exception_cb,
         retrieval_exception_ignore_cb=retrieval_exception_ignore_cb,
+        max_workers=max_workers,
     )
 
 
@@ -270,6 +351,7 @@ def get_instance_identity(
     headers_cb=None,
     headers_redact=None,
     exception_cb=None,
+    max_workers=1,
 ):
     return _get_instance_metadata(
         tree="dynamic/instance-identity",
@@ -282,4 +364,5 @@ def get_instance_identity(
         headers_redact=headers_redact,
         headers_cb=headers_cb,
         exception_cb=exception_cb,
+        max_workers=max_workers,
     )
@@ -10,29 +10,32 @@ import struct
 from collections import namedtuple
 
 from cloudinit import util
+from cloudinit.net.netlink import (  # noqa: F401
+    IFINFOMSG_FMT,
+    IFINFOMSG_SIZE,
+    IFLA_IFNAME,
+    IFLA_OPERSTATE,
+    MAX_SIZE,
+    NLMSGHDR_FMT,
+    NLMSGHDR_SIZE,
+    PAD_ALIGNMENT,
+    RTM_DELLINK,
+    RTM_GETLINK,
+    RTM_NEWLINK,
+    RTM_SETLINK,
+    NetlinkCreateSocketError,
+    NetlinkHeader,
+)
 
 LOG = logging.getLogger(__name__)
 
 # http://man7.org/linux/man-pages/man7/netlink.7.html
 RTMGRP_LINK = 1
-RTM_NEWLINK = 16
-RTM_DELLINK = 17
-RTM_GETLINK = 18
-RTM_SETLINK = 19
-MAX_SIZE = 65535
 MSG_TYPE_OFFSET = 16
 SELECT_TIMEOUT = 60
 
-NLMSGHDR_FMT = "IHHII"
-IFINFOMSG_FMT = "BHiII"
-NLMSGHDR_SIZE = struct.calcsize(NLMSGHDR_FMT)
-IFINFOMSG_SIZE = struct.calcsize(IFINFOMSG_FMT)
 RTATTR_START_OFFSET = NLMSGHDR_SIZE + IFINFOMSG_SIZE
 RTA_DATA_START_OFFSET = 4
-PAD_ALIGNMENT = 4
-
-IFLA_IFNAME = 3
-IFLA_OPERSTATE = 16
 
 # https://www.kernel.org/doc/Documentation/networking/operstates.txt
 OPER_UNKNOWN = 0
@@ -45,13 +48,6 @@ OPER_UP = 6
 
 RTAAttr = namedtuple("RTAAttr", ["length", "rta_type", "data"])
 InterfaceOperstate = namedtuple("InterfaceOperstate", ["ifname", "operstate"])
-NetlinkHeader = namedtuple(
-    "NetlinkHeader", ["length", "type", "flags", "seq", "pid"]
-)
-
-
-class NetlinkCreateSocketError(RuntimeError):
-    """Raised if netlink socket fails during create or bind."""
 
 
 def create_bound_netlink_socket():
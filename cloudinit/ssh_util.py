@@ -657,7 +657,7 @@ def get_opensshd_version():
     # out its version number to stderr.
     err = ""
     with suppress(subp.ProcessExecutionError):
-        _, err = subp.subp(["sshd", "-V"], rcs=[0, 1])
+        _, err = subp.probe(["sshd", "-V"], rcs=[0, 1])
     prefix = "OpenSSH_"
     for line in err.split("\n"):
         if line.startswith(prefix):
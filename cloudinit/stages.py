@@ -23,8 +23,11 @@ from cloudinit import (
     importer,
     lifecycle,
     net,
+    netinfo,
     sources,
+    subp,
     type_utils,
+    url_helper,
     util,
 )
 from cloudinit.config import Netv1, Netv2
@@ -384,6 +387,7 @@ class Init:
             LOG.debug(myrep.description)
 
         if not ds:
+            self._configure_session_pool()
             try:
                 cfg_list, pkg_list = self._get_datasources()
                 # Deep copy so that user-data handlers can not modify
@@ -417,6 +421,17 @@ class Init:
         self._reset()
         return ds
 
+    def _configure_session_pool(self):
+        """Apply url_session_pool_size system config to url_helper."""
+        if "url_session_pool_size" not in self.cfg:
+            return
+        try:
+            url_helper.set_session_pool_maxsize(
+                util.get_cfg_option_int(self.cfg, "url_session_pool_size")
+            )
+        except ValueError as e:
+            LOG.warning("Ignoring invalid url_session_pool_size: %s", e)
+
     def _get_instance_subdirs(self):
         return ["handlers", "scripts", "sem"]
 
@@ -1116,9 +1131,13 @@ class Init:
         sem = self._get_per_boot_network_semaphore()
         try:
             with sem.semaphore.lock(*sem.args):
-                return self.distro.apply_network_config(
-                    netcfg, bring_up=bring_up
-                )
+                try:
+                    return self.distro.apply_network_config(
+                        netcfg, bring_up=bring_up
+                    )
+                finally:
+                    subp.probe_cache.invalidate(*netinfo.NET_PROBE_COMMANDS)
+                    net.topology.invalidate()
         except net.RendererNotFoundError as e:
             LOG.error(
                 "Unable to render networking. Network config is "
@@ -5,9 +5,10 @@ import collections
 import logging
 import os
 import subprocess
+import threading
 from errno import ENOEXEC
 from io import TextIOWrapper
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from cloudinit import performance
 
@@ -294,6 +295,159 @@ def subp(
     return SubpResult(out, err)
 
 
+PROBE_CACHE_SCOPES = ("stage", "boot")
+
+
+class ProbeCache:
+    """Memoize the results of read-only probe commands.
+
+    While enabled, commands run through probe() execute once per distinct
+    argv, environment and subp() options. Later identical calls replay the
+    stored SubpResult or re-raise the stored ProcessExecutionError. Code that
+    changes what a probe reports must call invalidate() with the probe's
+    command name.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[
+            Tuple, Union[SubpResult, ProcessExecutionError]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        """Drop all cached results and reset hit/miss counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def invalidate(self, *commands: str):
+        """Drop cached results for the named commands, or all if none given.
+
+        :param commands: command basenames such as "blkid" or "ip".
+        """
+        with self._lock:
+            if not commands:
+                self._results.clear()
+                return
+            for key in list(self._results):
+                if key[0] in commands:
+                    del self._results[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._results),
+            }
+
+    @staticmethod
+    def _key(args, kwargs) -> Tuple:
+        if isinstance(args, (str, bytes)):
+            argv: Tuple = (args,)
+            command = args.split()[0] if args.split() else args
+        else:
+            argv = tuple(args)
+            command = argv[0] if argv else ""
+        if isinstance(command, bytes):
+            command = command.decode("utf-8", "replace")
+        env = os.environ.copy()
+        env.update(kwargs.get("update_env") or {})
+        options = tuple(
+            sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in kwargs.items()
+                if name not in ("update_env", "logstring")
+            )
+        )
+        return (
+            os.path.basename(command),
+            argv,
+            tuple(sorted(env.items())),
+            options,
+        )
+
+    def run(self, args, **kwargs) -> SubpResult:
+        """Return the cached result of subp(args, **kwargs), running it once.
+
+        Concurrent misses for the same key may each run the command; the last
+        result to complete is kept.
+        """
+        key = self._key(args, kwargs)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if result is None:
+            try:
+                result = subp(args, **kwargs)
+            except ProcessExecutionError as e:
+                result = e
+            with self._lock:
+                self._results[key] = result
+        else:
+            LOG.debug("Using cached result of probe %s", args)
+        if isinstance(result, ProcessExecutionError):
+            raise result.with_traceback(None)
+        return result
+
+
+probe_cache = ProbeCache()
+
+
+def configure_probe_cache(scope: Optional[str]):
+    """Enable or disable the probe cache for the current boot stage.
+
+    :param scope:
+        "stage" drops cached probe results before each stage runs. "boot"
+        keeps them for the life of the process, so results are shared by all
+        stages when running with --all-stages. Any other value disables the
+        cache.
+    """
+    if scope is None:
+        probe_cache.disable()
+        return
+    if scope not in PROBE_CACHE_SCOPES:
+        LOG.warning(
+            "Ignoring invalid probe_cache value %r, expected one of: %s",
+            scope,
+            ", ".join(PROBE_CACHE_SCOPES),
+        )
+        probe_cache.disable()
+        return
+    if scope == "stage" or not probe_cache.enabled:
+        probe_cache.clear()
+    probe_cache.enable()
+
+
+def probe(
+    args: Union[str, bytes, List[str], List[bytes]], **kwargs
+) -> SubpResult:
+    """Run a read-only probe command, reusing a cached result if enabled.
+
+    Accepts the same arguments as subp(). Only use this for commands whose
+    output depends on system state that cloud-init invalidates when it
+    changes, such as blkid, dmidecode, systemd-detect-virt or ip. Commands
+    that are fed data on stdin are never cached.
+    """
+    if not probe_cache.enabled or kwargs.get("data") is not None:
+        return subp(args, **kwargs)
+    return probe_cache.run(args, **kwargs)
+
+
 def target_path(target=None, path=None):
     # return 'path' inside target, accepting target as None
     if target in (None, ""):
@@ -14,17 +14,22 @@ import io
 import json
 import logging
 import os
+import socket
 import threading
 import time
+import weakref
 from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from contextlib import contextmanager, suppress
 from email.utils import parsedate
 from functools import partial
 from http.client import NOT_FOUND
+from http.cookiejar import DefaultCookiePolicy
 from itertools import count
 from ssl import create_default_context
 from typing import (
     Any,
     Callable,
+    Dict,
     Iterator,
     List,
     Mapping,
@@ -45,6 +50,9 @@ LOG = logging.getLogger(__name__)
 REDACTED = "REDACTED"
 ExceptionCallback = Optional[Callable[["UrlError"], bool]]
 
+# Maximum number of keep-alive connections retained per endpoint
+DEFAULT_SESSION_POOL_MAXSIZE = 10
+
 
 def _cleanurl(url):
     parsed_url = list(urlparse(url, scheme="http"))
@@ -448,6 +456,232 @@ def _handle_error(
     raise error
 
 
+class SessionPool:
+    """Process-wide keep-alive requests sessions shared by readurl.
+
+    Sessions are keyed by (scheme, host, port) so that successive requests
+    to the same endpoint, such as a metadata service crawl, reuse
+    established connections rather than performing a new TCP handshake
+    for every url. Cookies are never retained across requests so that a
+    shared session behaves like the throwaway sessions it replaces.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_SESSION_POOL_MAXSIZE):
+        self.pool_maxsize = pool_maxsize
+        self._sessions: Dict[
+            Tuple[str, str, Optional[int]], requests.Session
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, url: str) -> requests.Session:
+        """Return the shared session for url's endpoint, creating it."""
+        parsed = urlsplit(url)
+        key = (parsed.scheme, parsed.hostname or "", parsed.port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_maxsize
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.cookies.set_policy(
+                    DefaultCookiePolicy(allowed_domains=[])
+                )
+                self._sessions[key] = session
+            return session
+
+    def close(self):
+        """Close all pooled sessions and their open connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_session_pool = SessionPool()
+
+# Per-thread session which readurl uses in preference to the pool. Set by
+# _run_func_with_delay so that dual_stack can abort losing requests.
+_thread_session = threading.local()
+
+
+class CancellableHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose in-flight requests can be aborted from any thread.
+
+    Connections created by this adapter are tracked so that cancel() can
+    shut down their sockets, which immediately fails any request blocked
+    waiting on a response. Connections attempted after cancel() fail
+    without sending a request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._cancelled = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._tracked_pool_cls(pool_cls)
+            for scheme, pool_cls in (
+                self.poolmanager.pool_classes_by_scheme.items()
+            )
+        }
+
+    def _tracked_pool_cls(self, pool_cls):
+        adapter = self
+        base_connect = pool_cls.ConnectionCls.connect
+
+        def connect(conn):
+            if adapter._cancelled.is_set():
+                raise ConnectionAbortedError("Request cancelled")
+            adapter._connections.add(conn)
+            base_connect(conn)
+            if adapter._cancelled.is_set():
+                conn.close()
+                raise ConnectionAbortedError("Request cancelled")
+
+        conn_cls = type(
+            "Cancellable%s" % pool_cls.ConnectionCls.__name__,
+            (pool_cls.ConnectionCls,),
+            {"connect": connect},
+        )
+        return type(
+            "Cancellable%s" % pool_cls.__name__,
+            (pool_cls,),
+            {"ConnectionCls": conn_cls},
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Abort all requests in flight and any future requests."""
+        self._cancelled.set()
+        for conn in list(self._connections):
+            sock = getattr(conn, "sock", None)
+            if sock is not None:
+                with suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+
+
+def cancellable_session() -> Tuple[requests.Session, CancellableHTTPAdapter]:
+    """Return a new session whose requests may be aborted by its adapter."""
+    session = requests.Session()
+    adapter = CancellableHTTPAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+class RequestCancellation:
+    """Abort the url requests made by one or more threads.
+
+    Threads running under cancellable_requests() read urls through sessions
+    created here. cancel() aborts their requests in flight and fails any
+    further requests without retrying, and interrupts readurl and
+    wait_for_url while they sleep between attempts.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._adapters: "weakref.WeakSet[CancellableHTTPAdapter]" = (
+            weakref.WeakSet()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def track(self, adapter: CancellableHTTPAdapter):
+        """Cancel adapter along with this cancellation."""
+        with self._lock:
+            self._adapters.add(adapter)
+            cancelled = self.cancelled
+        if cancelled:
+            adapter.cancel()
+
+    def session(self) -> requests.Session:
+        """Return a new session whose requests are aborted by cancel()."""
+        session, adapter = cancellable_session()
+        self.track(adapter)
+        return session
+
+    def sleep(self, seconds: float):
+        """Sleep for seconds, returning early once cancelled."""
+        self._event.wait(seconds)
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            adapters = list(self._adapters)
+        for adapter in adapters:
+            adapter.cancel()
+
+
+def _current_cancellation() -> Optional[RequestCancellation]:
+    return getattr(_thread_session, "cancellation", None)
+
+
+def _requests_cancelled() -> bool:
+    cancellation = _current_cancellation()
+    return cancellation is not None and cancellation.cancelled
+
+
+def _sleep(seconds: float):
+    cancellation = _current_cancellation()
+    if cancellation is None:
+        time.sleep(seconds)
+    else:
+        cancellation.sleep(seconds)
+
+
+@contextmanager
+def cancellable_requests(cancellation: RequestCancellation):
+    """Make url requests from this thread abortable by cancellation."""
+    session = cancellation.session()
+    _thread_session.session = session
+    _thread_session.cancellation = cancellation
+    try:
+        yield
+    finally:
+        _thread_session.session = None
+        _thread_session.cancellation = None
+        session.close()
+
+
+def close_session_pool():
+    """Drop all keep-alive connections held by readurl.
+
+    Called when the network that pooled connections were established over
+    goes away, such as on teardown of ephemeral networking.
+    """
+    _session_pool.close()
+
+
+def set_session_pool_maxsize(pool_maxsize: int):
+    """Set the number of keep-alive connections retained per endpoint.
+
+    Existing sessions are closed so that the new size applies to all
+    subsequent requests.
+    """
+    if pool_maxsize < 1:
+        raise ValueError(
+            "Invalid session pool size: %s. Must be >= 1" % pool_maxsize
+        )
+    if pool_maxsize != _session_pool.pool_maxsize:
+        _session_pool.close()
+        _session_pool.pool_maxsize = pool_maxsize
+
+
 def readurl(
     url,
     *,
@@ -493,6 +727,7 @@ def readurl(
     :param exception_cb: Optional callable to handle exception and returns
         True if retries are permitted.
     :param session: Optional exiting requests.Session instance to reuse.
+        Default: the shared keep-alive session for the url's endpoint.
     :param infinite: Bool, set True to retry indefinitely. Default: False.
     :param log_req_resp: Set False to turn off verbose debug messages.
     :param request_method: String passed as 'method' to Session.request.
@@ -534,7 +769,9 @@ def readurl(
         sec_between = -1
 
     if session is None:
-        session = requests.Session()
+        session = getattr(_thread_session, "session", None)
+    if session is None:
+        session = _session_pool.get(url)
 
     # Handle retrying ourselves since the built-in support
     # doesn't handle sleeping between tries...
@@ -601,6 +838,8 @@ def readurl(
             raised_exception = e
             response = None
 
+        if _requests_cancelled():
+            raise url_error from raised_exception
         response_sleep_time = _handle_error(
             url_error,
             exception_cb=exception_cb,
@@ -619,7 +858,7 @@ def readurl(
                     "Please wait %s seconds while we wait to try again",
                     sec_between,
                 )
-            time.sleep(sleep_time)
+            _sleep(sleep_time)
 
     raise RuntimeError("This path should be unreachable...")
 
@@ -630,8 +869,15 @@ def _run_func_with_delay(
     timeout: int,
     event: threading.Event,
     delay: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+    cancellation: Optional[RequestCancellation] = None,
 ) -> Any:
-    """Execute func with optional delay"""
+    """Execute func with optional delay
+
+    When session is provided, any readurl call made by func on this thread
+    uses that session unless passed one explicitly. When cancellation is
+    provided, readurl stops retrying once it is cancelled.
+    """
     if delay:
 
         # event returns True iff the flag is set to true: indicating that
@@ -639,7 +885,13 @@ def _run_func_with_delay(
         # again - exit early
         if event.wait(timeout=delay):
             return
-    return func(addr, timeout)
+    _thread_session.session = session
+    _thread_session.cancellation = cancellation
+    try:
+        return func(addr, timeout)
+    finally:
+        _thread_session.session = None
+        _thread_session.cancellation = None
 
 
 def dual_stack(
@@ -650,16 +902,24 @@ def dual_stack(
 ) -> Tuple[Optional[str], Optional[UrlResponse]]:
     """execute multiple callbacks in parallel
 
-    Run blocking func against two different addresses staggered with a
-    delay. The first call to return successfully is returned from this
-    function and remaining unfinished calls are cancelled if they have not
-    yet started
+    Run blocking func against any number of addresses, staggered with a
+    delay (RFC 8305 happy eyeballs). The first call to return successfully
+    is returned from this function. Calls which have not yet started are
+    skipped and any readurl requests still in flight for the other
+    addresses are aborted by shutting down their connections, so losing
+    requests do not hold threads and sockets until their timeouts expire.
     """
     return_result = None
     returned_address = None
     last_exception: Optional[BaseException] = None
     exceptions = []
     is_done = threading.Event()
+    sessions = [cancellable_session() for _ in addresses]
+    # Requests made on behalf of a cancellable thread are cancelled with it
+    cancellation = _current_cancellation()
+    if cancellation is not None:
+        for _session, adapter in sessions:
+            cancellation.track(adapter)
 
     # future work: add cancel_futures to Python stdlib ThreadPoolExecutor
     # context manager implementation
@@ -676,14 +936,16 @@ def dual_stack(
                 timeout=timeout,
                 event=is_done,
                 delay=(i * stagger_delay),
-            ): addr
+                session=sessions[i][0],
+                cancellation=cancellation,
+            ): (i, addr)
             for i, addr in enumerate(addresses)
         }
 
         # handle returned requests in order of completion
         for future in as_completed(futures, timeout=timeout):
 
-            returned_address = futures[future]
+            winner, returned_address = futures[future]
             return_exception = future.exception()
             if return_exception:
                 last_exception = return_exception
@@ -695,6 +957,9 @@ def dual_stack(
                     # communicate to other threads that they do not need to
                     # try: this thread has already succeeded
                     is_done.set()
+                    for i, (_session, adapter) in enumerate(sessions):
+                        if i != winner:
+                            adapter.cancel()
                     return (returned_address, return_result)
 
         # No success, return the last exception but log them all for
@@ -713,6 +978,9 @@ def dual_stack(
 
     # when max_wait expires, log but don't throw (retries happen)
     except TimeoutError:
+        is_done.set()
+        for _session, adapter in sessions:
+            adapter.cancel()
         LOG.debug(
             "Timed out waiting for addresses: %s, "
             "exception(s) raised while waiting: %s",
@@ -721,6 +989,8 @@ def dual_stack(
         )
     finally:
         executor.shutdown(wait=False)
+        for session, _adapter in sessions:
+            session.close()
 
     return (returned_address, return_result)
 
@@ -961,8 +1231,10 @@ def wait_for_url(
         must_try_again = False
         if resp.response:
             return resp.url, resp.response.contents
+        elif _requests_cancelled():
+            break
         elif resp.wait_time:
-            time.sleep(resp.wait_time)
+            _sleep(resp.wait_time)
             loop_n = loop_n + 1
             must_try_again = True
             continue
@@ -976,7 +1248,9 @@ def wait_for_url(
             "Please wait %s seconds while we wait to try again",
             current_sleep_time,
         )
-        time.sleep(current_sleep_time)
+        _sleep(current_sleep_time)
+        if _requests_cancelled():
+            break
 
         # shorten timeout to not run way over max_time
         current_time = time.monotonic()
@@ -32,6 +32,7 @@ import stat
 import string
 import subprocess
 import sys
+import threading
 import time
 from base64 import b64decode
 from collections import deque
@@ -53,6 +54,7 @@ from typing import (
     NamedTuple,
     Optional,
     Sequence,
+    Tuple,
     Union,
     cast,
 )
@@ -66,11 +68,11 @@ from cloudinit import (
     mergers,
     net,
     performance,
+    seedfs,
     settings,
     subp,
     temp_utils,
     type_utils,
-    url_helper,
     version,
 )
 from cloudinit.log.log_util import logexc
@@ -922,6 +924,8 @@ def read_optional_seed(fill, base="", ext="", timeout=5):
     if files are present, populates 'fill' dictionary with 'user-data' and
     'meta-data' entries
     """
+    from cloudinit import url_helper
+
     try:
         md, ud, vd, network = read_seeded(base=base, ext=ext, timeout=timeout)
         fill["user-data"] = ud
@@ -1009,6 +1013,8 @@ def load_yaml(blob, default=None, allowed=(dict,)):
 
 
 def read_seeded(base="", ext="", timeout=5, retries=10):
+    from cloudinit import url_helper
+
     if base.find("%s") >= 0:
         ud_url = base.replace("%s", "user-data" + ext)
         vd_url = base.replace("%s", "vendor-data" + ext)
@@ -1474,6 +1480,9 @@ def find_devs_with(
             criteria, oformat, tag, no_cache, path
         )
 
+    if oformat == "device" and not tag and not no_cache and not path:
+        return block_devices.find(criteria)
+
     blk_id_cmd = ["blkid"]
     options = []
     if criteria:
@@ -1509,6 +1518,10 @@ def find_devs_with(
             out = ""
         else:
             raise
+    if path:
+        # Probing a device adds it to the blkid cache, which the inventory
+        # is read from.
+        block_devices.invalidate()
     entries = []
     for line in out.splitlines():
         line = line.strip()
@@ -1517,6 +1530,105 @@ def find_devs_with(
     return entries
 
 
+class BlockDeviceInventory:
+    """An index of the block devices and tags found by a single blkid scan.
+
+    find_devs_with queries are answered from the index rather than running
+    blkid for each. The devices are scanned again once udev adds, removes or
+    relabels a block device, or after invalidate() is called when cloud-init
+    partitions or formats a disk.
+
+    Partitions are not indexed. is_partition() only checks one sysfs file,
+    and its caller in ConfigDrive also runs on the BSDs, which do not use
+    this index.
+    """
+
+    # udev maintains these links, so the directories change along with the
+    # block devices and filesystem tags on the system.
+    UDEV_LINK_DIRS = (
+        "/dev/disk/by-label",
+        "/dev/disk/by-uuid",
+        "/dev/disk/by-partuuid",
+    )
+    SYS_BLOCK_DIR = "/sys/class/block"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices: Optional[Dict[str, Dict[str, str]]] = None
+        self._index: Dict[Tuple[str, str], List[str]] = {}
+        self._fingerprint: Optional[tuple] = None
+        self.scans = 0
+
+    def _current_fingerprint(self) -> tuple:
+        mtimes: List[Optional[int]] = []
+        for path in self.UDEV_LINK_DIRS:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        try:
+            block_devices = sorted(os.listdir(self.SYS_BLOCK_DIR))
+        except OSError:
+            block_devices = []
+        return (tuple(mtimes), tuple(block_devices))
+
+    def invalidate(self):
+        """Scan the block devices again on the next query."""
+        with self._lock:
+            self._devices = None
+        subp.probe_cache.invalidate("blkid")
+
+    def _refresh(self) -> Dict[str, Dict[str, str]]:
+        fingerprint = self._current_fingerprint()
+        if self._devices is not None and fingerprint == self._fingerprint:
+            return self._devices
+        if self._devices is not None:
+            subp.probe_cache.invalidate("blkid")
+        try:
+            # See man blkid for why 2 is added
+            out, _err = subp.probe(
+                ["blkid", "-o", "full"], rcs=[0, 2], decode="replace"
+            )
+        except subp.ProcessExecutionError as e:
+            if e.errno != ENOENT:
+                raise
+            # blkid not found...
+            out = ""
+        devices = {}
+        index: Dict[Tuple[str, str], List[str]] = {}
+        for line in out.splitlines():
+            dev, _, data = line.partition(":")
+            if not dev.strip():
+                continue
+            tags = load_shell_content(data)
+            for key, value in tags.items():
+                index.setdefault((key, value), []).append(dev)
+            tags["DEVNAME"] = dev
+            devices[dev] = tags
+        self._devices = devices
+        self._index = index
+        self._fingerprint = fingerprint
+        self.scans += 1
+        LOG.debug("Found %d block devices with blkid", len(devices))
+        return devices
+
+    def find(self, criteria: Optional[str] = None) -> List[str]:
+        """Return the devices matching criteria, as find_devs_with does.
+
+        @param criteria: A blkid token of the form NAME=value, such as
+            LABEL=config-2 or TYPE=iso9660. All devices match None.
+        """
+        with self._lock:
+            devices = self._refresh()
+            if criteria:
+                name, _, value = criteria.partition("=")
+                return list(self._index.get((name, value), []))
+            return list(devices)
+
+
+block_devices = BlockDeviceInventory()
+
+
 def blkid(devs=None, disable_cache=False):
     """Get all device tags details from blkid.
 
@@ -1538,7 +1650,7 @@ def blkid(devs=None, disable_cache=False):
     # we have to decode with 'replace' as shelx.split (called by
     # load_shell_content) can't take bytes.  So this is potentially
     # lossy of non-utf-8 chars in blkid output.
-    out = subp.subp(cmd, capture=True, decode="replace")
+    out = subp.probe(cmd, capture=True, decode="replace")
     ret = {}
     for line in out.stdout.splitlines():
         dev, _, data = line.partition(":")
@@ -1996,6 +2108,10 @@ def mount_cb(
 
     mtype is a filesystem type.  it may be a list, string (a single fsname)
     or a list of fsnames.
+
+    ISO9660 and vfat filesystems are read without mounting them, and their
+    files are copied to the directory passed to callback. Other filesystems,
+    or those which cannot be read in-process, are mounted.
     """
 
     if isinstance(mtype, str):
@@ -2035,6 +2151,19 @@ def mount_cb(
             mountpoint = mounted[os.path.realpath(device)]["mountpoint"]
         else:
             failure_reason = None
+            mountpoint = None
+            if seedfs.readable_types(mtypes):
+                try:
+                    seedfs.extract(device, tmpd, mtypes)
+                    mountpoint = tmpd
+                    # The files have been read, so there is nothing to mount
+                    mtypes = []
+                except (seedfs.UnsupportedFilesystem, OSError) as exc:
+                    LOG.debug(
+                        "Unable to read %s without mounting it: %s",
+                        device,
+                        exc,
+                    )
             for mtype in mtypes:
                 mountpoint = None
                 try:
@@ -2405,7 +2534,7 @@ def _cmd_exits_zero(cmd):
     if subp.which(cmd[0]) is None:
         return False
     try:
-        subp.subp(cmd)
+        subp.probe(cmd)
     except subp.ProcessExecutionError:
         return False
     return True
@@ -3,6 +3,7 @@ import glob
 import os
 import re
 import sys
+from copy import deepcopy
 
 # If extensions (or modules to document with autodoc) are in another directory,
 # add these directories to sys.path here. If the directory is relative to the
@@ -390,7 +391,8 @@ def render_module_schemas():
     from cloudinit.importer import import_module
 
     mod_docs = {}
-    schema = get_schema()
+    # Rendering resolves $refs in place, so work on a private copy
+    schema = deepcopy(get_schema())
     defs = schema.get("$defs", {})
 
     for mod_path in glob.glob("../../cloudinit/config/cc_*py"):
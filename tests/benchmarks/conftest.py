@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+
+from cloudinit.simpletable import SimpleTable
+from tests.benchmarks.harness import METRICS
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-baseline",
+        default=BASELINE,
+        help="Baseline to compare results against. Default: %(default)s",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="Write the results to the baseline instead of comparing them.",
+    )
+    group.addoption(
+        "--benchmark-metrics",
+        default=",".join(METRICS),
+        help=(
+            "Comma separated metrics to compare or save. Timings and memory"
+            " use are only meaningful on the machine which saved the"
+            " baseline. Default: %(default)s"
+        ),
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=3,
+        help="Number of boots to run per scenario. Default: %(default)s",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.25,
+        help=(
+            "Fraction by which timings and memory use may exceed the"
+            " baseline. Default: %(default)s"
+        ),
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=None,
+        help="Write the full report of every boot to this file.",
+    )
+
+
+class BenchmarkSession:
+    def __init__(self, config):
+        self.config = config
+        self.metrics = config.getoption("benchmark_metrics").split(",")
+        unknown = set(self.metrics) - set(METRICS)
+        if unknown:
+            raise pytest.UsageError(
+                "Unknown --benchmark-metrics: %s" % ", ".join(sorted(unknown))
+            )
+        self.baseline_path = config.getoption("benchmark_baseline")
+        self.baseline = {}
+        if os.path.exists(self.baseline_path):
+            with open(self.baseline_path) as stream:
+                self.baseline = json.load(stream)
+        self.summaries = {}
+        self.reports = {}
+
+    def baseline_for(self, scenario):
+        return {
+            name: {m: v for m, v in metrics.items() if m in self.metrics}
+            for name, metrics in self.baseline.get(scenario, {}).items()
+        }
+
+    def finish(self):
+        if self.config.getoption("benchmark_save") and self.summaries:
+            baseline = dict(self.baseline)
+            for scenario, summary in self.summaries.items():
+                baseline[scenario] = {
+                    name: {m: metrics[m] for m in self.metrics}
+                    for name, metrics in summary.items()
+                }
+            with open(self.baseline_path, "w") as stream:
+                json.dump(baseline, stream, indent=1, sort_keys=True)
+                stream.write("\n")
+        json_path = self.config.getoption("benchmark_json")
+        if json_path:
+            with open(json_path, "w") as stream:
+                json.dump(self.reports, stream, indent=1, sort_keys=True)
+
+
+BENCHMARK_KEY = pytest.StashKey[BenchmarkSession]()
+
+
+@pytest.fixture(scope="session")
+def benchmark_session(request):
+    session = BenchmarkSession(request.config)
+    request.config.stash[BENCHMARK_KEY] = session
+    yield session
+    session.finish()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    session = config.stash.get(BENCHMARK_KEY, None)
+    if session is None:
+        return
+    for scenario, summary in sorted(session.summaries.items()):
+        table = SimpleTable(["Event"] + list(METRICS))
+        for name, metrics in sorted(summary.items()):
+            if name.count("/"):
+                continue
+            table.add_row(
+                [name]
+                + [
+                    (
+                        "%.3f" % metrics[m]
+                        if isinstance(metrics[m], float)
+                        else str(metrics[m])
+                    )
+                    for m in METRICS
+                ]
+            )
+        terminalreporter.write_sep("-", f"benchmark: {scenario}")
+        terminalreporter.write_line(str(table))
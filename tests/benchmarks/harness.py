@@ -0,0 +1,669 @@
+"""Run a simulated cloud-init boot and record its resource usage.
+
+A boot runs every stage (init-local, init-network, modules-config and
+modules-final) through ``cloudinit.cmd.main`` in a single fresh Python process,
+the same way ``cloud-init --all-stages`` does. The instance is backed by a
+temporary root directory, subprocess commands are stubbed out with canned
+output and metadata services are served by a local HTTP stand-in.
+
+Metrics are collected for every reporting event published while booting, so
+each stage, datasource search and config module gets its own entry.
+
+usage:
+
+    python3 -m tests.benchmarks.harness <scenario> <root_dir>
+
+The report is written to stdout as JSON.
+"""
+
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from unittest import mock
+from urllib.parse import unquote
+
+# Only the profiler is imported up front so that import time spent by
+# cloud-init itself is attributed to the stage which triggered it.
+from cloudinit import performance
+
+STAGES = (
+    ("init-local", ["init", "--local"]),
+    ("init-network", ["init"]),
+    ("modules-config", ["modules", "--mode=config"]),
+    ("modules-final", ["modules", "--mode=final"]),
+)
+
+# Metrics which only depend on cloud-init's own behaviour, so they can be
+# compared between machines.
+COUNT_METRICS = ("subprocesses", "http_requests")
+TIME_METRICS = ("wall", "cpu", "imports")
+MEMORY_METRICS = ("max_rss_kb",)
+METRICS = COUNT_METRICS + TIME_METRICS + MEMORY_METRICS
+
+INSTANCE_ID = "i-benchmark0123"
+
+USER_DATA = """\
+#cloud-config
+bootcmd:
+  - [echo, benchmark]
+write_files:
+  - path: {root}/etc/benchmark/motd
+    content: benchmark
+    owner: {owner}
+runcmd:
+  - [echo, benchmark]
+phone_home:
+  url: {imds_url}/phone-home/$INSTANCE_ID
+  post: [instance_id]
+  tries: 1
+final_message: benchmark boot finished
+"""
+
+LOG_CFG = """\
+[loggers]
+keys=root,cloudinit
+
+[handlers]
+keys=file
+
+[formatters]
+keys=simple
+
+[logger_root]
+level=DEBUG
+handlers=file
+
+[logger_cloudinit]
+level=DEBUG
+qualname=cloudinit
+handlers=
+propagate=1
+
+[handler_file]
+class=FileHandler
+level=DEBUG
+formatter=simple
+args=('{log_file}', 'a')
+
+[formatter_simple]
+format=%(asctime)s - %(filename)s[%(levelname)s]: %(message)s
+"""
+
+# Canned (stdout, exit code) of every command the simulated boot may run.
+# Commands missing from this table are reported as not installed.
+STUB_COMMANDS: Dict[str, Tuple[str, int]] = {
+    "blkid": ("", 2),
+    "dmidecode": ("", 0),
+    "hostname": ("benchmark\n", 0),
+    "ip": ("", 0),
+    "locale": ("", 0),
+    "systemctl": ("", 0),
+    "systemd-detect-virt": ("none\n", 1),
+    "udevadm": ("", 0),
+}
+
+# Canned output of specific argv which differs from STUB_COMMANDS.
+STUB_ARGV: Dict[Tuple[str, ...], Tuple[str, int]] = {
+    ("ip", "--json", "addr"): ("[]", 0),
+}
+
+NIC_MAC = "0a:00:00:00:00:01"
+
+DHCP_LEASE = {
+    "interface": "eth0",
+    "fixed-address": "192.168.2.10",
+    "subnet-mask": "255.255.255.0",
+    "routers": "192.168.2.1",
+}
+
+EC2_METADATA = {
+    "ami-id": "ami-benchmark",
+    "hostname": "ip-192-168-2-10.benchmark.internal",
+    "instance-id": INSTANCE_ID,
+    "instance-type": "m5.large",
+    "local-hostname": "ip-192-168-2-10.benchmark.internal",
+    "local-ipv4": "192.168.2.10",
+    "mac": NIC_MAC,
+    "network": {
+        "interfaces": {
+            "macs": {
+                NIC_MAC: {
+                    "device-number": "0",
+                    "interface-id": "eni-benchmark",
+                    "local-ipv4s": "192.168.2.10",
+                    "mac": NIC_MAC,
+                    "subnet-ipv4-cidr-block": "192.168.2.0/24",
+                }
+            }
+        }
+    },
+    "placement": {"availability-zone": "bench-1a", "region": "bench-1"},
+    "public-keys": {"0=benchmark": {"openssh-key": "ssh-ed25519 AAAA bench"}},
+    "security-groups": "default",
+}
+
+EC2_IDENTITY = json.dumps(
+    {
+        "accountId": "123456789012",
+        "availabilityZone": "bench-1a",
+        "imageId": "ami-benchmark",
+        "instanceId": INSTANCE_ID,
+        "instanceType": "m5.large",
+        "region": "bench-1",
+    }
+)
+
+OPENSTACK_METADATA = json.dumps(
+    {
+        "uuid": INSTANCE_ID,
+        "hostname": "benchmark",
+        "name": "benchmark",
+        "availability_zone": "nova",
+        "public_keys": {"benchmark": "ssh-ed25519 AAAA bench"},
+    }
+)
+
+OPENSTACK_NETWORK = json.dumps(
+    {
+        "links": [
+            {
+                "id": "tap0",
+                "type": "phy",
+                "ethernet_mac_address": NIC_MAC,
+                "mtu": 1500,
+            }
+        ],
+        "networks": [
+            {
+                "id": "network0",
+                "link": "tap0",
+                "type": "ipv4_dhcp",
+                "network_id": "benchmark",
+            }
+        ],
+        "services": [],
+    }
+)
+
+
+def ec2_tree(user_data: str) -> dict:
+    version = {
+        "meta-data": EC2_METADATA,
+        "user-data": user_data,
+        "dynamic": {"instance-identity": {"document": EC2_IDENTITY}},
+    }
+    return {
+        name: version
+        for name in ("latest", "2009-04-04", "2016-09-02", "2021-03-23")
+    }
+
+
+def openstack_tree(user_data: str) -> dict:
+    version = {
+        "meta_data.json": OPENSTACK_METADATA,
+        "network_data.json": OPENSTACK_NETWORK,
+        "user_data": user_data,
+        "vendor_data.json": "{}",
+        "vendor_data2.json": "{}",
+    }
+    tree: dict = {
+        "openstack": {
+            name: version
+            for name in ("2012-08-10", "2013-04-04", "2015-10-15", "latest")
+        }
+    }
+    ec2_version = {"meta-data": EC2_METADATA, "user-data": user_data}
+    tree.update({"2009-04-04": ec2_version, "latest": ec2_version})
+    return tree
+
+
+class Scenario:
+    """A datasource shape to boot against.
+
+    :param datasource: The only entry in datasource_list.
+    :param imds_tree: Build the metadata service tree served over HTTP from
+        the rendered user-data, or None when the datasource is seeded from the
+        filesystem.
+    :param datasource_cfg: Datasource config, formatted with ``imds_url``.
+    :param patches: Return extra patches the datasource needs to reach the
+        metadata service stand-in, given its URL.
+    """
+
+    def __init__(
+        self,
+        datasource: str,
+        imds_tree=None,
+        datasource_cfg: Optional[dict] = None,
+        patches: Optional[Callable[[str], list]] = None,
+    ):
+        self.datasource = datasource
+        self.imds_tree = imds_tree
+        self.datasource_cfg = datasource_cfg or {}
+        self.patches = patches or (lambda imds_url: [])
+
+
+def openstack_patches(imds_url: str) -> list:
+    """Read the EC2 compatible metadata from the stand-in.
+
+    The OpenStack datasource always reads it from 169.254.169.254.
+    """
+    from cloudinit.sources.helpers import ec2
+
+    return [
+        mock.patch(
+            "cloudinit.sources.helpers.openstack.ec2.get_instance_metadata",
+            functools.partial(
+                ec2.get_instance_metadata, metadata_address=imds_url
+            ),
+        )
+    ]
+
+
+SCENARIOS = {
+    "nocloud": Scenario("NoCloud"),
+    "ec2": Scenario(
+        "Ec2",
+        ec2_tree,
+        {
+            "metadata_urls": ["{imds_url}"],
+            "max_wait": 10,
+            "timeout": 5,
+            "strict_id": False,
+        },
+    ),
+    "openstack": Scenario(
+        "OpenStack",
+        openstack_tree,
+        {"metadata_urls": ["{imds_url}"], "max_wait": 10, "timeout": 5},
+        openstack_patches,
+    ),
+}
+
+
+class IMDSHandler(BaseHTTPRequestHandler):
+    """Serve a nested dict as an EC2/OpenStack style metadata tree.
+
+    Dicts are served as newline separated listings of their keys, with a
+    trailing slash on keys which are themselves listings.
+    """
+
+    server: "IMDSServer"
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+    def _reply(self, status: int, body: str = ""):
+        self.server.count_request(self.command, self.path)
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        node: Union[dict, str] = self.server.tree
+        for part in filter(None, unquote(self.path.split("?")[0]).split("/")):
+            if not isinstance(node, dict) or part not in node:
+                self._reply(404)
+                return
+            node = node[part]
+        if isinstance(node, dict):
+            self._reply(
+                200,
+                "\n".join(
+                    f"{k}/" if isinstance(v, dict) else k
+                    for k, v in node.items()
+                ),
+            )
+        else:
+            self._reply(200, node)
+
+    def do_PUT(self):
+        if self.path.startswith("/latest/api/token"):
+            self._reply(200, "benchmark-token")
+        else:
+            self._reply(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply(200)
+
+
+class IMDSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, tree: dict):
+        super().__init__(("127.0.0.1", 0), IMDSHandler)
+        self.tree = tree
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def count_request(self, method: str, path: str):
+        with self._lock:
+            self.requests += 1
+
+
+class SubpStub:
+    """Replacement for subp.subp and subp.which backed by STUB_COMMANDS."""
+
+    def __init__(self):
+        self.commands: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(self.commands.values())
+
+    def which(self, program, search=None, target=None):
+        name = os.path.basename(program)
+        return f"/usr/bin/{name}" if name in STUB_COMMANDS else None
+
+    def subp(self, args, *, data=None, rcs=None, capture=True, **kwargs):
+        from cloudinit import subp
+
+        if isinstance(args, (str, bytes)):
+            argv = tuple(str(a) for a in args.split())
+        else:
+            argv = tuple(
+                a.decode() if isinstance(a, bytes) else str(a) for a in args
+            )
+        name = os.path.basename(argv[0])
+        with self._lock:
+            self.commands[name] += 1
+        out, exit_code = STUB_ARGV.get(
+            (name,) + argv[1:], STUB_COMMANDS.get(name, ("", 0))
+        )
+        if exit_code not in (rcs or [0]):
+            raise subp.ProcessExecutionError(
+                stdout=out, stderr="", exit_code=exit_code, cmd=args
+            )
+        if not capture:
+            return subp.SubpResult(None, None)
+        if kwargs.get("decode", "replace") is False:
+            return subp.SubpResult(out.encode(), b"")
+        return subp.SubpResult(out, "")
+
+
+class MetricsRecorder:
+    """Reporting handler which records resource usage of each event.
+
+    A snapshot of the counters is taken when an event starts and the
+    difference is recorded when the same event finishes.
+    """
+
+    def __init__(
+        self,
+        profiler: performance.ImportProfiler,
+        stub: SubpStub,
+        server: IMDSServer,
+    ):
+        self.profiler = profiler
+        self.stub = stub
+        self.server = server
+        self.events: Dict[str, dict] = {}
+        self._started: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        return {
+            "wall": time.monotonic(),
+            "cpu": time.process_time(),
+            "imports": sum(
+                t.duration for t in list(self.profiler.timings) if not t.depth
+            ),
+            "subprocesses": self.stub.count,
+            "http_requests": self.server.requests,
+        }
+
+    def start(self, name: str):
+        with self._lock:
+            self._started[name] = self.snapshot()
+
+    def finish(self, name: str, result: str = "SUCCESS"):
+        end = self.snapshot()
+        with self._lock:
+            start = self._started.pop(name, None)
+            if start is None:
+                return
+            metrics = {key: end[key] - start[key] for key in end}
+            metrics["max_rss_kb"] = resource.getrusage(
+                resource.RUSAGE_SELF
+            ).ru_maxrss
+            metrics["result"] = result
+            self.events[name] = metrics
+
+    def publish_event(self, event):
+        if event.event_type == "start":
+            self.start(event.name)
+        elif event.event_type == "finish":
+            self.finish(event.name, getattr(event, "result", "SUCCESS"))
+
+    def flush(self):
+        pass
+
+
+def write_fake_root(
+    root: str, scenario: Scenario, imds_url: str
+) -> Tuple[str, str]:
+    """Write system config and seed data for a boot under root.
+
+    :return: A tuple of the cloud.cfg path and the rendered user-data
+    """
+    import pwd
+
+    from cloudinit import atomic_helper, safeyaml, util
+
+    user = pwd.getpwuid(os.getuid()).pw_name
+    user_data = USER_DATA.format(
+        root=root, owner=f"{user}:{user}", imds_url=imds_url
+    )
+    ds_cfg = json.loads(
+        json.dumps(scenario.datasource_cfg).replace("{imds_url}", imds_url)
+    )
+    log_file = os.path.join(root, "var/log/cloud-init.log")
+    util.ensure_dir(os.path.dirname(log_file))
+    cfg = {
+        "datasource_list": [scenario.datasource],
+        "datasource": {scenario.datasource: ds_cfg},
+        "def_log_file": log_file,
+        "log_cfgs": [[LOG_CFG.format(log_file=log_file)]],
+        "syslog_fix_perms": [],
+        "network": {"config": "disabled"},
+        "preserve_hostname": True,
+        "users": [],
+        "cloud_init_modules": [
+            "migrator",
+            "bootcmd",
+            "write_files",
+            "users_groups",
+        ],
+        "cloud_config_modules": ["ssh_import_id", "runcmd"],
+        "cloud_final_modules": [
+            "scripts_vendor",
+            "scripts_per_once",
+            "scripts_per_boot",
+            "scripts_per_instance",
+            "scripts_user",
+            "phone_home",
+            "final_message",
+        ],
+        "system_info": {
+            "distro": "ubuntu",
+            "paths": {
+                "cloud_dir": os.path.join(root, "var/lib/cloud"),
+                "docs_dir": os.path.join(root, "usr/share/doc/cloud-init"),
+                "run_dir": os.path.join(root, "run/cloud-init"),
+                "templates_dir": os.path.join(root, "etc/cloud/templates"),
+            },
+        },
+    }
+    cloud_cfg = os.path.join(root, "etc/cloud/cloud.cfg")
+    util.write_file(cloud_cfg, safeyaml.dumps(cfg))
+    if scenario.imds_tree is None:
+        seed_dir = os.path.join(root, "var/lib/cloud/seed/nocloud")
+        util.write_file(
+            os.path.join(seed_dir, "meta-data"),
+            atomic_helper.json_dumps(
+                {"instance-id": INSTANCE_ID, "local-hostname": "benchmark"}
+            ),
+        )
+        util.write_file(os.path.join(seed_dir, "user-data"), user_data)
+        util.write_file(os.path.join(seed_dir, "vendor-data"), "")
+    return cloud_cfg, user_data
+
+
+def boot(scenario_name: str, root: str) -> dict:
+    """Boot scenario_name under root and return the recorded metrics."""
+    profiler = performance.ImportProfiler()
+    profiler.start()
+    startup = {"wall": time.monotonic(), "cpu": time.process_time()}
+    scenario = SCENARIOS[scenario_name]
+    stub = SubpStub()
+    server = IMDSServer({})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cloud_cfg, user_data = write_fake_root(root, scenario, server.url)
+    if scenario.imds_tree is not None:
+        server.tree = scenario.imds_tree(user_data)
+    server.tree["phone-home"] = {INSTANCE_ID: ""}
+
+    from cloudinit import reporting
+
+    recorder = MetricsRecorder(profiler, stub, server)
+    reporting.instantiated_handler_registry.register_item(
+        "benchmark", recorder
+    )
+    recorder.events["startup"] = {
+        "wall": time.monotonic() - startup["wall"],
+        "cpu": time.process_time() - startup["cpu"],
+        "imports": sum(t.duration for t in profiler.timings if not t.depth),
+        "subprocesses": 0,
+        "http_requests": 0,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "result": "SUCCESS",
+    }
+    patches: List[Any] = [
+        mock.patch("cloudinit.subp.subp", stub.subp),
+        mock.patch("cloudinit.subp.which", stub.which),
+        mock.patch("cloudinit.stages.CLOUD_CONFIG", cloud_cfg),
+        mock.patch("cloudinit.util.get_cmdline", return_value=""),
+        mock.patch("cloudinit.dmi.read_dmi_data", return_value=None),
+        mock.patch("cloudinit.net.find_fallback_nic", return_value="eth0"),
+        mock.patch(
+            "cloudinit.net.get_interfaces_by_mac",
+            return_value={NIC_MAC: "eth0"},
+        ),
+        mock.patch(
+            "cloudinit.net.ephemeral.maybe_perform_dhcp_discovery",
+            return_value=dict(DHCP_LEASE),
+        ),
+    ] + scenario.patches(server.url)
+    exit_codes: List[int] = []
+    try:
+        for patch in patches:
+            patch.start()
+        from cloudinit.cmd import main
+
+        for _name, argv in STAGES:
+            exit_codes.append(main.main(["cloud-init"] + argv) or 0)
+            if len(exit_codes) == 1:
+                # Like --all-stages, only set up logging in the first stage
+                for target in ("configure_root_logger", "setup_logging"):
+                    patch = mock.patch(f"cloudinit.log.loggers.{target}")
+                    patch.start()
+                    patches.append(patch)
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+        server.shutdown()
+        profiler.stop()
+    return {
+        "scenario": scenario_name,
+        "exit_codes": exit_codes,
+        "events": recorder.events,
+        "subprocess_commands": dict(stub.commands),
+    }
+
+
+def summarize(reports: List[dict]) -> Dict[str, dict]:
+    """Combine the reports of several boots of the same scenario.
+
+    Only the startup, stage and top-level events within each stage are kept.
+    Times and memory use are the best of all rounds, counts the worst.
+    """
+    summary: Dict[str, dict] = {}
+    for report in reports:
+        for name, metrics in report["events"].items():
+            if name.count("/") > 1:
+                continue
+            if name not in summary:
+                summary[name] = {m: metrics[m] for m in METRICS}
+                continue
+            for metric in METRICS:
+                pick = max if metric in COUNT_METRICS else min
+                summary[name][metric] = pick(
+                    summary[name][metric], metrics[metric]
+                )
+    return summary
+
+
+def find_regressions(
+    summary: Dict[str, dict],
+    baseline: Dict[str, dict],
+    tolerance: float,
+    time_slack: float = 0.05,
+) -> List[str]:
+    """Return a description of each metric which regressed from baseline.
+
+    Counts regress when they grow at all. Times may grow by tolerance (a
+    fraction of the baseline) plus time_slack seconds to absorb scheduling
+    noise on short events, and memory use by tolerance.
+    """
+    regressions = []
+    for name, expected in sorted(baseline.items()):
+        actual = summary.get(name)
+        if actual is None:
+            regressions.append(f"{name}: event no longer reported")
+            continue
+        for metric, limit in sorted(expected.items()):
+            if metric in TIME_METRICS:
+                limit = limit * (1 + tolerance) + time_slack
+            elif metric in MEMORY_METRICS:
+                limit = limit * (1 + tolerance)
+            if actual[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {actual[metric]:g} exceeds baseline"
+                    f" {expected[metric]:g}"
+                )
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2 or argv[0] not in SCENARIOS:
+        sys.stderr.write(
+            "usage: harness.py {%s} ROOT_DIR\n" % ",".join(SCENARIOS)
+        )
+        return 2
+    report = boot(argv[0], argv[1])
+    # Stages may replace sys.stdout, so write to the original stream.
+    stdout = sys.__stdout__
+    assert stdout is not None
+    stdout.write(json.dumps(report, sort_keys=True))
+    stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
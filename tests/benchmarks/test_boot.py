@@ -0,0 +1,48 @@
+import json
+import sys
+
+import pytest
+
+from cloudinit import subp
+from tests.benchmarks.harness import SCENARIOS, find_regressions, summarize
+from tests.helpers import get_top_level_dir
+
+
+def boot(scenario, root):
+    out, _err = subp.subp(
+        [sys.executable, "-m", "tests.benchmarks.harness", scenario, root],
+        cwd=str(get_top_level_dir()),
+    )
+    return json.loads(out)
+
+
+@pytest.mark.allow_subp_for(sys.executable)
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_boot(scenario, benchmark_session, tmp_path):
+    """A simulated boot succeeds without regressing from the baseline."""
+    rounds = benchmark_session.config.getoption("benchmark_rounds")
+    reports = []
+    for round_number in range(rounds):
+        root = tmp_path / str(round_number)
+        root.mkdir()
+        reports.append(boot(scenario, str(root)))
+    benchmark_session.reports[scenario] = reports
+    summary = summarize(reports)
+    benchmark_session.summaries[scenario] = summary
+
+    for report in reports:
+        assert [0, 0, 0, 0] == report["exit_codes"]
+        failed = [
+            name
+            for name, metrics in report["events"].items()
+            if metrics["result"] != "SUCCESS"
+        ]
+        assert [] == failed
+    if benchmark_session.config.getoption("benchmark_save"):
+        return
+    regressions = find_regressions(
+        summary,
+        benchmark_session.baseline_for(scenario),
+        benchmark_session.config.getoption("benchmark_tolerance"),
+    )
+    assert [] == regressions
@@ -0,0 +1,9 @@
+# $'...' strings, which bash expands but other shells do not
+TAB=$'a\tb'
+NEWLINE=$'line 1\nline 2'
+QUOTES=$'it\'s \"double\"'
+OCTAL_HEX=$'\101\x42\103'
+CONTROL=$'bell\a escape\e backslash\\ question\?'
+UNKNOWN=$'\q\z'
+CTRL=$'\cA'
+JOINED=$'a\n'"b"'c'
@@ -0,0 +1,4 @@
+# Values which need a shell to evaluate
+NAME='vm-23'
+SET_HOSTNAME="${NAME}.example.com"
+DATE_SET=$(echo yes)
@@ -0,0 +1,38 @@
+# Context variables generated by OpenNebula
+DISK_ID='1'
+ETH0_CONTEXT_FORCE_IPV4=''
+ETH0_DNS='10.0.0.1 10.0.0.2'
+ETH0_EXTERNAL=''
+ETH0_GATEWAY='10.0.0.1'
+ETH0_GATEWAY6=''
+ETH0_IP='10.0.0.23'
+ETH0_IP6=''
+ETH0_IP6_PREFIX_LENGTH=''
+ETH0_IP6_ULA=''
+ETH0_MAC='02:00:0a:00:00:17'
+ETH0_MASK='255.255.255.0'
+ETH0_METRIC=''
+ETH0_MTU='1500'
+ETH0_NETWORK='10.0.0.0'
+ETH0_SEARCH_DOMAIN='example.com'
+ETH0_VLAN_ID=''
+ETH0_VROUTER_IP=''
+ETH0_VROUTER_IP6=''
+ETH0_VROUTER_MANAGEMENT=''
+ETH1_DNS=''
+ETH1_GATEWAY=''
+ETH1_IP='192.168.150.4'
+ETH1_IP6='2001:db8:1:0:400:c0ff:fea8:96'
+ETH1_IP6_PREFIX_LENGTH='64'
+ETH1_MAC='02:00:c0:a8:96:04'
+ETH1_MASK='255.255.255.0'
+ETH1_ROUTES='10.10.0.0/16 via 192.168.150.1, 10.20.0.0/16 via 192.168.150.1'
+NETWORK='YES'
+SET_HOSTNAME='vm-23.example.com'
+SSH_PUBLIC_KEY='ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAABAQC0 user@host
+# disabled key
+ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAI user@laptop'
+TARGET='hda'
+USERDATA_ENCODING='base64'
+USER_DATA='I2Nsb3VkLWNvbmZpZwpydW5jbWQ6CiAgLSBlY2hvICdoZWxsbyB3b3JsZCcK'
+VMID='23'
@@ -0,0 +1,23 @@
+# Values quoted by hand or by older OpenNebula releases
+PLAIN=value
+EMPTY=
+SINGLE='it'\''s a "quoted" $value'
+DOUBLE="it's a \"quoted\" \$value with \\ and \n"
+DOLLAR_END="price: 5$"
+MIXED=one'two'"three"four
+ESCAPED=back\ slash\;semi\$dollar
+CONTINUED="first \
+second"
+GLOB=*.example.com
+HASH=a#b
+export EXPORTED='yes'
+export ONE=1 TWO='2'
+A=1; B=2;C=3
+TRAILING='x' # comment
+	INDENTED='tab'
+MULTILINE="line 1
+line 2
+
+line 4
+"
+SECONDS=10
@@ -249,6 +249,19 @@ class TestParseCILogLine:
             [mock.call("2016-08-30 21:53:25.972325+00:00")]
         )
 
+    def test_parse_logline_returns_duration_for_finish_events(self):
+        """parse_ci_logline extracts the duration reported by the event."""
+        line = (
+            "2016-09-12 14:39:20,839 - handlers.py[DEBUG]: finish:"
+            " status/import-cloudinit.stages: SUCCESS: importing"
+            " cloudinit.stages (duration: 0.251s)"
+        )
+        event = parse_ci_logline(line)
+        assert event
+        assert "importing cloudinit.stages" == event["description"]
+        assert "SUCCESS" == event["result"]
+        assert 0.251 == event["duration"]
+
     def test_parse_logline_returns_event_for_amazon_linux_2_line(self):
         line = (
             "Apr 30 19:39:11 cloud-init[2673]: handlers.py[DEBUG]: start:"
@@ -2,7 +2,7 @@ from collections import namedtuple
 
 import pytest
 
-from cloudinit.analyze import analyze_show
+from cloudinit.analyze import analyze_show, dump, show
 
 
 @pytest.fixture
@@ -22,3 +22,28 @@ class TestAnalyzeShow:
         with pytest.raises(SystemExit):
             analyze_show("dontcare", mock_io)
         assert capsys.readouterr().err == f"Empty file {mock_io.infile}\n"
+
+    def test_reported_durations_are_shown(self):
+        """Event durations are preferred over log timestamp deltas"""
+        events, _ = dump.dump_events(
+            rawdata=(
+                "2016-09-12 14:39:20,839 - handlers.py[DEBUG]: start: status:"
+                " running 'cloud-init status'\n"
+                "2016-09-12 14:39:20,840 - handlers.py[DEBUG]: start:"
+                " status/import-cloudinit.stages: importing"
+                " cloudinit.stages\n"
+                "2016-09-12 14:39:20,840 - handlers.py[DEBUG]: finish:"
+                " status/import-cloudinit.stages: SUCCESS: importing"
+                " cloudinit.stages (duration: 0.251s)\n"
+                "2016-09-12 14:39:20,841 - handlers.py[DEBUG]: finish:"
+                " status: SUCCESS: running 'cloud-init status'"
+                " (duration: 0.302s)\n"
+            )
+        )
+        (records,) = show.generate_records(events, "%I%D @%Es +%ds")
+        assert [
+            "Starting stage: status",
+            "|`->importing cloudinit.stages @00.00100s +00.25100s",
+            "Finished stage: (status) 00.30200 seconds\n",
+            "Total Time: 0.30200 seconds\n",
+        ] == records
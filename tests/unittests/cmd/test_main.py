@@ -45,7 +45,7 @@ class TestMain:
         mocker.patch("cloudinit.cmd.main.os.getppid", return_value=42)
         mocker.patch("cloudinit.cmd.main.close_stdin")
         mocker.patch(
-            "cloudinit.cmd.main.netinfo.debug_info",
+            "cloudinit.netinfo.debug_info",
             return_value="my net debug info",
         )
         mocker.patch(
@@ -169,7 +169,7 @@ class TestMain:
             assert "set_hostname" == name
 
         m_hostname = mocker.patch(
-            "cloudinit.cmd.main.cc_set_hostname.handle",
+            "cloudinit.config.cc_set_hostname.handle",
             side_effect=set_hostname,
         )
         main.main_init("init", cmdargs)
@@ -3,6 +3,7 @@
 
 import importlib
 import inspect
+import json
 import logging
 from pathlib import Path
 from typing import List
@@ -11,7 +12,15 @@ from unittest import mock
 import pytest
 
 from cloudinit import util
-from cloudinit.config.modules import ModuleDetails, Modules, _is_active
+from cloudinit.config.modules import (
+    MODULE_INDEX_VERSION,
+    LazyModule,
+    ModuleDetails,
+    Modules,
+    _is_active,
+    generate_module_index,
+    read_module_index,
+)
 from cloudinit.config.schema import MetaSchema
 from cloudinit.distros import ALL_DISTROS
 from cloudinit.settings import FREQUENCIES
@@ -221,3 +230,80 @@ class TestModules:
             "Config modules with a `log` parameter is deprecated in 23.2"
             in caplog.text
         )
+
+
+class TestModuleIndex:
+    @pytest.fixture
+    def module_index(self, tmp_path, mocker):
+        """Write a generated module index and point Modules at it."""
+        index_file = tmp_path / "module_index.json"
+        index_file.write_text(json.dumps(generate_module_index()))
+        read_module_index.cache_clear()
+        mocker.patch(
+            M_PATH + "read_module_index",
+            side_effect=lambda: read_module_index(str(index_file)),
+        )
+        yield index_file
+        read_module_index.cache_clear()
+
+    def test_generate_module_index_matches_module_meta(self):
+        index = generate_module_index()
+        assert MODULE_INDEX_VERSION == index["version"]
+        assert sorted(get_module_names()) == sorted(index["modules"])
+        for mod_name, meta in index["modules"].items():
+            module = importlib.import_module(f"cloudinit.config.{mod_name}")
+            assert module.meta["frequency"] == meta["frequency"]
+            assert module.meta["distros"] == meta["distros"]
+            assert module.meta.get("activate_by_schema_keys", []) == (
+                meta["activate_by_schema_keys"]
+            )
+
+    @pytest.mark.parametrize(
+        "content", ("", "{", '{"version": 0, "modules": {"cc_x": {}}}')
+    )
+    def test_read_module_index_ignores_invalid_index(self, content, tmp_path):
+        index_file = tmp_path / "module_index.json"
+        index_file.write_text(content)
+        assert {} == read_module_index.__wrapped__(str(index_file))
+
+    def test_read_module_index_absent(self, tmp_path):
+        assert {} == read_module_index.__wrapped__(str(tmp_path / "nope"))
+
+    def test_fixup_modules_defers_import_with_index(
+        self, module_index, mocker
+    ):
+        m_import = mocker.patch(
+            M_PATH + "importer.import_module",
+            wraps=importlib.import_module,
+        )
+        mods = Modules(init=mock.Mock(), cfg_files=mock.Mock())
+        (details,) = mods._fixup_modules([{"mod": "ntp", "freq": "once"}])
+        assert isinstance(details.module, LazyModule)
+        assert "once" == details.frequency
+        assert 0 == m_import.call_count
+        assert callable(details.module.handle)
+        assert [
+            mock.call("cloudinit.config.cc_ntp")
+        ] == m_import.call_args_list
+
+    def test_run_section_skips_inactive_modules_without_import(
+        self, module_index, mocker
+    ):
+        m_import = mocker.patch(M_PATH + "importer.import_module")
+        mods = Modules(
+            init=mock.Mock(), cfg_files=mock.Mock(), reporter=mock.Mock()
+        )
+        mods.init.distro.name = "ubuntu"
+        mods._cached_cfg = {"cloud_config_modules": ["ntp", "ansible"]}
+        m_run_modules = mocker.patch.object(mods, "_run_modules")
+        mods.run_section("cloud_config_modules")
+        assert [mock.call([])] == m_run_modules.call_args_list
+        assert 0 == m_import.call_count
+
+    def test_top_level_module_takes_precedence_over_index(
+        self, module_index, mocker
+    ):
+        mocker.patch(
+            M_PATH + "importlib.util.find_spec", return_value=mock.Mock()
+        )
+        assert Modules._lazy_module("cc_ntp") is None
@@ -20,9 +20,13 @@ import yaml
 
 from cloudinit import features, performance
 from cloudinit.config.schema import (
+    SchemaDeprecationError,
     SchemaProblem,
     SchemaType,
     SchemaValidationError,
+    _create_validator,
+    _get_instance_schema,
+    _get_validator,
     annotated_cloudconfig_file,
     get_jsonschema_validator,
     get_meta_doc,
@@ -290,6 +294,108 @@ class TestGetSchema:
         # legacy schema attributes defined within the cc_module.
         assert [] == sorted(legacy_schema_keys)
 
+    def test_get_schema_is_cached_until_file_changes(self, tmp_path, mocker):
+        """Schema files are only parsed again once they change on disk."""
+        mocker.patch(M_PATH + "get_schema_dir", return_value=str(tmp_path))
+        schema_file = tmp_path / "schema-cloud-config-v1.json"
+        schema_file.write_text('{"properties": {"p1": {"type": "string"}}}')
+        m_load = mocker.patch(M_PATH + "load_text_file", wraps=load_text_file)
+        schema = get_schema()
+        assert schema is get_schema()
+        assert 1 == m_load.call_count
+        schema_file.write_text('{"properties": {"p2": {"type": "string"}}}')
+        assert {"properties": {"p2": {"type": "string"}}} == get_schema()
+        assert 2 == m_load.call_count
+
+    @skipUnlessJsonSchema()
+    def test_validators_are_cached_for_loaded_schemas(self):
+        """Validators are reused for schemas returned by get_schema."""
+        schema = get_schema()
+        validator = _get_validator(schema, strict_metaschema=True)
+        assert validator is _get_validator(schema, strict_metaschema=True)
+        assert validator is not _get_validator(schema, strict_metaschema=False)
+        adhoc = {"properties": {"p1": {"type": "string"}}}
+        assert _get_validator(adhoc, False) is not _get_validator(adhoc, False)
+
+
+class TestGetInstanceSchema:
+    def test_only_refs_for_present_keys_are_kept(self):
+        """allOf $refs describing absent top-level keys are dropped."""
+        schema = get_schema()
+        instance_schema = _get_instance_schema(
+            schema, {"runcmd": ["ls"], "packages": ["vim"]}
+        )
+        assert schema["$defs"] is instance_schema["$defs"]
+        assert [
+            {"$ref": "#/$defs/cc_package_update_upgrade_install"},
+            {"$ref": "#/$defs/cc_runcmd"},
+        ] == instance_schema["allOf"]
+
+    @pytest.mark.parametrize(
+        "subschema",
+        (
+            pytest.param({"required": ["a"]}, id="required"),
+            pytest.param({"type": "string"}, id="non_object_type"),
+            pytest.param(
+                {"additionalProperties": False}, id="additional_properties"
+            ),
+        ),
+    )
+    def test_constraining_refs_are_kept(self, subschema):
+        """allOf $refs which may fail regardless of keys are kept."""
+        schema = {
+            "$defs": {"constrained": subschema, "unused": {"properties": {}}},
+            "allOf": [
+                {"$ref": "#/$defs/constrained"},
+                {"$ref": "#/$defs/unused"},
+            ],
+        }
+        assert [{"$ref": "#/$defs/constrained"}] == _get_instance_schema(
+            schema, {}
+        )["allOf"]
+
+    def test_non_dict_config_uses_full_schema(self):
+        schema = get_schema()
+        assert schema is _get_instance_schema(schema, ["runcmd"])
+
+    @skipUnlessJsonSchema()
+    @pytest.mark.parametrize(
+        "config",
+        (
+            {"runcmd": "ls", "bogus": 1},
+            {"packages": [1], "users": [{"name": 2}]},
+            {"apt_update": True, "write_files": [{"content": "x"}]},
+        ),
+    )
+    def test_problems_match_full_schema_validation(self, config):
+        """Validating only present keys reports the same problems."""
+        schema = get_schema()
+        validator = _get_validator(schema, strict_metaschema=False)
+        with pytest.raises(SchemaValidationError) as exc_info:
+            validate_cloudconfig_schema(config, strict=True)
+        expected = sorted(
+            e.message
+            for e in validator.iter_errors(config)
+            if not isinstance(e, SchemaDeprecationError)
+        )
+        assert expected == sorted(
+            problem.message for problem in exc_info.value.schema_errors
+        )
+
+    @skipUnlessJsonSchema()
+    def test_reduced_validators_are_cached_by_present_modules(self, mocker):
+        """Configs with keys of the same modules share a validator."""
+        mocker.patch.dict(M_PATH + "_SCHEMA_CACHE", clear=True)
+        m_create = mocker.patch(
+            M_PATH + "_create_validator", wraps=_create_validator
+        )
+        validate_cloudconfig_schema({"runcmd": ["ls"], "packages": ["vim"]})
+        created = m_create.call_count
+        validate_cloudconfig_schema({"packages": ["git"], "runcmd": ["id"]})
+        assert created == m_create.call_count
+        validate_cloudconfig_schema({"runcmd": ["ls"]})
+        assert created + 1 == m_create.call_count
+
 
 MODULE_DATA_YAML_TMPL = """\
 {mod_id}:
@@ -13,7 +13,10 @@ from cloudinit import (
     distros,
     helpers,
     lifecycle,
+    net,
+    subp,
     temp_utils,
+    url_helper,
 )
 from cloudinit import user_data as ud
 from cloudinit import (
@@ -21,6 +24,7 @@ from cloudinit import (
 )
 from cloudinit.gpg import GPG
 from cloudinit.log import loggers
+from cloudinit.net.netlink import NetlinkCreateSocketError
 from tests.unittests.helpers import (
     example_netdev,
     rebase_path,
@@ -169,6 +173,17 @@ def disable_sysfs_net(tmpdir_factory):
         yield mock_sysfs
 
 
+@pytest.fixture(scope="session", autouse=True)
+def disable_rtnetlink():
+    """Avoid tests which query or change the host's interfaces over
+    rtnetlink, falling back to the mocked ip commands instead."""
+    with mock.patch(
+        "cloudinit.net.netlink.create_rtnetlink_socket",
+        side_effect=NetlinkCreateSocketError("rtnetlink disabled in tests"),
+    ):
+        yield
+
+
 @pytest.fixture(scope="class")
 def disable_netdev_info(request):
     """Avoid tests which read the underlying host's /syc/class/net."""
@@ -193,6 +208,36 @@ def disable_dns_lookup(request):
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_url_session_pool():
+    """Avoid sharing pooled readurl sessions between tests."""
+    url_helper.close_session_pool()
+    yield
+    url_helper.close_session_pool()
+
+
+@pytest.fixture(autouse=True)
+def disable_probe_cache():
+    """Avoid replaying cached subprocess probe results between tests."""
+    yield
+    subp.probe_cache.disable()
+
+
+@pytest.fixture(autouse=True)
+def disable_net_topology_cache():
+    """Avoid answering sysfs net queries from another test's snapshot."""
+    yield
+    net.topology.disable()
+
+
+@pytest.fixture(autouse=True)
+def reset_block_devices():
+    """Avoid answering find_devs_with from another test's blkid scan."""
+    util.block_devices.invalidate()
+    yield
+    util.block_devices.invalidate()
+
+
 @pytest.fixture()
 def dhclient_exists():
     with mock.patch(
@@ -7,7 +7,7 @@ import pytest
 
 from cloudinit import distros, util
 from cloudinit.distros.ubuntu import Distro
-from cloudinit.net.dhcp import Dhcpcd, IscDhclient, Udhcpc
+from cloudinit.net.dhcp import BuiltinDhcpClient, Dhcpcd, IscDhclient, Udhcpc
 
 M_PATH = "cloudinit.distros."
 
@@ -586,6 +586,18 @@ class TestDistro:
             [False, False, True, True],
             id="second_client_is_found_from_config_dhcpcd",
         ),
+        pytest.param(
+            BuiltinDhcpClient,
+            {"network": {"dhcp_client_priority": ["builtin", "dhclient"]}},
+            None,
+            id="builtin_client_is_found_from_config",
+        ),
+        pytest.param(
+            BuiltinDhcpClient,
+            {"network": {"dhcp_client_priority": ["dhclient", "builtin"]}},
+            [False, False],
+            id="builtin_client_is_fallback_from_config",
+        ),
     ],
 )
 class TestDHCP:
@@ -579,6 +579,107 @@ class TestNetCfgDistroUbuntuEni:
         )
 
 
+@pytest.mark.usefixtures("fake_filesystem")
+class TestNetworkFingerprint:
+    @pytest.fixture
+    def distro(self, distro_eni, mocker):
+        """An eni distro with an instance dir, counting renders and
+        bring ups."""
+        util.ensure_dir("/var/lib/cloud/instances/i-1234")
+        util.sym_link(
+            "/var/lib/cloud/instances/i-1234", "/var/lib/cloud/instance"
+        )
+        mocker.patch("cloudinit.net.eni.available", return_value=True)
+        mocker.patch.object(
+            distro_eni,
+            "_write_network_state",
+            wraps=distro_eni._write_network_state,
+        )
+        mocker.patch("cloudinit.net.activators.select_activator")
+        return distro_eni
+
+    def applied(self, distro):
+        return (
+            distro._write_network_state.call_count,
+            distro.network_activator.bring_up_all_interfaces.call_count,
+        )
+
+    def test_unchanged_config_is_not_rendered_or_brought_up(self, distro):
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.apply_network_config(V1_NET_CFG, bring_up=False)
+        assert (1, 1) == self.applied(distro)
+        fingerprint = util.load_json(
+            util.load_text_file(
+                "/var/lib/cloud/instances/i-1234/network-fingerprint.json"
+            )
+        )
+        assert "cloudinit.net.eni" == fingerprint["renderer"]
+        assert fingerprint["brought_up"] is True
+
+    def test_rendered_config_is_brought_up_once(self, distro):
+        """A config rendered without bringing up is only brought up."""
+        distro.apply_network_config(V1_NET_CFG, bring_up=False)
+        assert (1, 0) == self.applied(distro)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (1, 1) == self.applied(distro)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (1, 1) == self.applied(distro)
+
+    def test_failed_bring_up_is_retried(self, distro):
+        bring_up = distro.network_activator.bring_up_all_interfaces
+        bring_up.return_value = False
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (1, 1) == self.applied(distro)
+        bring_up.return_value = True
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (1, 2) == self.applied(distro)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (1, 2) == self.applied(distro)
+
+    def test_changed_config_is_rendered(self, distro):
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.apply_network_config(V1_NET_CFG_IPV6, bring_up=True)
+        assert (2, 2) == self.applied(distro)
+
+    @pytest.mark.parametrize("remove", [True, False])
+    def test_modified_output_is_rendered(self, distro, remove):
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        if remove:
+            util.del_file("/etc/network/interfaces.d/50-cloud-init.cfg")
+        else:
+            util.write_file(
+                "/etc/network/interfaces.d/50-cloud-init.cfg", "edited"
+            )
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (2, 2) == self.applied(distro)
+        assert V1_NET_CFG_OUTPUT == util.load_text_file(
+            "/etc/network/interfaces.d/50-cloud-init.cfg"
+        )
+
+    def test_upgrade_is_rendered(self, distro, mocker):
+        """A new cloud-init version may render the same state differently."""
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        mocker.patch(
+            "cloudinit.distros.version.version_string", return_value="99.1"
+        )
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (2, 2) == self.applied(distro)
+
+    def test_changed_renderer_config_is_rendered(self, distro):
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.renderer_configs = {"eni": {"eni_header": "# changed\n"}}
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (2, 2) == self.applied(distro)
+
+    def test_config_is_rendered_without_instance_dir(self, distro):
+        util.del_file("/var/lib/cloud/instance")
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        distro.apply_network_config(V1_NET_CFG, bring_up=True)
+        assert (2, 2) == self.applied(distro)
+
+
 @pytest.fixture
 def distro_netplan():
     return get_distro("ubuntu", renderers=["netplan"])
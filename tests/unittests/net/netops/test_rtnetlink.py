@@ -0,0 +1,165 @@
+import errno
+import socket
+from unittest import mock
+
+import pytest
+
+from cloudinit.net import netlink
+from cloudinit.net.netops import rtnetlink
+from cloudinit.subp import SubpResult
+
+M_PATH = "cloudinit.net.netops.rtnetlink."
+
+
+@pytest.fixture
+def m_client(mocker):
+    mocker.patch(M_PATH + "socket.if_nametoindex", return_value=2)
+    client = mock.MagicMock(spec=netlink.RtnetlinkClient)
+    client.__enter__.return_value = client
+    mocker.patch(M_PATH + "netlink.RtnetlinkClient", return_value=client)
+    return client
+
+
+@mock.patch(
+    M_PATH + "subp.subp", side_effect=AssertionError("Unexpected subp call")
+)
+class TestRtnetlink:
+    def test_link_up(self, _m_subp, m_client):
+        assert SubpResult("", "") == rtnetlink.Rtnetlink.link_up(
+            "eth0", family="inet"
+        )
+        m_client.transact.assert_called_once_with(
+            [netlink.link_request(2, True)]
+        )
+
+    def test_link_down(self, _m_subp, m_client):
+        rtnetlink.Rtnetlink.link_down("eth0")
+        m_client.transact.assert_called_once_with(
+            [netlink.link_request(2, False)]
+        )
+
+    def test_add_addr(self, _m_subp, m_client):
+        rtnetlink.Rtnetlink.add_addr("eth0", "10.0.17.2/24", "10.0.17.255")
+        m_client.transact.assert_called_once_with(
+            [
+                netlink.address_request(
+                    netlink.RTM_NEWADDR, 2, "10.0.17.2", 24, "10.0.17.255"
+                )
+            ]
+        )
+
+    def test_del_addr_without_prefix(self, _m_subp, m_client):
+        """Like ip, an address without a prefix length is a /32."""
+        rtnetlink.Rtnetlink.del_addr("eth0", "10.0.8.3")
+        m_client.transact.assert_called_once_with(
+            [netlink.address_request(netlink.RTM_DELADDR, 2, "10.0.8.3", 32)]
+        )
+
+    @pytest.mark.parametrize(
+        "method, args, kwargs, expected",
+        [
+            pytest.param(
+                "add_route",
+                ("eth0", "default"),
+                {"gateway": "10.0.0.1"},
+                netlink.route_request(
+                    netlink.RTM_NEWROUTE,
+                    netlink.NLM_F_CREATE | netlink.NLM_F_REPLACE,
+                    2,
+                    "0.0.0.0",
+                    0,
+                    gateway="10.0.0.1",
+                ),
+                id="add_default_route",
+            ),
+            pytest.param(
+                "add_route",
+                ("eth0", "10.0.0.1"),
+                {"source_address": "10.0.0.2"},
+                netlink.route_request(
+                    netlink.RTM_NEWROUTE,
+                    netlink.NLM_F_CREATE | netlink.NLM_F_REPLACE,
+                    2,
+                    "10.0.0.1",
+                    32,
+                    source_address="10.0.0.2",
+                ),
+                id="add_router_route",
+            ),
+            pytest.param(
+                "append_route",
+                ("eth0", "169.254.169.254/32", "0.0.0.0"),
+                {},
+                netlink.route_request(
+                    netlink.RTM_NEWROUTE,
+                    netlink.NLM_F_CREATE | netlink.NLM_F_APPEND,
+                    2,
+                    "169.254.169.254",
+                    32,
+                ),
+                id="append_on_link_route",
+            ),
+            pytest.param(
+                "del_route",
+                ("eth0", "10.1.0.0/16"),
+                {"gateway": "10.0.0.1"},
+                netlink.route_request(
+                    netlink.RTM_DELROUTE,
+                    0,
+                    2,
+                    "10.1.0.0",
+                    16,
+                    gateway="10.0.0.1",
+                ),
+                id="del_route",
+            ),
+        ],
+    )
+    def test_routes(self, _m_subp, method, args, kwargs, expected, m_client):
+        getattr(rtnetlink.Rtnetlink, method)(*args, **kwargs)
+        m_client.transact.assert_called_once_with([expected])
+
+    def test_get_default_route(self, _m_subp, m_client, mocker):
+        mocker.patch(M_PATH + "socket.if_indextoname", return_value="eth0")
+        route = netlink.NetlinkRoute(
+            socket.AF_INET, 0, 254, 1, None, "10.0.0.1", 2, 100, 0
+        )
+        subnet = route._replace(dst="10.0.0.0", dst_len=24, gateway=None)
+        m_client.get_routes.return_value = [route, subnet]
+        assert (
+            "default via 10.0.0.1 dev eth0 metric 100\n"
+            == rtnetlink.Rtnetlink.get_default_route()
+        )
+
+
+class TestRtnetlinkFallback:
+    @mock.patch(M_PATH + "subp.subp")
+    def test_falls_back_to_ip_without_rtnetlink(self, m_subp):
+        """Without an rtnetlink socket the ip command is run instead."""
+        rtnetlink.Rtnetlink.add_addr("eth0", "10.0.17.2/24")
+        assert [
+            mock.call(
+                [
+                    "ip",
+                    "-family",
+                    "inet",
+                    "addr",
+                    "add",
+                    "10.0.17.2/24",
+                    "dev",
+                    "eth0",
+                ],
+            )
+        ] == m_subp.call_args_list
+
+    @mock.patch(M_PATH + "subp.subp")
+    def test_falls_back_to_ip_when_request_rejected(self, m_subp, m_client):
+        """ip reports the error of a rejected request, e.g. File exists."""
+        m_client.transact.side_effect = netlink.NetlinkRequestError(
+            "File exists", errno.EEXIST
+        )
+        rtnetlink.Rtnetlink.link_up("eth0")
+        m_client.transact.assert_called_once()
+        assert [
+            mock.call(["ip", "link", "set", "dev", "eth0", "up"])
+        ] == m_subp.call_args_list
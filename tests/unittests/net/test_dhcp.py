@@ -3,6 +3,7 @@
 import os
 import signal
 import socket
+import struct
 import subprocess
 from textwrap import dedent
 
@@ -13,6 +14,7 @@ from cloudinit.distros import alpine, amazon, centos, debian, freebsd, rhel
 from cloudinit.distros.ubuntu import Distro
 from cloudinit.net.dhcp import (
     DHCLIENT_FALLBACK_LEASE_DIR,
+    BuiltinDhcpClient,
     Dhcpcd,
     InvalidDHCPLeaseFileError,
     IscDhclient,
@@ -1270,6 +1272,11 @@ class TestDhcpcd:
             lease, 245
         )
 
+    def test_parse_raw_lease_skips_pad_and_end(self):
+        packet = b"\0" * 240 + b"\x00\x00\x35\x01\x05\xff\xf5\x01\x01"
+        assert b"\x05" == Dhcpcd.parse_unknown_options_from_packet(packet, 53)
+        assert Dhcpcd.parse_unknown_options_from_packet(packet, 245) is None
+
     def test_parse_classless_static_routes(self):
         lease = dedent(
             """
@@ -1389,6 +1396,262 @@ class TestDhcpcd:
         )
 
 
+MAC = "52:54:00:12:34:56"
+SERVER = "10.0.0.1"
+ACK_OPTIONS = [
+    (1, socket.inet_aton("255.255.255.0")),
+    (3, socket.inet_aton(SERVER) + socket.inet_aton("10.0.0.254")),
+    (6, socket.inet_aton("10.0.0.2") + socket.inet_aton("10.0.0.3")),
+    (15, b"example.internal"),
+    (51, struct.pack("!I", 3600)),
+    (121, bytes([0, 10, 0, 0, 1, 32, 168, 63, 129, 16, 10, 0, 0, 1])),
+    (245, socket.inet_aton("168.63.129.16")),
+    (252, b"\x01\x0a"),
+]
+
+
+def dhcp_reply(request, message_type, options=(), yiaddr="10.0.0.4"):
+    """Return the server's reply to a client request as an IPv4 packet."""
+    payload = (
+        bytes([2, 1, 6, 0])
+        + request[4:16]
+        + socket.inet_aton(yiaddr)
+        + request[20:236]
+        + b"\x63\x82\x53\x63\x00"  # magic cookie and a pad option
+        + b"".join(
+            bytes([code, len(value)]) + value
+            for code, value in [
+                (53, bytes([message_type])),
+                (54, socket.inet_aton(SERVER)),
+                *options,
+            ]
+        )
+        + b"\xff"
+    )
+    udp = struct.pack("!HHHH", 67, 68, 8 + len(payload), 0) + payload
+    return (
+        struct.pack(
+            "!BBHHHBBH4s4s",
+            0x45,
+            0,
+            20 + len(udp),
+            0,
+            0,
+            64,
+            socket.IPPROTO_UDP,
+            0,
+            socket.inet_aton(SERVER),
+            socket.inet_aton("255.255.255.255"),
+        )
+        + udp
+    )
+
+
+class FakeDhcpServer:
+    """An AF_PACKET socket answered by a DHCP server.
+
+    Each sent request is answered by the replies returned from respond.
+    An exception in the replies is raised when it is received.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.sent = []
+        self.replies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        pass
+
+    def bind(self, address):
+        self.address = address
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendto(self, frame, address):
+        assert ("eth9", 0x0800, 0, 0, b"\xff" * 6) == address
+        request = frame[28:]
+        self.sent.append(request)
+        self.replies.extend(self.respond(request))
+
+    def recv(self, size):
+        if not self.replies:
+            raise socket.timeout()
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def message_type(request):
+    return BuiltinDhcpClient.parse_dhcp_options(request)[53][0]
+
+
+def answer(request):
+    if message_type(request) == 1:
+        return [dhcp_reply(request, 2)]
+    return [dhcp_reply(request, 5, ACK_OPTIONS)]
+
+
+class TestBuiltinDhcpClient:
+    @pytest.fixture
+    def server(self, mocker):
+        mocker.patch("cloudinit.net.dhcp.is_ib_interface", return_value=False)
+        mocker.patch("cloudinit.net.dhcp.get_interface_mac", return_value=MAC)
+
+        def _server(respond=answer):
+            fake = FakeDhcpServer(respond)
+            mocker.patch("cloudinit.net.dhcp.socket.socket", return_value=fake)
+            return fake
+
+        return _server
+
+    def test_dhcp_discovery(self, server):
+        """A DISCOVER/OFFER/REQUEST/ACK exchange returns the lease."""
+        fake = server()
+        distro = mock.Mock()
+        dhcp_log_func = mock.Mock()
+        client = BuiltinDhcpClient()
+        lease = client.dhcp_discovery(
+            "eth9", dhcp_log_func=dhcp_log_func, distro=distro
+        )
+        assert {
+            "interface": "eth9",
+            "fixed-address": "10.0.0.4",
+            "dhcp-message-type": "5",
+            "dhcp-server-identifier": SERVER,
+            "subnet-mask": "255.255.255.0",
+            "routers": SERVER,
+            "domain-name-servers": "10.0.0.2,10.0.0.3",
+            "domain-name": "example.internal",
+            "dhcp-lease-time": "3600",
+            "static_routes": "0.0.0.0/0 10.0.0.1 168.63.129.16/32 10.0.0.1",
+            "unknown-245": "168.63.129.16",
+            "unknown-252": "1:a",
+        } == lease
+        assert lease == client.get_newest_lease("eth9")
+        distro.net_ops.link_up.assert_called_once_with("eth9")
+        assert ("eth9", 0x0800) == fake.address
+
+        discover, request = fake.sent
+        assert discover[4:8] == request[4:8]
+        assert bytes.fromhex(MAC.replace(":", "")) == discover[28:34]
+        assert 1 == message_type(discover)
+        options = BuiltinDhcpClient.parse_dhcp_options(request)
+        assert 3 == options[53][0]
+        assert socket.inet_aton("10.0.0.4") == options[50]
+        assert socket.inet_aton(SERVER) == options[54]
+        assert 121 in options[55]
+        dhcp_log_func.assert_called_once_with(
+            "eth9",
+            "DHCPDISCOVER on eth9\n"
+            "DHCPOFFER of 10.0.0.4 from 10.0.0.1\n"
+            "DHCPREQUEST for 10.0.0.4 on eth9\n"
+            "DHCPACK of 10.0.0.4 from 10.0.0.1",
+            "",
+        )
+
+    def test_dhcp_discovery_ignores_other_packets(self, server):
+        """Replies to other transactions and non-DHCP traffic are skipped."""
+
+        def respond(request):
+            other = bytearray(dhcp_reply(request, 5, ACK_OPTIONS))
+            other[32] ^= 0xFF  # a different xid
+            own_request = struct.pack("!HHHH", 68, 67, 8, 0)
+            return [
+                b"\x45" + b"\0" * 8 + b"\x06" + b"\0" * 18,  # tcp
+                bytes(other),
+                dhcp_reply(request, 2, yiaddr="10.0.0.9")[:20] + own_request,
+            ] + answer(request)
+
+        server(respond)
+        lease = BuiltinDhcpClient().dhcp_discovery("eth9", distro=mock.Mock())
+        assert "10.0.0.4" == lease["fixed-address"]
+
+    def test_dhcp_discovery_retransmits(self, server):
+        """Requests are resent when no reply arrives before the backoff."""
+        dropped = set()
+
+        def respond(request):
+            if message_type(request) not in dropped:
+                dropped.add(message_type(request))
+                return []
+            return answer(request)
+
+        fake = server(respond)
+        BuiltinDhcpClient().dhcp_discovery("eth9", distro=mock.Mock())
+        assert [1, 1, 3, 3] == [message_type(r) for r in fake.sent]
+
+    def test_dhcp_discovery_nak(self, server):
+        def respond(request):
+            if message_type(request) == 1:
+                return [dhcp_reply(request, 2)]
+            return [dhcp_reply(request, 6)]
+
+        server(respond)
+        client = BuiltinDhcpClient()
+        with pytest.raises(NoDHCPLeaseError, match="DHCPNAK"):
+            client.dhcp_discovery("eth9", distro=mock.Mock())
+        with pytest.raises(NoDHCPLeaseError):
+            client.get_newest_lease("eth9")
+
+    def test_dhcp_discovery_timeout(self, server, mocker):
+        fake = server(lambda request: [])
+        mocker.patch(
+            "cloudinit.net.dhcp.time.monotonic", side_effect=[0, 0, 1, 1, 10]
+        )
+        with pytest.raises(NoDHCPLeaseError, match="No DHCP reply"):
+            BuiltinDhcpClient().dhcp_discovery("eth9", distro=mock.Mock())
+        assert 1 == len(fake.sent)
+
+    def test_dhcp_discovery_socket_error(self, server, mocker):
+        mocker.patch(
+            "cloudinit.net.dhcp.socket.socket",
+            side_effect=PermissionError("Operation not permitted"),
+        )
+        with pytest.raises(NoDHCPLeaseError):
+            BuiltinDhcpClient().dhcp_discovery("eth9", distro=mock.Mock())
+
+    def test_dhcp_discovery_ib(self, server, mocker):
+        mocker.patch("cloudinit.net.dhcp.is_ib_interface", return_value=True)
+        distro = mock.Mock()
+        with pytest.raises(NoDHCPLeaseError, match="Infiniband"):
+            BuiltinDhcpClient().dhcp_discovery("ib0", distro=distro)
+        distro.net_ops.link_up.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        (
+            pytest.param(
+                bytes([24, 192, 168, 2, 0, 0, 0, 0, 0, 10, 0, 0, 1]),
+                "192.168.2.0/24 0.0.0.0 0.0.0.0/0 10.0.0.1",
+                id="on_link_and_default",
+            ),
+            pytest.param(
+                bytes([32, 169, 254, 169, 254, 10, 0, 0, 1, 33, 10]),
+                "169.254.169.254/32 10.0.0.1",
+                id="invalid_width_stops_parsing",
+            ),
+            pytest.param(
+                bytes([16, 172, 16, 10, 0]),
+                "",
+                id="truncated_gateway",
+            ),
+        ),
+    )
+    def test_parse_classless_static_routes(self, value, expected):
+        assert expected == BuiltinDhcpClient.parse_classless_static_routes(
+            value
+        )
+        assert [
+            tuple(pair)
+            for pair in zip(expected.split()[::2], expected.split()[1::2])
+        ] == BuiltinDhcpClient.parse_static_routes(expected)
+
+
 class TestMaybePerformDhcpDiscovery:
     def test_none_and_missing_fallback(self):
         with pytest.raises(NoDHCPLeaseInterfaceError):
@@ -806,6 +806,156 @@ class TestInterfaceHasOwnMAC:
             net.interface_has_own_mac("eth1", strict=True)
 
 
+@mock.patch(
+    "cloudinit.net.is_openvswitch_internal_interface",
+    mock.Mock(return_value=False),
+)
+class TestNetTopologySnapshot:
+    @pytest.fixture(autouse=True)
+    def fixtures(self, mocker, tmp_path):
+        self.sysdir = str(tmp_path / "class" / "net") + "/"
+        mocker.patch(
+            "cloudinit.net.get_sys_class_path", return_value=self.sysdir
+        )
+        mocker.patch.object(net, "topology", net.NetTopologyCache())
+        drivers = tmp_path / "drivers"
+        (drivers / "virtio_net").mkdir(parents=True)
+        for name, mac in (("eth0", "aa:bb:cc:00:00:01"), ("eth1", None)):
+            write_file(os.path.join(self.sysdir, name, "operstate"), "up")
+            write_file(os.path.join(self.sysdir, name, "carrier"), "1")
+            write_file(
+                os.path.join(self.sysdir, name, "addr_assign_type"), "0"
+            )
+            write_file(
+                os.path.join(self.sysdir, name, "device", "device"), "0x0001"
+            )
+            os.symlink(
+                drivers / "virtio_net",
+                os.path.join(self.sysdir, name, "device", "driver"),
+            )
+            if mac:
+                write_file(os.path.join(self.sysdir, name, "address"), mac)
+        ensure_file(os.path.join(self.sysdir, "bond0", "bonding", "mode"))
+        write_file(
+            os.path.join(self.sysdir, "bond0", "address"), "aa:bb:cc:00:00:02"
+        )
+        write_file(
+            os.path.join(self.sysdir, "eth1", "address"), "aa:bb:cc:00:00:02"
+        )
+        write_file(
+            os.path.join(self.sysdir, "eth1", "bonding_slave", "perm_hwaddr"),
+            "AA:BB:CC:00:00:03",
+        )
+        os.symlink(
+            os.path.join(self.sysdir, "bond0"),
+            os.path.join(self.sysdir, "eth1", "master"),
+        )
+
+    def test_indexes(self):
+        snapshot = net.NetTopologySnapshot.read(self.sysdir)
+        assert ["bond0", "eth0", "eth1"] == sorted(snapshot.names())
+        assert ("eth1",) == snapshot.by_mac["aa:bb:cc:00:00:03"]
+        assert ("bond0",) == snapshot.by_mac["aa:bb:cc:00:00:02"]
+        assert ("eth0", "eth1") == tuple(
+            sorted(snapshot.by_driver["virtio_net"])
+        )
+        assert ("eth1",) == snapshot.by_master["bond0"]
+        eth1 = snapshot.by_name["eth1"]
+        assert "bond0" == eth1.master
+        assert "0x0001" == eth1.device_id
+        assert snapshot.by_name["bond0"].is_bond
+        with pytest.raises(TypeError):
+            snapshot.by_name["eth2"] = eth1
+
+    def test_missing_sys_class_net_has_no_devices(self, tmp_path):
+        snapshot = net.NetTopologySnapshot.read(str(tmp_path / "missing"))
+        assert [] == snapshot.names()
+
+    def test_queries_answered_from_one_scan(self):
+        """Repeated interface queries read sysfs once while enabled."""
+        expected = net.get_interfaces()
+        expected_by_mac = net.get_interfaces_by_mac()
+        net.topology.enable()
+        assert expected == net.get_interfaces()
+        assert expected == net.get_interfaces()
+        assert expected_by_mac == net.get_interfaces_by_mac()
+        assert net.master_is_bridge_or_bond("eth1")
+        assert "virtio_net" == net.device_driver("eth0")
+        assert 1 == net.topology.scans
+
+    def test_disabled_cache_reads_sysfs(self):
+        assert net.topology.get() is None
+        net.get_interfaces()
+        assert 0 == net.topology.scans
+        write_file(os.path.join(self.sysdir, "eth0", "operstate"), "down")
+        assert net.is_up("eth0") is False
+
+    def test_invalidate_reads_sysfs_again(self):
+        net.topology.enable()
+        assert not net.is_bridge("eth0")
+        ensure_file(os.path.join(self.sysdir, "eth0", "bridge", "bridge_id"))
+        assert not net.is_bridge("eth0")
+        net.topology.invalidate()
+        assert net.is_bridge("eth0")
+        assert 2 == net.topology.scans
+
+    def test_link_state_is_not_cached(self, mocker):
+        """Bringing a link up is seen without invalidating the snapshot."""
+        mocker.patch("cloudinit.net.subp.subp")
+        operstate = os.path.join(self.sysdir, "eth0", "operstate")
+        carrier = os.path.join(self.sysdir, "eth0", "carrier")
+        net.topology.enable()
+        net.get_devicelist()
+        write_file(operstate, "down")
+        assert net.is_up("eth0") is False
+        write_file(operstate, "up")
+        assert net.is_up("eth0") is True
+        assert 1 == net.topology.scans
+        write_file(operstate, "notpresent")
+        write_file(carrier, "0")
+        assert "eth0" not in net.find_candidate_nics_on_linux()
+        write_file(carrier, "1")
+        assert "eth0" in net.find_candidate_nics_on_linux()
+
+    def test_rename_invalidates_snapshot(self, mocker):
+        mocker.patch("cloudinit.net.subp.subp")
+        net.topology.enable()
+        net.get_devicelist()
+        net._rename_interfaces(
+            [("aa:bb:cc:00:00:01", "ens3", "virtio_net", "0x0001")],
+            current_info={
+                "eth0": {
+                    "downable": True,
+                    "device_id": "0x0001",
+                    "driver": "virtio_net",
+                    "mac": "aa:bb:cc:00:00:01",
+                    "name": "eth0",
+                    "up": False,
+                }
+            },
+        )
+        net.get_devicelist()
+        assert 2 == net.topology.scans
+
+    @pytest.mark.parametrize(
+        "scope, enabled, kept",
+        [
+            pytest.param(None, False, False, id="unset"),
+            pytest.param("invalid", False, False, id="invalid"),
+            pytest.param("stage", True, False, id="stage"),
+            pytest.param("boot", True, True, id="boot"),
+        ],
+    )
+    def test_configure_topology_cache(self, scope, enabled, kept):
+        net.topology.enable()
+        net.topology.get()
+        net.configure_topology_cache(scope)
+        assert enabled is net.topology.enabled
+        if enabled:
+            net.topology.get()
+            assert (1 if kept else 2) == net.topology.scans
+
+
 @mock.patch("cloudinit.net.subp.subp")
 @pytest.mark.usefixtures("disable_netdev_info")
 class TestEphemeralIPV4Network:
@@ -897,6 +1047,20 @@ class TestEphemeralIPV4Network:
             assert expected_setup_calls == m_subp.call_args_list
         m_subp.assert_has_calls(expected_teardown_calls)
 
+    @mock.patch("cloudinit.net.ephemeral.close_session_pool")
+    def test_teardown_closes_url_session_pool(self, m_close, m_subp):
+        """Pooled connections over the ephemeral address are dropped."""
+        params = {
+            "interface": "eth0",
+            "ip": "192.168.2.2",
+            "prefix_or_mask": "255.255.255.0",
+            "broadcast": "192.168.2.255",
+            "interface_addrs_before_dhcp": example_netdev,
+        }
+        with EphemeralIPv4Network(MockDistro(), **params):
+            assert 0 == m_close.call_count
+        assert 1 == m_close.call_count
+
     def test_teardown_on_enter_exception(self, m_subp):
         """Ensure ephemeral teardown happens.
 
@@ -0,0 +1,268 @@
+# This file is part of cloud-init. See LICENSE file for license information.
+
+import errno
+import socket
+import struct
+
+import pytest
+
+from cloudinit.net import netlink
+
+
+def nlmsg(msg_type, seq, payload=b"", flags=0):
+    length = 16 + len(payload)
+    padding = b"\0" * ((4 - length % 4) % 4)
+    return struct.pack("IHHII", length, msg_type, flags, seq, 0) + (
+        payload + padding
+    )
+
+
+def rta(rta_type, data):
+    length = 4 + len(data)
+    padding = b"\0" * ((4 - length % 4) % 4)
+    return struct.pack("HH", length, rta_type) + data + padding
+
+
+def error(seq, code=0):
+    return nlmsg(
+        netlink.NLMSG_ERROR, seq, struct.pack("i", -code) + b"\0" * 16
+    )
+
+
+class FakeSocket:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.sent = []
+        self.closed = False
+
+    def sendto(self, data, address):
+        self.sent.append(data)
+
+    def recv(self, size):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_socket(mocker):
+    def _fake_socket(*replies):
+        sock = FakeSocket(replies)
+        mocker.patch.object(
+            netlink, "create_rtnetlink_socket", return_value=sock
+        )
+        return sock
+
+    return _fake_socket
+
+
+def link(index, ifname, link_type, flags, address):
+    return struct.pack("BHiII", 0, link_type, index, flags, 0) + (
+        rta(netlink.IFLA_IFNAME, ifname + b"\0")
+        + rta(netlink.IFLA_ADDRESS, address)
+    )
+
+
+class TestRtnetlinkClient:
+    def test_get_links_reads_dump_until_done(self, fake_socket):
+        """Replies spanning datagrams are collected and other seqs ignored."""
+        sock = fake_socket(
+            nlmsg(
+                netlink.RTM_NEWLINK, 1, link(1, b"lo", 772, 0x10049, b"\0" * 6)
+            )
+            + nlmsg(
+                netlink.RTM_NEWLINK,
+                1,
+                link(2, b"eth0", 1, 0x11043, b"\x52\x54\x00\x12\x34\x56"),
+            ),
+            nlmsg(netlink.RTM_NEWLINK, 7, link(9, b"x", 1, 0, b""))
+            + nlmsg(netlink.NLMSG_DONE, 1, struct.pack("i", 0)),
+        )
+        with netlink.RtnetlinkClient() as client:
+            links = client.get_links()
+        assert [
+            netlink.NetlinkLink(1, "lo", 772, 0x10049, "00:00:00:00:00:00"),
+            netlink.NetlinkLink(2, "eth0", 1, 0x11043, "52:54:00:12:34:56"),
+        ] == links
+        assert sock.closed
+        _length, msg_type, flags, seq, _pid = struct.unpack_from(
+            "IHHII", sock.sent[0]
+        )
+        assert (netlink.RTM_GETLINK, 0x301, 1) == (msg_type, flags, seq)
+
+    def test_get_addresses(self, fake_socket):
+        v4 = struct.pack("BBBBi", socket.AF_INET, 24, 0, 0, 2) + (
+            rta(netlink.IFA_ADDRESS, socket.inet_aton("10.0.0.2"))
+            + rta(netlink.IFA_LOCAL, socket.inet_aton("10.0.0.2"))
+            + rta(netlink.IFA_BROADCAST, socket.inet_aton("10.0.0.255"))
+        )
+        v6 = struct.pack("BBBBi", socket.AF_INET6, 64, 0, 253, 2) + rta(
+            netlink.IFA_ADDRESS, socket.inet_pton(socket.AF_INET6, "fe80::1")
+        )
+        fake_socket(
+            nlmsg(netlink.RTM_NEWADDR, 1, v4)
+            + nlmsg(netlink.RTM_NEWADDR, 1, v6)
+            + nlmsg(netlink.NLMSG_DONE, 1, struct.pack("i", 0))
+        )
+        with netlink.RtnetlinkClient() as client:
+            addresses = client.get_addresses()
+        assert [
+            netlink.NetlinkAddress(
+                2, socket.AF_INET, 24, 0, "10.0.0.2", "10.0.0.2", "10.0.0.255"
+            ),
+            netlink.NetlinkAddress(
+                2, socket.AF_INET6, 64, 253, "fe80::1", None, None
+            ),
+        ] == addresses
+
+    def test_get_routes(self, fake_socket):
+        """Routes report the table attribute, expiry and the last nexthop."""
+        expiring = struct.pack(
+            "BBBBBBBBI", socket.AF_INET6, 128, 0, 0, 254, 2, 0, 1, 0
+        ) + (
+            rta(netlink.RTA_TABLE, struct.pack("I", 254))
+            + rta(netlink.RTA_DST, socket.inet_pton(socket.AF_INET6, "fd::1"))
+            + rta(netlink.RTA_OIF, struct.pack("I", 2))
+            + rta(netlink.RTA_PRIORITY, struct.pack("I", 256))
+            + rta(
+                netlink.RTA_CACHEINFO, struct.pack("IIi5I", 0, 0, 30, *[0] * 5)
+            )
+        )
+        nexthops = b"".join(
+            struct.pack("HBBi", 28, 0, 0, index)
+            + rta(netlink.RTA_GATEWAY, socket.inet_pton(socket.AF_INET6, gw))
+            for index, gw in ((2, "fe80::1"), (3, "fe80::2"))
+        )
+        multipath = struct.pack(
+            "BBBBBBBBI", socket.AF_INET6, 0, 0, 0, 254, 2, 0, 1, 0
+        ) + rta(netlink.RTA_MULTIPATH, nexthops)
+        fake_socket(
+            nlmsg(netlink.RTM_NEWROUTE, 1, expiring)
+            + nlmsg(netlink.RTM_NEWROUTE, 1, multipath)
+            + nlmsg(netlink.NLMSG_DONE, 1, struct.pack("i", 0))
+        )
+        with netlink.RtnetlinkClient() as client:
+            routes = client.get_routes(socket.AF_INET6)
+        assert [
+            netlink.NetlinkRoute(
+                socket.AF_INET6, 128, 254, 1, "fd::1", None, 2, 256, 30
+            ),
+            netlink.NetlinkRoute(
+                socket.AF_INET6, 0, 254, 1, None, "fe80::2", 3, None, 0
+            ),
+        ] == routes
+
+    @pytest.mark.parametrize(
+        "reply, expected_errno",
+        [
+            pytest.param(error(1, errno.EPERM), errno.EPERM, id="error"),
+            pytest.param(
+                nlmsg(netlink.NLMSG_DONE, 1, struct.pack("i", -errno.EBUSY)),
+                errno.EBUSY,
+                id="done_with_error",
+            ),
+            pytest.param(
+                nlmsg(netlink.RTM_NEWLINK, 1, flags=netlink.NLM_F_DUMP_INTR),
+                errno.EINTR,
+                id="interrupted",
+            ),
+            pytest.param(socket.timeout(), errno.ETIMEDOUT, id="timeout"),
+        ],
+    )
+    def test_dump_errors(self, reply, expected_errno, fake_socket):
+        fake_socket(reply)
+        with netlink.RtnetlinkClient() as client:
+            with pytest.raises(netlink.NetlinkRequestError) as e:
+                client.get_links()
+        assert expected_errno == e.value.errno
+
+    def test_transact_sends_one_batch_and_waits_for_every_ack(
+        self, fake_socket
+    ):
+        sock = fake_socket(error(1), error(2))
+        with netlink.RtnetlinkClient() as client:
+            client.transact(
+                [netlink.link_request(2, True), netlink.link_request(3, True)]
+            )
+        assert 1 == len(sock.sent)
+        batch = sock.sent[0]
+        first_length, msg_type, flags, seq, _pid = struct.unpack_from(
+            "IHHII", batch
+        )
+        assert (netlink.RTM_NEWLINK, 0x5, 1) == (msg_type, flags, seq)
+        assert 2 == struct.unpack_from("IHHII", batch, first_length)[3]
+        assert [] == sock.replies
+
+    def test_transact_raises_first_rejected_request(self, fake_socket):
+        sock = fake_socket(error(1, errno.EEXIST) + error(2, errno.ENODEV))
+        with netlink.RtnetlinkClient() as client:
+            with pytest.raises(netlink.NetlinkRequestError) as e:
+                client.transact(
+                    [
+                        netlink.link_request(2, True),
+                        netlink.link_request(3, True),
+                    ]
+                )
+        assert errno.EEXIST == e.value.errno
+        assert [] == sock.replies
+
+
+class TestRequests:
+    @pytest.mark.parametrize(
+        "msg_type, gateway, expected_scope, expected_protocol",
+        [
+            pytest.param(
+                netlink.RTM_NEWROUTE,
+                None,
+                netlink.RT_SCOPE_LINK,
+                netlink.RTPROT_BOOT,
+                id="add_on_link",
+            ),
+            pytest.param(
+                netlink.RTM_NEWROUTE,
+                "10.0.0.1",
+                netlink.RT_SCOPE_UNIVERSE,
+                netlink.RTPROT_BOOT,
+                id="add_via_gateway",
+            ),
+            pytest.param(
+                netlink.RTM_DELROUTE,
+                "10.0.0.1",
+                netlink.RT_SCOPE_NOWHERE,
+                0,
+                id="delete",
+            ),
+        ],
+    )
+    def test_route_request(
+        self, msg_type, gateway, expected_scope, expected_protocol
+    ):
+        _type, _flags, body, attrs = netlink.route_request(
+            msg_type, 0, 2, "10.1.0.0", 16, gateway=gateway
+        )
+        family, dst_len, _, _, table, protocol, scope, _, _ = struct.unpack(
+            "BBBBBBBBI", body
+        )
+        assert (socket.AF_INET, 16, 254) == (family, dst_len, table)
+        assert (expected_protocol, expected_scope) == (protocol, scope)
+        attr_map = dict(attrs)
+        assert socket.inet_aton("10.1.0.0") == attr_map[netlink.RTA_DST]
+        assert struct.pack("I", 2) == attr_map[netlink.RTA_OIF]
+        assert (netlink.RTA_GATEWAY in attr_map) is bool(gateway)
+
+    def test_default_route_request_has_no_destination(self):
+        _type, _flags, _body, attrs = netlink.route_request(
+            netlink.RTM_NEWROUTE, 0, 2, "0.0.0.0", 0, gateway="10.0.0.1"
+        )
+        assert netlink.RTA_DST not in dict(attrs)
+
+    def test_unpack_rta_attrs_round_trips_padding(self):
+        packed = netlink.pack_rta_attr(3, b"eth0\0") + netlink.pack_rta_attr(
+            16, b"\x06"
+        )
+        assert 0 == len(packed) % 4
+        assert {3: b"eth0\0", 16: b"\x06"} == netlink.unpack_rta_attrs(packed)
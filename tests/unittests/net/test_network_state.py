@@ -114,6 +114,27 @@ class TestNetworkStateParseConfig:
         assert None is not result
 
 
+class TestNetworkStateFingerprint:
+    def test_fingerprint_is_stable_for_equal_configs(self):
+        """Key order doesn't change the parsed state."""
+        reordered = yaml.safe_load(V1_CONFIG_NAMESERVERS_VALID)["network"]
+        reordered = dict(reversed(list(reordered.items())))
+        assert (
+            network_state.parse_net_config_data(
+                yaml.safe_load(V1_CONFIG_NAMESERVERS_VALID)["network"]
+            ).fingerprint()
+            == network_state.parse_net_config_data(reordered).fingerprint()
+        )
+
+    def test_fingerprint_changes_with_config(self):
+        config = yaml.safe_load(V1_CONFIG_NAMESERVERS_VALID)["network"]
+        before = network_state.parse_net_config_data(config).fingerprint()
+        config["config"][-1]["mtu"] = 9000
+        assert (
+            before != network_state.parse_net_config_data(config).fingerprint()
+        )
+
+
 @mock.patch("cloudinit.net.network_state.get_interfaces_by_mac")
 class TestNetworkStateParseConfigV2:
     def test_version_2_ignores_renderer_key(self, m_get_interfaces_by_mac):
@@ -1,5 +1,6 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 
+import base64
 import shutil
 from pathlib import Path
 from textwrap import dedent
@@ -156,12 +157,26 @@ class TestIsX509Certificate:
     @mock.patch("cloudinit.sources.azure.certs.subp.subp")
     def test_invalid_certificate_content(self, m_subp):
         """Certificate with invalid content should return False."""
-        m_subp.side_effect = subp.ProcessExecutionError(
-            "unable to load certificate"
-        )
-
         assert certs.is_x509_certificate(_INVALID_X509_CERT) is False
-        m_subp.assert_called_once()
+        m_subp.assert_not_called()
+
+    @mock.patch("cloudinit.sources.azure.certs.subp.subp")
+    def test_valid_certificate_parsed_in_process(self, m_subp, cert_data):
+        """Certificates are validated without running openssl."""
+        assert certs.is_x509_certificate(cert_data) is True
+        m_subp.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "truncate", [pytest.param(1, id="one-byte"), pytest.param(64, id="64")]
+    )
+    def test_truncated_certificate(self, cert_data, truncate):
+        """Certificates with truncated DER content should return False."""
+        der = certs._pem_to_der(cert_data)
+        body = base64.encodebytes(der[:-truncate]).decode()
+        cert = "-----BEGIN CERTIFICATE-----\n%s-----END CERTIFICATE-----" % (
+            body
+        )
+        assert certs.is_x509_certificate(cert) is False
 
     @pytest.mark.skipif(
         shutil.which("openssl") is None, reason="openssl not available"
@@ -301,9 +316,92 @@ class TestExtractX509Certificates:
         assert result == [cert_data.strip()]
 
 
+class TestGetX509Fingerprint:
+    """Test get_x509_fingerprint() function."""
+
+    @mock.patch("cloudinit.sources.azure.certs.subp.subp")
+    def test_fingerprint(self, m_subp, cert_data):
+        """Fingerprint matches the format Azure control plane passes."""
+        assert (
+            "073E19D14D1C799224C6A0FD8DDAB6A8BF27D473"
+            == certs.get_x509_fingerprint(cert_data)
+        )
+        m_subp.assert_not_called()
+
+    def test_invalid_certificate_raises(self):
+        """Undecodable certificates raise ValueError."""
+        with pytest.raises(ValueError):
+            certs.get_x509_fingerprint(_INVALID_X509_CERT)
+
+
 class TestConvertX509ToOpenssh:
     """Test convert_x509_to_openssh() function."""
 
+    @mock.patch("cloudinit.sources.azure.certs.subp.subp")
+    def test_rsa_conversion_in_process(
+        self, m_subp, cert_data, data_file_path
+    ):
+        """RSA certificates are converted without running subprocesses."""
+        expected_key = data_file_path("pubkey_extract_ssh_key").read_text()
+        assert expected_key == certs.convert_x509_to_openssh(cert_data)
+        m_subp.assert_not_called()
+
+    @pytest.mark.skipif(
+        shutil.which("openssl") is None or shutil.which("ssh-keygen") is None,
+        reason="openssl or ssh-keygen not available",
+    )
+    @pytest.mark.allow_subp_for("openssl", "ssh-keygen")
+    @pytest.mark.parametrize(
+        "newkey",
+        [
+            pytest.param(["rsa:2048"], id="rsa"),
+            pytest.param(
+                ["ec", "-pkeyopt", "ec_paramgen_curve:P-256"], id="nistp256"
+            ),
+            pytest.param(
+                ["ec", "-pkeyopt", "ec_paramgen_curve:P-384"], id="nistp384"
+            ),
+            pytest.param(
+                ["ec", "-pkeyopt", "ec_paramgen_curve:P-521"], id="nistp521"
+            ),
+        ],
+    )
+    def test_conversion_matches_ssh_keygen(self, newkey, tmp_path):
+        """In-process conversion matches openssl and ssh-keygen output."""
+        key_path = str(tmp_path / "key.pem")
+        cert, _ = subp.subp(
+            ["openssl", "req", "-x509", "-nodes", "-subj", "/CN=test"]
+            + ["-days", "1", "-keyout", key_path, "-newkey"]
+            + newkey
+        )
+        pub_key, _ = subp.subp(
+            ["openssl", "x509", "-noout", "-pubkey"], data=cert
+        )
+        expected_key, _ = subp.subp(
+            ["ssh-keygen", "-i", "-m", "PKCS8", "-f", "/dev/stdin"],
+            data=pub_key,
+        )
+        assert expected_key == certs._openssh_key_from_certificate(cert)
+
+    @pytest.mark.skipif(
+        shutil.which("openssl") is None, reason="openssl not available"
+    )
+    @pytest.mark.allow_subp_for("openssl")
+    def test_ed25519_conversion(self, tmp_path):
+        """Ed25519 keys are converted although ssh-keygen -i cannot."""
+        key_path = str(tmp_path / "key.pem")
+        cert, _ = subp.subp(
+            ["openssl", "req", "-x509", "-nodes", "-subj", "/CN=test"]
+            + ["-days", "1", "-keyout", key_path, "-newkey", "ed25519"]
+        )
+        spki, _ = subp.subp(
+            ["openssl", "pkey", "-in", key_path, "-pubout", "-outform", "DER"],
+            decode=False,
+        )
+        blob = b"\x00\x00\x00\x0bssh-ed25519\x00\x00\x00\x20" + spki[-32:]
+        expected_key = "ssh-ed25519 %s\n" % base64.b64encode(blob).decode()
+        assert expected_key == certs.convert_x509_to_openssh(cert)
+
     @mock.patch("cloudinit.sources.azure.certs.subp.subp")
     def test_conversion_with_mocked_commands(self, m_subp):
         """Test basic conversion flow with mocked subp calls."""
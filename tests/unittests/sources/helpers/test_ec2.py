@@ -1,5 +1,6 @@
 # This file is part of cloud-init. See LICENSE file for license information.
 
+import pytest
 import responses
 
 from cloudinit import url_helper as uh
@@ -281,8 +282,9 @@ class TestEc2Util:
         assert iam["info"]["LastUpdated"] == "2016-10-27T17:29:39Z"
         assert "security-credentials" not in iam
 
+    @pytest.mark.parametrize("max_workers", (1, 4))
     @responses.activate
-    def test_metadata_children_with_invalid_character(self):
+    def test_metadata_children_with_invalid_character(self, max_workers):
         def _skip_tags(exception):
             if isinstance(exception, uh.UrlError) and exception.code == 404:
                 if exception.url and "meta-data/tags/" in exception.url:
@@ -325,9 +327,81 @@ class TestEc2Util:
             retries=0,
             timeout=0.1,
             retrieval_exception_ignore_cb=_skip_tags,
+            max_workers=max_workers,
         )
         assert md["tags"]["valid"] == "OK"
         assert md["tags"]["test/invalid"] == "(skipped)"
         assert md["ami-launch-index"] == "1"
-        md = ec2.get_instance_metadata(self.VERSION, retries=0, timeout=0.1)
+        md = ec2.get_instance_metadata(
+            self.VERSION, retries=0, timeout=0.1, max_workers=max_workers
+        )
         assert len(md) == 0
+
+
+BASE_URL = "http://169.254.169.254/latest/meta-data/"
+MACS_URL = BASE_URL + "network/interfaces/macs/"
+METADATA_TREE = {
+    BASE_URL: "hostname\nnetwork/\npublic-keys/\nblock-device-mapping/\n",
+    BASE_URL + "hostname": "host.example.com",
+    BASE_URL + "network/": "interfaces/",
+    BASE_URL + "network/interfaces/": "macs/",
+    MACS_URL: "06:00:00:00:00:01/\n06:00:00:00:00:02/",
+    MACS_URL + "06:00:00:00:00:01/": "device-number\nlocal-ipv4s",
+    MACS_URL + "06:00:00:00:00:01/device-number": "0",
+    MACS_URL + "06:00:00:00:00:01/local-ipv4s": "10.0.0.1\n10.0.0.2",
+    MACS_URL + "06:00:00:00:00:02/": "device-number\nlocal-ipv4s",
+    MACS_URL + "06:00:00:00:00:02/device-number": "1",
+    MACS_URL + "06:00:00:00:00:02/local-ipv4s": "10.0.1.1",
+    BASE_URL + "public-keys/": "0=my-key",
+    BASE_URL + "public-keys/0/openssh-key": "ssh-rsa AAAA my-key",
+    BASE_URL + "block-device-mapping/": "ami\nephemeral0",
+    BASE_URL + "block-device-mapping/ami": "sda1",
+    BASE_URL + "block-device-mapping/ephemeral0": '{"device": "sdb"}',
+}
+
+
+class TestMetadataMaterializer:
+    @staticmethod
+    def _caller(url):
+        return METADATA_TREE[url].encode()
+
+    def test_concurrent_crawl_matches_serial_crawl(self):
+        serial = ec2.MetadataMaterializer(
+            METADATA_TREE[BASE_URL], BASE_URL, self._caller
+        ).materialize()
+        concurrent = ec2.MetadataMaterializer(
+            METADATA_TREE[BASE_URL], BASE_URL, self._caller, max_workers=4
+        ).materialize()
+        assert serial == concurrent
+        assert list(serial) == list(concurrent)
+        assert {"device": "sdb"} == concurrent["block-device-mapping"][
+            "ephemeral0"
+        ]
+        assert ["10.0.0.1", "10.0.0.2"] == concurrent["network"]["interfaces"][
+            "macs"
+        ]["06:00:00:00:00:01"]["local-ipv4s"]
+        assert "ssh-rsa AAAA my-key" == concurrent["public-keys"]["my-key"]
+
+    def test_concurrent_crawl_fetches_each_url_once(self):
+        fetched = []
+
+        def caller(url):
+            fetched.append(url)
+            return self._caller(url)
+
+        ec2.MetadataMaterializer(
+            METADATA_TREE[BASE_URL], BASE_URL, caller, max_workers=4
+        ).materialize()
+        assert sorted(fetched) == sorted(set(METADATA_TREE) - {BASE_URL})
+
+    def test_concurrent_crawl_raises_caller_errors(self):
+        def caller(url):
+            if url.endswith("device-number"):
+                raise uh.UrlError("broke", code=500, url=url)
+            return self._caller(url)
+
+        materializer = ec2.MetadataMaterializer(
+            METADATA_TREE[BASE_URL], BASE_URL, caller, max_workers=4
+        )
+        with pytest.raises(uh.UrlError, match="broke"):
+            materializer.materialize()
@@ -4,6 +4,7 @@
 import os
 import re
 import shutil
+import threading
 from textwrap import dedent
 from unittest import mock
 from xml.etree import ElementTree as ET
@@ -217,6 +218,26 @@ class TestGoalStateParsing:
         assert 0 == m_azure_endpoint_client.get.call_count
         assert certificates_xml is None
 
+    def test_certificates_xml_fetched_on_demand(self):
+        m_azure_endpoint_client = mock.MagicMock()
+        xml = self._get_formatted_goal_state_xml_string(
+            certificates_url="TestCertificatesUrl"
+        )
+        goal_state = azure_helper.GoalState(
+            xml, m_azure_endpoint_client, need_certificate=False
+        )
+        assert 0 == m_azure_endpoint_client.get.call_count
+        assert goal_state.certificates_xml is None
+
+        goal_state.fetch_certificates_xml()
+        assert [
+            mock.call("TestCertificatesUrl", secure=True)
+        ] == m_azure_endpoint_client.get.call_args_list
+        assert (
+            m_azure_endpoint_client.get.return_value.contents
+            == goal_state.certificates_xml
+        )
+
     def test_invalid_goal_state_xml_raises_parse_error(self):
         xml = "random non-xml data"
         with pytest.raises(ET.ParseError):
@@ -294,6 +315,13 @@ class TestAzureEndpointHttpClient:
             client.get(url, secure=True)
         assert 1 == m_http_with_retries.call_count
 
+    def test_secure_get_uses_updated_certificate(self, m_http_with_retries):
+        client = azure_helper.AzureEndpointHttpClient(None)
+        client.set_certificate("MyCertificate")
+        client.get("MyTestUrl", secure=True)
+        headers = m_http_with_retries.call_args[1]["headers"]
+        assert "MyCertificate" == headers["x-ms-guest-agent-public-x509-cert"]
+
     def test_post(self, m_http_with_retries):
         m_data = mock.MagicMock()
         url = "MyTestUrl"
@@ -1095,6 +1123,79 @@ class TestWALinuxAgentShim:
         assert "expected-no-value-key" in data
         assert "should-not-be-found" not in data
 
+    def test_certificates_fetched_with_generated_certificate(self):
+        shim = wa_shim(endpoint="test_endpoint")
+        shim.register_with_azure_and_fetch_data(
+            distro=None, pubkey_info=[{"fingerprint": "fp1"}]
+        )
+        m_client = self.AzureEndpointHttpClient.return_value
+        assert [mock.call(None)] == self.AzureEndpointHttpClient.call_args_list
+        assert [
+            mock.call(self.OpenSSLManager.return_value.certificate)
+        ] == m_client.set_certificate.call_args_list
+        assert [
+            mock.call(m_client.get.return_value.contents, m_client, False)
+        ] == self.GoalState.call_args_list
+        assert (
+            1 == self.GoalState.return_value.fetch_certificates_xml.call_count
+        )
+
+    def test_certificate_generated_while_goal_state_is_fetched(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_both(*args, **kwargs):
+            barrier.wait()
+            return mock.DEFAULT
+
+        self.OpenSSLManager.side_effect = wait_for_both
+        m_client = self.AzureEndpointHttpClient.return_value
+        m_client.get.side_effect = wait_for_both
+        shim = wa_shim(endpoint="test_endpoint")
+        shim.register_with_azure_and_fetch_data(
+            distro=None, pubkey_info=[{"fingerprint": "fp1"}]
+        )
+        assert 1 == self.OpenSSLManager.call_count
+
+    def test_iso_not_ejected_when_certificates_fail(self):
+        self.GoalState.return_value.fetch_certificates_xml.side_effect = (
+            SentinelException
+        )
+        shim = wa_shim(endpoint="test_endpoint")
+        with mock.patch.object(shim, "eject_iso") as m_eject_iso:
+            with pytest.raises(SentinelException):
+                shim.register_with_azure_and_fetch_data(
+                    distro=None,
+                    pubkey_info=[{"fingerprint": "fp1"}],
+                    iso_dev="/dev/sr0",
+                )
+        assert 0 == m_eject_iso.call_count
+
+    @mock.patch.object(azure_helper, "GoalStateHealthReporter", autospec=True)
+    def test_ready_not_sent_when_certificates_fail(
+        self, m_goal_state_health_reporter
+    ):
+        self.GoalState.return_value.fetch_certificates_xml.side_effect = (
+            SentinelException
+        )
+        shim = wa_shim(endpoint="test_endpoint")
+        with pytest.raises(SentinelException):
+            shim.register_with_azure_and_fetch_data(
+                distro=None, pubkey_info=[{"fingerprint": "fp1"}]
+            )
+        assert 0 == m_goal_state_health_reporter.call_count
+
+    def test_clean_up_generated_certificate_after_goal_state_failure(self):
+        self.AzureEndpointHttpClient.return_value.get.side_effect = (
+            url_helper.UrlError("retry", code=404)
+        )
+        shim = wa_shim(endpoint="test_endpoint")
+        with pytest.raises(url_helper.UrlError):
+            shim.register_with_azure_and_fetch_data(
+                distro=None, pubkey_info=[{"fingerprint": "fp1"}]
+            )
+        shim.clean_up()
+        assert 1 == self.OpenSSLManager.return_value.clean_up.call_count
+
     def test_absent_certificates_produces_empty_public_keys(self):
         mypk = [{"fingerprint": "fp1", "path": "path1"}]
         self.GoalState.return_value.certificates_xml = None
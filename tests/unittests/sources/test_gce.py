@@ -62,6 +62,20 @@ GUEST_ATTRIBUTES_URL = (
 )
 
 
+def _tree(gce_meta):
+    """Return gce_meta as the metadata server's recursive JSON."""
+    tree: dict = {}
+    for path, value in gce_meta.items():
+        node = tree
+        parts = path.split("/")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    if "id" in tree.get("instance", {}):
+        tree["instance"]["id"] = int(tree["instance"]["id"])
+    return tree
+
+
 class TestDataSourceGCE:
     with_logs = True
 
@@ -88,7 +102,10 @@ class TestDataSourceGCE:
         )
         mocker.patch("time.sleep")
 
-    def _set_mock_metadata(self, gce_meta=None, *, check_headers=None):
+    def _set_mock_metadata(
+        self, gce_meta=None, *, check_headers=None, serve_tree=False
+    ):
+        """Serve gce_meta by path, and as a tree if serve_tree is set."""
         if gce_meta is None:
             gce_meta = GCE_META
 
@@ -101,6 +118,8 @@ class TestDataSourceGCE:
                 path = path.rstrip("/")
             else:
                 path = None
+            if path == "" and serve_tree:
+                return (200, request.headers, json.dumps(_tree(gce_meta)))
             if path in gce_meta:
                 response = gce_meta.get(path)
                 if recursive:
@@ -548,3 +567,53 @@ class TestDataSourceGCE:
         assert isinstance(self.ds.metadata["project-data"], dict)
         assert "pkey" in self.ds.metadata["project-data"]
         assert "pvalue" == self.ds.metadata["project-data"]["pkey"]
+
+    @responses.activate
+    def test_recursive_read_uses_one_request(self):
+        self._set_mock_metadata(GCE_META_ENCODING, serve_tree=True)
+        assert self.ds.get_data() is True
+        assert 1 == len(responses.calls)
+        assert (
+            "recursive=true" == urlparse(responses.calls[0].request.url).query
+        )
+        assert "12345" == self.ds.get_instance_id()
+        assert b"#!/bin/echo baz\n" == self.ds.get_userdata_raw()
+
+    @pytest.mark.parametrize(
+        "gce_meta",
+        [
+            GCE_META,
+            GCE_META_ENCODING,
+            GCE_USER_DATA_TEXT,
+            {
+                "instance/id": "123",
+                "instance/zone": "projects/1/zones/us-central1-a",
+                "instance/hostname": "server.project-foo.local",
+                "instance/attributes": {"ssh-keys": "cloudinit:ssh-rsa A"},
+                "project/attributes": {"ssh-keys": "cloudinit:ssh-rsa B"},
+            },
+        ],
+    )
+    @responses.activate
+    def test_recursive_read_matches_reading_each_key(self, gce_meta, paths):
+        self._set_mock_metadata(gce_meta)
+        assert self.ds.get_data() is True
+        expected = (self.ds.metadata, self.ds.get_userdata_raw())
+        responses.reset()
+
+        self._set_mock_metadata(gce_meta, serve_tree=True)
+        ds = DataSourceGCE.DataSourceGCE(settings.CFG_BUILTIN, None, paths)
+        assert ds.get_data() is True
+        assert expected == (ds.metadata, ds.get_userdata_raw())
+
+    @pytest.mark.parametrize("body", ["not json", "[]", json.dumps({})])
+    @responses.activate
+    def test_unusable_recursive_read_falls_back_to_each_key(self, body):
+        responses.add(
+            responses.GET,
+            "http://metadata.google.internal/computeMetadata/v1/",
+            body=body,
+        )
+        self._set_mock_metadata()
+        assert self.ds.get_data() is True
+        assert GCE_META["instance/id"] == self.ds.get_instance_id()
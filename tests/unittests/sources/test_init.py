@@ -6,10 +6,12 @@ import inspect
 import logging
 import os
 import stat
+import threading
+import time
 
 import pytest
 
-from cloudinit import importer, util
+from cloudinit import importer, url_helper, util
 from cloudinit.distros import ubuntu
 from cloudinit.event import EventScope, EventType
 from cloudinit.helpers import Paths
@@ -19,7 +21,10 @@ from cloudinit.sources import (
     REDACT_SENSITIVE_VALUE,
     UNSET,
     DataSource,
+    DataSourceNotFoundException,
     canonical_cloud_id,
+    find_source,
+    get_probe_workers,
     pkl_load,
     redact_sensitive_keys,
 )
@@ -933,6 +938,143 @@ class TestDataSource:
         ) in caplog.record_tuples
 
 
+class TestFindSource:
+    @pytest.fixture(autouse=True)
+    def fixtures(self, paths):
+        self.paths = paths
+        self.distro = ubuntu.Distro("somedistro", {}, {})
+
+    def _make_ds(self, name, result, started=None, release=None):
+        def _get_data(ds):
+            if started is not None:
+                started.set()
+            if release is not None:
+                assert release.wait(timeout=5)
+            ds.metadata = {"instance-id": "iid-%s" % name}
+            return result
+
+        return type(
+            "DataSource%s" % name,
+            (DataSourceTestSubclassNet,),
+            {"_get_data": _get_data, "dsname": name},
+        )
+
+    def _find(self, sys_cfg, ds_list, deps=("FILESYSTEM", "NETWORK")):
+        with mock.patch(
+            "cloudinit.sources.list_sources", return_value=ds_list
+        ):
+            return find_source(
+                sys_cfg, self.distro, self.paths, list(deps), [], [], None
+            )
+
+    @pytest.mark.parametrize(
+        "cfg,expected",
+        (
+            ({}, 1),
+            ({"datasource_probe_workers": 4}, 4),
+            ({"datasource_probe_workers": "3"}, 3),
+            ({"datasource_probe_workers": 0}, 1),
+            ({"datasource_probe_workers": "many"}, 1),
+        ),
+    )
+    def test_get_probe_workers(self, cfg, expected):
+        assert expected == get_probe_workers(cfg)
+
+    @pytest.mark.parametrize("workers", (1, 3))
+    def test_first_successful_datasource_in_list_order_wins(self, workers):
+        ds_list = [
+            self._make_ds("One", False),
+            self._make_ds("Two", True),
+            self._make_ds("Three", True),
+        ]
+        ds, name = self._find({"datasource_probe_workers": workers}, ds_list)
+        assert "DataSourceTwo" == name
+        assert {"instance-id": "iid-Two"} == ds.metadata
+        assert not ds._defer_persist_instance_data
+
+    def test_parallel_waits_for_higher_priority_candidates(self):
+        """A lower priority winner is not chosen while higher ones probe."""
+        started = threading.Event()
+        release = threading.Event()
+        ds_list = [
+            self._make_ds("Slow", True, started=started, release=release),
+            self._make_ds("Fast", True),
+        ]
+        result = {}
+
+        def _run():
+            result["found"] = self._find(
+                {"datasource_probe_workers": 2}, ds_list
+            )
+
+        thread = threading.Thread(target=_run)
+        thread.start()
+        assert started.wait(timeout=5)
+        assert "found" not in result
+        release.set()
+        thread.join(timeout=5)
+        assert "DataSourceSlow" == result["found"][1]
+
+    def test_parallel_aborts_slow_losing_probes(self):
+        """The winner is returned without waiting for losers to time out."""
+        loser_waiting = threading.Event()
+        loser_result = {}
+
+        def _get_data(ds):
+            loser_waiting.set()
+            loser_result["found"] = url_helper.wait_for_url(
+                ["http://169.254.169.254/"], max_wait=300, sleep_time=60
+            )
+            return False
+
+        ds_list = [
+            self._make_ds("Winner", True, release=loser_waiting),
+            type(
+                "DataSourceLoser",
+                (DataSourceTestSubclassNet,),
+                {"_get_data": _get_data, "dsname": "Loser"},
+            ),
+        ]
+        with mock.patch(
+            "cloudinit.url_helper.readurl",
+            side_effect=url_helper.UrlError(ValueError("unreachable")),
+        ):
+            start = time.monotonic()
+            _, name = self._find({"datasource_probe_workers": 2}, ds_list)
+            assert "DataSourceWinner" == name
+            for thread in threading.enumerate():
+                if thread.name.startswith("ds-probe"):
+                    thread.join(timeout=5)
+                    assert not thread.is_alive()
+        assert time.monotonic() - start < 10
+        assert (False, None) == loser_result["found"]
+
+    def test_parallel_only_persists_winner(self):
+        ds_list = [self._make_ds("One", True), self._make_ds("Two", True)]
+        with mock.patch.object(
+            DataSource, "persist_instance_data", autospec=True
+        ) as m_persist:
+            ds, _ = self._find({"datasource_probe_workers": 2}, ds_list)
+        assert [mock.call(ds)] == m_persist.call_args_list
+
+    def test_local_mode_probes_serially(self):
+        ds_list = [self._make_ds("One", True), self._make_ds("Two", True)]
+        with mock.patch(
+            "cloudinit.sources._find_source_parallel"
+        ) as m_parallel:
+            _, name = self._find(
+                {"datasource_probe_workers": 2}, ds_list, deps=["FILESYSTEM"]
+            )
+        assert "DataSourceOne" == name
+        assert 0 == m_parallel.call_count
+
+    @pytest.mark.parametrize("workers", (1, 2))
+    def test_raises_when_no_datasource_found(self, workers):
+        ds_list = [self._make_ds("One", False), self._make_ds("Two", False)]
+        with pytest.raises(DataSourceNotFoundException):
+            self._find({"datasource_probe_workers": workers}, ds_list)
+
+
 class TestRedactSensitiveData:
     def test_redact_sensitive_data_noop_when_no_sensitive_keys_present(self):
         """When sensitive_keys is absent or empty from metadata do nothing."""
@@ -4,6 +4,7 @@ import copy
 import json
 import re
 import stat
+import threading
 from collections import namedtuple
 from copy import deepcopy
 from unittest import mock
@@ -744,3 +745,45 @@ class TestReadMetadata:
                 assert 200 == resp.status_code
             else:
                 assert 500 == resp.status_code
+
+    @mock.patch.object(lxd.requests.Session, "get")
+    def test_config_keys_fetched_concurrently(self, m_session_get):
+        """Config key routes are requested in parallel, processed in order."""
+        config_keys = ["user.user-data", "cloud-init.user-data"]
+        barrier = threading.Barrier(len(config_keys), timeout=5)
+
+        def fake_get(url):
+            m_resp = mock.MagicMock(ok=True, status_code=200)
+            if url == "http://lxd/1.0/config":
+                routes = ["/1.0/config/" + key for key in config_keys]
+                m_resp.json.return_value = routes
+            else:
+                # Every config key request must be in flight at once
+                barrier.wait()
+                m_resp.content = url.rpartition("/")[-1].encode("utf-8")
+            return m_resp
+
+        m_session_get.side_effect = fake_get
+        md = lxd.read_metadata(metadata_keys=MetaDataKeys.CONFIG)
+        assert "cloud-init.user-data" == md["user-data"]
+        assert {
+            "cloud-init.user-data": "cloud-init.user-data",
+            "user.user-data": "user.user-data",
+        } == md["config"]
+
+
+class TestLXDSocketAdapter:
+    def test_connection_pool_is_reused(self):
+        adapter = lxd.LXDSocketAdapter(socket_path="/my/sock", maxsize=3)
+        pool = adapter.get_connection("http://lxd/1.0/meta-data")
+        assert "/my/sock" == pool.socket_path
+        assert 3 == pool.pool.maxsize
+        assert pool is adapter.get_connection("http://lxd/1.0/config")
+
+    def test_close_releases_connection_pool(self):
+        adapter = lxd.LXDSocketAdapter()
+        pool = adapter.get_connection("http://lxd/1.0/meta-data")
+        with mock.patch.object(pool, "close") as m_close:
+            adapter.close()
+        assert 1 == m_close.call_count
+        assert pool is not adapter.get_connection("http://lxd/1.0/meta-data")
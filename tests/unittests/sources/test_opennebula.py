@@ -8,10 +8,10 @@ from unittest import mock
 import jsonschema
 import pytest
 
-from cloudinit import atomic_helper
+from cloudinit import atomic_helper, subp
 from cloudinit.config.schema import SchemaType, get_schema
 from cloudinit.sources import DataSourceOpenNebula as ds
-from tests.unittests.helpers import populate_dir
+from tests.unittests.helpers import populate_dir, readResource
 
 TEST_VARS = {
     "VAR1": "single",
@@ -148,6 +148,24 @@ class TestOpenNebulaDataSource:
         assert "metadata" in results
         assert TEST_VARS == results["metadata"]
 
+    def test_context_parser_does_not_run_shell(self):
+        populate_context_dir(self.seed_dir, TEST_VARS)
+        with mock.patch(DS_PATH + ".parse_shell_config") as m_parse:
+            results = ds.read_context_disk_dir(self.seed_dir, mock.Mock())
+
+        assert 0 == m_parse.call_count
+        assert TEST_VARS == results["metadata"]
+
+    def test_context_parser_falls_back_to_shell(self):
+        populate_dir(
+            self.seed_dir,
+            {"context.sh": readResource("opennebula/context-expansion.sh")},
+        )
+        results = ds.read_context_disk_dir(self.seed_dir, mock.Mock())
+
+        assert "vm-23.example.com" == results["metadata"]["local-hostname"]
+        assert "yes" == results["metadata"]["DATE_SET"]
+
     def test_ssh_key(self, tmp_path):
         public_keys = ["first key", "second key"]
         for c in range(4):
@@ -1150,6 +1168,68 @@ class TestParseShellConfig:
         assert ret == {"foo": "bar", "xx": "foo"}
 
 
+class TestParseContextSh:
+    @pytest.mark.allow_subp_for("bash", "sh")
+    @pytest.mark.parametrize(
+        "context,shell",
+        [
+            ("context-generated.sh", "sh"),
+            ("context-generated.sh", "bash"),
+            ("context-quoting.sh", "sh"),
+            ("context-quoting.sh", "bash"),
+            ("context-ansi-c.sh", "bash"),
+        ],
+    )
+    def test_matches_shell(self, context, shell):
+        """parse_context_sh returns what running context.sh would."""
+        content = readResource("opennebula/" + context)
+        real_subp = subp.subp
+
+        def run_shell(cmd, **kwargs):
+            cmd = [shell if arg == "sh" else arg for arg in cmd]
+            return real_subp(cmd, **kwargs)
+
+        with mock.patch(DS_PATH + ".subp.subp", side_effect=run_shell):
+            expected = ds.parse_shell_config(content)
+        assert expected == ds.parse_context_sh(content)
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            INVALID_CONTEXT,
+            "A=1;;",
+            "echo hello",
+            "A",
+            "export A",
+            "A=$B",
+            'A="${B}"',
+            "A=`hostname`",
+            'A="`hostname`"',
+            "A=$(hostname)",
+            "A=~/path",
+            "A=1 && B=2",
+            "A=1 | cat",
+            "A=(1 2)",
+            "A='unterminated",
+            'A="unterminated',
+            "A=$'unterminated",
+            "A=trailing\\",
+            "A=$'\\u00e9'",
+            "A=$'\\xff'",
+            "A=$'\\0'",
+            "A=$'\\x'",
+            "UID=0",
+        ],
+    )
+    def test_unsupported_syntax_raises(self, content):
+        with pytest.raises(ds.UnsupportedShellSyntax):
+            ds.parse_context_sh(content)
+
+    def test_error_names_line(self):
+        with pytest.raises(ds.UnsupportedShellSyntax, match="on line 3"):
+            ds.parse_context_sh("# comment\nA=1\nB=$A\n")
+
+
 class TestGetPhysicalNicsByMac:
     @pytest.mark.parametrize(
         "interfaces_by_mac,physical_devs,expected_return",
@@ -4,6 +4,7 @@ import base64
 import copy
 import json
 import logging
+import threading
 from itertools import count
 from typing import Optional
 from unittest import mock
@@ -996,29 +997,76 @@ class TestReadOpcMetadata:
             == "http://169.254.169.254/opc/v1/instance/"
         )
 
+    @staticmethod
+    def _m_wait_for_url(vnics_url):
+        """Answer instance urls with the first, vnics urls with vnics_url."""
+
+        def m_wait(urls, **kwargs):
+            if "vnics" in urls[0]:
+                return vnics_url, b'{"some": "vnics"}'
+            return urls[0], b'{"some": "value"}'
+
+        return m_wait
+
+    def test_fetch_instance_and_vnics_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def m_wait(urls, **kwargs):
+            # Both requests must be waiting at once to pass the barrier
+            barrier.wait()
+            return urls[0], b"{}"
+
+        with mock.patch(DS_PATH + ".wait_for_url", side_effect=m_wait) as m:
+            metadata = oracle.read_opc_metadata(fetch_vnics_data=True)
+        assert {} == metadata.vnics_data
+        assert [
+            [ipv4_v2_instance_url, ipv4_v1_instance_url],
+            [
+                ipv4_v2_instance_url.replace("instance", "vnics"),
+                ipv4_v1_instance_url.replace("instance", "vnics"),
+            ],
+        ] == sorted(call[1]["urls"] for call in m.call_args_list)
+        assert {30} == {call[1]["max_wait"] for call in m.call_args_list}
+
     @mock.patch("cloudinit.url_helper.time.sleep", lambda _: None)
-    @mock.patch("cloudinit.url_helper.time.monotonic", side_effect=[0, 11])
-    @mock.patch(
-        "cloudinit.sources.DataSourceOracle.wait_for_url",
-        return_value=("http://hi", b'{"some": "value"}'),
-    )
-    def test_fetch_vnics_max_wait(self, m_wait_for_url, m_time):
-        oracle.read_opc_metadata(fetch_vnics_data=True)
-        assert m_wait_for_url.call_count == 2
+    @mock.patch(DS_PATH + ".time.monotonic", side_effect=[0, 11])
+    def test_fetch_vnics_max_wait(self, m_time):
+        """vnics from another endpoint are fetched again in the time left."""
+        vnics_v1_url = ipv4_v1_instance_url.replace("instance", "vnics")
+        with mock.patch(
+            DS_PATH + ".wait_for_url",
+            side_effect=self._m_wait_for_url(vnics_v1_url),
+        ) as m_wait_for_url:
+            metadata = oracle.read_opc_metadata(fetch_vnics_data=True)
+        assert m_wait_for_url.call_count == 3
+        assert [
+            ipv4_v2_instance_url.replace("instance", "vnics")
+        ] == m_wait_for_url.call_args_list[-1][1]["urls"]
         # 19 because start time was 0, next time was 11 and max wait is 30
         assert m_wait_for_url.call_args_list[-1][1]["max_wait"] == 19
+        assert {"some": "vnics"} == metadata.vnics_data
 
     @mock.patch("cloudinit.url_helper.time.sleep", lambda _: None)
-    @mock.patch("cloudinit.url_helper.time.monotonic", side_effect=[0, 1000])
-    @mock.patch(
-        "cloudinit.sources.DataSourceOracle.wait_for_url",
-        return_value=("http://hi", b'{"some": "value"}'),
-    )
-    def test_attempt_vnics_after_max_wait_expire(self, m_wait_for_url, m_time):
-        oracle.read_opc_metadata(fetch_vnics_data=True)
-        assert m_wait_for_url.call_count == 2
+    @mock.patch(DS_PATH + ".time.monotonic", side_effect=[0, 1000])
+    def test_attempt_vnics_after_max_wait_expire(self, m_time):
+        with mock.patch(
+            DS_PATH + ".wait_for_url",
+            side_effect=self._m_wait_for_url(False),
+        ) as m_wait_for_url:
+            oracle.read_opc_metadata(fetch_vnics_data=True)
+        assert m_wait_for_url.call_count == 3
         assert m_wait_for_url.call_args_list[-1][1]["max_wait"] < 0
 
+    def test_vnics_from_same_endpoint_are_not_fetched_again(self):
+        vnics_v2_url = ipv4_v2_instance_url.replace("instance", "vnics")
+        with mock.patch(
+            DS_PATH + ".wait_for_url",
+            side_effect=self._m_wait_for_url(vnics_v2_url),
+        ) as m_wait_for_url:
+            metadata = oracle.read_opc_metadata(fetch_vnics_data=True)
+        assert m_wait_for_url.call_count == 2
+        assert {"some": "vnics"} == metadata.vnics_data
+
     # No need to actually wait between retries in the tests
     @mock.patch("cloudinit.url_helper.time.sleep", lambda _: None)
     @pytest.mark.parametrize(
@@ -1034,8 +1082,8 @@ class TestReadOpcMetadata:
             ),
             pytest.param(
                 False,
-                None,
-                id="fetching instance metadata fails, vnics not fetched",
+                True,
+                id="fetching instance metadata fails, vnics not used",
             ),
             pytest.param(
                 True,
@@ -1081,7 +1129,7 @@ class TestReadOpcMetadata:
             else:
                 assert not opc_metadata
             assert instance_md_requsted
-            assert vnics_md_requsted == instance_md_succeeds
+            assert vnics_md_requsted
 
         if instance_md_succeeds:
             assert (
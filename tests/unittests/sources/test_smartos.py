@@ -14,10 +14,12 @@ order to validate return responses.
 
 """
 
+import base64
 import json
 import multiprocessing
 import os
 import os.path
+import pickle
 import re
 import signal
 import stat
@@ -381,8 +383,15 @@ class PsuedoJoyentClient:
             data = MOCK_RETURNS.copy()
         self.data = data
         self._is_open = False
+        self.prefetched = []
         return
 
+    def clear_cache(self):
+        self.prefetched = []
+
+    def prefetch(self, keys):
+        self.prefetched.extend(keys)
+
     def get(self, key, default=None, strip=False):
         if key in self.data:
             r = self.data[key]
@@ -713,6 +722,15 @@ class TestSmartOSDataSource:
             dsrc.device_name_to_device("FOO") == mydscfg["disk_aliases"]["FOO"]
         )
 
+    def test_prefetches_all_keys(self, ds, m_jmc_client_factory):
+        dsrc = ds()
+        dsrc.get_data()
+        client = m_jmc_client_factory.return_value
+        assert sorted(
+            [key for key, _ in DataSourceSmartOS.SMARTOS_ATTRIB_MAP.values()]
+            + list(DataSourceSmartOS.SMARTOS_ATTRIB_JSON.values())
+        ) == sorted(client.prefetched)
+
     def test_reconfig_network_on_boot(self, ds, m_jmc_client_factory):
         # Test to ensure that network is configured from metadata on each boot
         assert {
@@ -782,6 +800,51 @@ class ShortReader:
         return ret
 
 
+class PipelinedTransport:
+    """Answer GET requests from data once they are all written.
+
+    Responses are sent in reverse order if reverse is set.
+    """
+
+    def __init__(self, data, reverse=False):
+        self.data = data
+        self.reverse = reverse
+        self.keys = []
+        self.pending = []
+        self.buffer = b""
+        self.max_outstanding = 0
+
+    def write(self, msg):
+        _v2, _length, _crc, request_id, rtype, param = msg.decode().split()
+        assert "GET" == rtype
+        key = base64.b64decode(param).decode()
+        self.keys.append(key)
+        if key in self.data:
+            body = "%s SUCCESS %s" % (request_id, b64e(self.data[key]))
+        else:
+            body = "%s NOTFOUND" % request_id
+        self.pending.append(
+            "V2 %d %08x %s\n"
+            % (len(body), crc32(body.encode()) & 0xFFFFFFFF, body)
+        )
+
+    def flush(self):
+        pass
+
+    def read(self, size):
+        if not self.buffer:
+            self.max_outstanding = max(self.max_outstanding, len(self.pending))
+            if self.reverse:
+                self.pending.reverse()
+            self.buffer = "".join(self.pending).encode()
+            self.pending = []
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def close(self):
+        pass
+
+
 @pytest.fixture
 def m_serial(mocker):
     return mocker.MagicMock(spec=serial.Serial)
@@ -1080,6 +1143,67 @@ class TestJoyentMetadataClient:
         assert joyent_client.list() == []
 
 
+class TestJoyentMetadataPipelining:
+    data = {"sdc:uuid": "uuid", "hostname": "host", "user-data": "ud"}
+
+    def client(self, transport):
+        return DataSourceSmartOS.JoyentMetadataClient(
+            fp=transport, smartos_type=DataSourceSmartOS.SMARTOS_ENV_KVM
+        )
+
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_request_many_sends_requests_back_to_back(self, reverse):
+        transport = PipelinedTransport(self.data, reverse=reverse)
+        keys = ["sdc:uuid", "missing", "hostname", "user-data"]
+        values = self.client(transport).request_many(
+            [("GET", key) for key in keys]
+        )
+        assert ["uuid", None, "host", "ud"] == values
+        assert 4 == transport.max_outstanding
+
+    def test_request_many_limits_outstanding_requests(self):
+        transport = PipelinedTransport(self.data)
+        client = self.client(transport)
+        client.pipeline_depth = 2
+        keys = ["sdc:uuid", "missing", "hostname", "user-data"]
+        values = client.request_many([("GET", key) for key in keys])
+        assert ["uuid", None, "host", "ud"] == values
+        assert 2 == transport.max_outstanding
+
+    def test_get_uses_prefetched_values(self):
+        transport = PipelinedTransport(self.data)
+        client = self.client(transport)
+        client.prefetch(["sdc:uuid", "missing", "sdc:uuid"])
+        assert "uuid" == client.get("sdc:uuid")
+        assert "default" == client.get("missing", default="default")
+        assert ["sdc:uuid", "missing"] == transport.keys
+        assert "host" == client.get("hostname")
+        client.prefetch(["sdc:uuid", "hostname"])
+        assert ["sdc:uuid", "missing", "hostname"] == transport.keys
+
+    def test_clear_cache_fetches_again(self):
+        transport = PipelinedTransport(self.data)
+        client = self.client(transport)
+        client.get("sdc:uuid")
+        client.clear_cache()
+        client.get("sdc:uuid")
+        assert ["sdc:uuid", "sdc:uuid"] == transport.keys
+
+    def test_cache_is_not_pickled(self):
+        client = DataSourceSmartOS.JoyentMetadataSocketClient("/sock")
+        client.cache["sdc:uuid"] = "uuid"
+        assert {} == pickle.loads(pickle.dumps(client)).cache
+
+    def test_legacy_prefetch_includes_base64_keys(self):
+        transport = PipelinedTransport(dict(self.data, base64_all="true"))
+        client = DataSourceSmartOS.JoyentMetadataLegacySerialClient(
+            "/dev/ttyS1", smartos_type=DataSourceSmartOS.SMARTOS_ENV_KVM
+        )
+        client.fp = transport
+        client.prefetch(["sdc:uuid"])
+        assert ["sdc:uuid", "base64_all", "base64_keys"] == transport.keys
+
+
 class TestNetworkConversion:
     def test_convert_simple(self):
         expected = {
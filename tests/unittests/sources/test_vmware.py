@@ -8,6 +8,7 @@
 import base64
 import gzip
 import os
+import pickle
 from contextlib import ExitStack
 from logging import DEBUG
 from textwrap import dedent
@@ -456,6 +457,12 @@ class TestDataSourceVMware:
             == ds.extra_hotplug_udev_rules
         )
 
+    def test_guestinfo_cache_is_not_pickled(self, DS):
+        ds = DS(settings.CFG_BUILTIN)
+        ds.guestinfo_cache["metadata"] = VMW_METADATA_YAML
+        assert {} == pickle.loads(pickle.dumps(ds)).guestinfo_cache
+        assert {"metadata": VMW_METADATA_YAML} == ds.guestinfo_cache
+
 
 class TestDataSourceVMwareEnvVars:
     """
@@ -621,7 +628,7 @@ class TestDataSourceVMwareGuestInfo:
     @mock.patch("cloudinit.sources.DataSourceVMware.which")
     def test_get_subplatform(self, m_which_fn, m_fn, DS):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_fn.side_effect = [VMW_METADATA_YAML, "", "", "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": VMW_METADATA_YAML})
         ds = self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
         assert ds.subplatform == "%s (%s)" % (
             DataSourceVMware.DATA_ACCESS_METHOD_GUESTINFO,
@@ -644,7 +651,7 @@ class TestDataSourceVMwareGuestInfo:
         self, m_which_fn, m_fn, DS, tmpdir
     ):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_fn.side_effect = [VMW_METADATA_YAML, "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": VMW_METADATA_YAML})
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -657,7 +664,7 @@ class TestDataSourceVMwareGuestInfo:
         m_exec_vmware_rpctool_fn.side_effect = ProcessExecutionError(
             exit_code=1
         )
-        m_fn.side_effect = [VMW_METADATA_YAML, "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": VMW_METADATA_YAML})
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -667,21 +674,23 @@ class TestDataSourceVMwareGuestInfo:
         self, m_which_fn, m_exec_vmware_rpctool_fn, m_fn, DS, tmpdir
     ):
         m_which_fn.side_effect = ["vmtoolsd", None]
-        m_fn.side_effect = [VMW_METADATA_YAML, "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": VMW_METADATA_YAML})
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
     @mock.patch("cloudinit.sources.DataSourceVMware.which")
     def test_get_data_userdata_only(self, m_which_fn, m_fn, DS):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_fn.side_effect = ["", VMW_USERDATA_YAML, "", ""]
+        m_fn.side_effect = guestinfo_values({"userdata": VMW_USERDATA_YAML})
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
     @mock.patch("cloudinit.sources.DataSourceVMware.which")
     def test_get_data_vendordata_only(self, m_which_fn, m_fn, DS):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_fn.side_effect = ["", "", VMW_VENDORDATA_YAML, ""]
+        m_fn.side_effect = guestinfo_values(
+            {"vendordata": VMW_VENDORDATA_YAML}
+        )
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -691,7 +700,7 @@ class TestDataSourceVMwareGuestInfo:
         metadata = DataSourceVMware.load_json_or_yaml(VMW_METADATA_YAML)
         metadata["public_keys"] = VMW_SINGLE_KEY
         metadata_yaml = safeyaml.dumps(metadata)
-        m_fn.side_effect = [metadata_yaml, "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": metadata_yaml})
         self.assert_metadata(DS, metadata, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -701,7 +710,7 @@ class TestDataSourceVMwareGuestInfo:
         metadata = DataSourceVMware.load_json_or_yaml(VMW_METADATA_YAML)
         metadata["public_keys"] = VMW_MULTIPLE_KEYS
         metadata_yaml = safeyaml.dumps(metadata)
-        m_fn.side_effect = [metadata_yaml, "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": metadata_yaml})
         self.assert_metadata(DS, metadata, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -709,7 +718,9 @@ class TestDataSourceVMwareGuestInfo:
     def test_get_data_metadata_base64(self, m_which_fn, m_fn, DS):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
         data = base64.b64encode(VMW_METADATA_YAML.encode("utf-8"))
-        m_fn.side_effect = [data, "base64", "", ""]
+        m_fn.side_effect = guestinfo_values(
+            {"metadata": data, "metadata.encoding": "base64"}
+        )
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -717,7 +728,9 @@ class TestDataSourceVMwareGuestInfo:
     def test_get_data_metadata_b64(self, m_which_fn, m_fn, DS):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
         data = base64.b64encode(VMW_METADATA_YAML.encode("utf-8"))
-        m_fn.side_effect = [data, "b64", "", ""]
+        m_fn.side_effect = guestinfo_values(
+            {"metadata": data, "metadata.encoding": "b64"}
+        )
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -727,7 +740,9 @@ class TestDataSourceVMwareGuestInfo:
         data = VMW_METADATA_YAML.encode("utf-8")
         data = gzip.compress(data)
         data = base64.b64encode(data)
-        m_fn.side_effect = [data, "gzip+base64", "", ""]
+        m_fn.side_effect = guestinfo_values(
+            {"metadata": data, "metadata.encoding": "gzip+base64"}
+        )
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_get_value")
@@ -737,7 +752,9 @@ class TestDataSourceVMwareGuestInfo:
         data = VMW_METADATA_YAML.encode("utf-8")
         data = gzip.compress(data)
         data = base64.b64encode(data)
-        m_fn.side_effect = [data, "gz+b64", "", ""]
+        m_fn.side_effect = guestinfo_values(
+            {"metadata": data, "metadata.encoding": "gz+b64"}
+        )
         self.assert_get_data_ok(DS, m_fn, m_fn_call_count=4)
 
     @mock.patch("cloudinit.sources.DataSourceVMware.guestinfo_set_value")
@@ -747,7 +764,9 @@ class TestDataSourceVMwareGuestInfo:
         self, m_which_fn, m_get_fn, m_set_fn, DS, tmpdir
     ):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_get_fn.side_effect = [VMW_METADATA_YAML, "", "", "", "", ""]
+        m_get_fn.side_effect = guestinfo_values(
+            {"metadata": VMW_METADATA_YAML}
+        )
         ds = self.assert_get_data_ok(DS, m_get_fn, m_fn_call_count=4)
         supported_events, enabled_events = ds.advertise_update_events({})
         assert 2 == m_set_fn.call_count
@@ -761,7 +780,9 @@ class TestDataSourceVMwareGuestInfo:
         self, m_which_fn, m_get_fn, m_set_fn, DS, tmpdir
     ):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_get_fn.side_effect = [VMW_METADATA_YAML, "", "", "", "", ""]
+        m_get_fn.side_effect = guestinfo_values(
+            {"metadata": VMW_METADATA_YAML}
+        )
         ds = self.assert_get_data_ok(DS, m_get_fn, m_fn_call_count=4)
         supported_events, enabled_events = ds.advertise_update_events(
             {
@@ -782,14 +803,9 @@ class TestDataSourceVMwareGuestInfo:
         self, m_which_fn, m_get_fn, DS, tmpdir
     ):
         m_which_fn.side_effect = ["vmtoolsd", "vmware-rpctool"]
-        m_get_fn.side_effect = [
-            VMW_METADATA_YAML_WITH_NET_DRIVERS,
-            "",
-            "",
-            "",
-            "",
-            "",
-        ]
+        m_get_fn.side_effect = guestinfo_values(
+            {"metadata": VMW_METADATA_YAML_WITH_NET_DRIVERS}
+        )
         ds = self.assert_get_data_ok(DS, m_get_fn, m_fn_call_count=4)
         ds.init_extra_hotplug_udev_rules()
 
@@ -799,6 +815,100 @@ class TestDataSourceVMwareGuestInfo:
         )
 
 
+class TestGuestInfoBatch:
+    """
+    Test reading and writing many guestinfo keys at once.
+    """
+
+    @mock.patch(MPATH + "guestinfo_get_value")
+    def test_get_values_only_queries_uncached_keys(self, m_get_fn):
+        m_get_fn.side_effect = guestinfo_values({"userdata": "ud"})
+        cache = {"metadata": "md"}
+        values = DataSourceVMware.guestinfo_get_values(
+            ["metadata", "userdata", "vendordata"], "rpctool", len, cache
+        )
+        assert {"metadata": "md", "userdata": "ud", "vendordata": None} == (
+            values
+        )
+        assert [
+            mock.call("userdata", "rpctool", len),
+            mock.call("vendordata", "rpctool", len),
+        ] == sorted(m_get_fn.call_args_list)
+        assert values == cache
+
+    @mock.patch(MPATH + "guestinfo_get_value")
+    def test_get_values_raises_query_errors(self, m_get_fn):
+        def get_value(key, rpctool, rpctool_fn):
+            if key == "userdata":
+                raise ProcessExecutionError(exit_code=1)
+            return key
+
+        m_get_fn.side_effect = get_value
+        with pytest.raises(ProcessExecutionError):
+            DataSourceVMware.guestinfo_get_values(
+                ["metadata", "userdata"], "rpctool", len
+            )
+
+    @mock.patch(MPATH + "guestinfo_get_value")
+    def test_keys_only_queries_encodings_of_found_values(self, m_get_fn):
+        m_get_fn.side_effect = guestinfo_values(
+            {
+                "metadata": base64.b64encode(b"md"),
+                "metadata.encoding": "base64",
+                "userdata": "ud",
+            }
+        )
+        data = DataSourceVMware.guestinfo_keys(
+            ("metadata", "userdata", "vendordata"), "rpctool", len
+        )
+        assert {"metadata": "md", "userdata": "ud", "vendordata": None} == (
+            data
+        )
+        assert 5 == m_get_fn.call_count
+        assert mock.call("vendordata.encoding", "rpctool", len) not in (
+            m_get_fn.call_args_list
+        )
+
+    @mock.patch(MPATH + "guestinfo_set_value")
+    def test_set_values_skips_unchanged_keys(self, m_set_fn):
+        m_set_fn.return_value = True
+        cache = {"metadata": None, "metadata.encoding": "base64"}
+        results = DataSourceVMware.guestinfo_set_values(
+            {"metadata": "---", "metadata.encoding": ""},
+            "rpctool",
+            len,
+            cache,
+        )
+        assert {"metadata": True, "metadata.encoding": True} == results
+        assert [
+            mock.call("metadata.encoding", "", "rpctool", len)
+        ] == m_set_fn.call_args_list
+        assert {"metadata": None, "metadata.encoding": None} == cache
+
+    @mock.patch(MPATH + "guestinfo_set_value")
+    def test_set_values_forgets_keys_which_failed(self, m_set_fn):
+        m_set_fn.side_effect = lambda key, *args: key == "local-ipv4"
+        cache = {"local-ipv6": "fd42::1"}
+        results = DataSourceVMware.guestinfo_set_values(
+            {"local-ipv4": "10.0.0.2", "local-ipv6": "fd42::2"},
+            "rpctool",
+            len,
+            cache,
+        )
+        assert {"local-ipv4": True, "local-ipv6": False} == results
+        assert {"local-ipv4": "10.0.0.2"} == cache
+
+    @mock.patch(MPATH + "guestinfo_set_value")
+    def test_redact_keys_logs_failures(self, m_set_fn, caplog):
+        m_set_fn.side_effect = lambda key, *args: key != "userdata.encoding"
+        DataSourceVMware.guestinfo_redact_keys(
+            ["metadata", "userdata"], "rpctool", len
+        )
+        assert 4 == m_set_fn.call_count
+        assert "failed to clear guestinfo.userdata.encoding" in caplog.text
+        assert "failed to clear guestinfo.metadata" not in caplog.text
+
+
 class TestDataSourceVMwareGuestInfo_InvalidPlatform:
     """
     Test the guestinfo transport on a non-VMware platform.
@@ -816,7 +926,7 @@ class TestDataSourceVMwareGuestInfo_InvalidPlatform:
         system_type = dmi.read_dmi_data("system-product-name")
         assert system_type is None
 
-        m_fn.side_effect = [VMW_METADATA_YAML, "", "", "", "", ""]
+        m_fn.side_effect = guestinfo_values({"metadata": VMW_METADATA_YAML})
         ds = DS(settings.CFG_BUILTIN)
         ret = ds.get_data()
         assert not ret
@@ -1513,6 +1623,15 @@ class TestDataSourceVMwareIMC_MarkerFiles:
         assert os.path.exists(markerfilepath)
 
 
+def guestinfo_values(values):
+    """Return a guestinfo_get_value side_effect serving values by key."""
+
+    def get_value(key, rpctool, rpctool_fn):
+        return values.get(key)
+
+    return get_value
+
+
 def assert_metadata(ds, metadata):
     assert metadata.get("instance-id") == ds.get_instance_id()
     assert metadata.get("local-hostname") == ds.get_hostname().hostname
@@ -269,7 +269,7 @@ class TestCmdlineUrl:
         cmdline = "root=foo bar single url=http://example.com arg1 -v"
         assert ("url", "http://example.com") == main.parse_cmdline_url(cmdline)
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_invalid_content(self, m_read, tmpdir):
         key = "cloud-config-url"
         url = "http://example.com/foo"
@@ -286,7 +286,7 @@ class TestCmdlineUrl:
         assert url in msg
         assert False is os.path.exists(fpath)
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_invalid_content_url(self, m_read, tmpdir):
         key = "cloud-config-url"
         url = "http://example.com/foo"
@@ -306,7 +306,7 @@ class TestCmdlineUrl:
         assert url in msg
         assert False is os.path.exists(fpath)
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_valid_content(self, m_read, tmpdir):
         url = "http://example.com/foo"
         payload = b"#cloud-config\nmydata: foo\nbar: wark\n"
@@ -323,7 +323,7 @@ class TestCmdlineUrl:
         assert logging.INFO == lvl
         assert url in msg
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_valid_content_url(self, m_read, tmpdir):
         url = "http://example.com/foo"
         payload = b"#cloud-config\nmydata: foo\nbar: wark\n"
@@ -340,7 +340,7 @@ class TestCmdlineUrl:
         assert logging.INFO == lvl
         assert url in msg
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_no_key_found(self, m_read, tmpdir):
         cmdline = "ro mykey=http://example.com/foo root=foo"
         fpath = tmpdir.join("ccfile")
@@ -352,7 +352,7 @@ class TestCmdlineUrl:
         assert False is os.path.exists(fpath)
         assert logging.DEBUG == lvl
 
-    @mock.patch("cloudinit.cmd.main.url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_exception_warns(self, m_read, tmpdir):
         url = "http://example.com/foo"
         cmdline = "ro cloud-config-url=%s root=LABEL=bar" % url
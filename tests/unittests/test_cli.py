@@ -5,13 +5,14 @@ import io
 import json
 import logging
 import os
+import subprocess
 import sys
 from collections import namedtuple
 from unittest import mock
 
 import pytest
 
-from cloudinit import helpers
+from cloudinit import helpers, performance
 from cloudinit.cmd import main as cli
 from tests.unittests import helpers as test_helpers
 
@@ -33,7 +34,7 @@ def mock_status_wrapper(mocker, tmpdir):
     link_d = os.path.join(tmpdir, "link")
     data_d = os.path.join(tmpdir, "data")
     mocker.patch(
-        "cloudinit.cmd.main.read_cfg_paths",
+        "cloudinit.cmd.devel.read_cfg_paths",
         return_value=mock.Mock(get_cpath=lambda _: data_d),
     )
     mocker.patch("cloudinit.cmd.main.os.path.normpath", return_value=link_d)
@@ -345,6 +346,43 @@ class TestCLI:
         assert False is parseargs.debug
         assert False is parseargs.force
 
+    def test_main_does_not_import_boot_stage_dependencies(self):
+        """Importing the CLI leaves boot stage modules to their handlers."""
+        code = (
+            "import sys\n"
+            "import cloudinit.cmd.main\n"
+            "print(sorted(m for m in ('cloudinit.stages', 'cloudinit.sources',"
+            " 'cloudinit.config.schema', 'requests') if m in sys.modules))"
+        )
+        out = subprocess.check_output([sys.executable, "-c", code])
+        assert b"[]\n" == out
+
+    @mock.patch("cloudinit.reporting.events.report_event")
+    def test_profile_imports_reports_import_events(self, m_report, mocker):
+        """--profile-imports reports each top-level import as an event."""
+
+        def fake_features(name, args):
+            import cloudinit.analyze.show  # noqa: F401
+
+        mocker.patch.dict(sys.modules)
+        sys.modules.pop("cloudinit.analyze.show", None)
+        mocker.patch(M_PATH + "main_features", side_effect=fake_features)
+        self._call_main(["cloud-init", "--profile-imports", "features"])
+        assert not any(
+            isinstance(finder, performance.ImportProfiler)
+            for finder in sys.meta_path
+        )
+        reported = [
+            (event.event_type, event.name)
+            for (event,), _ in m_report.call_args_list
+        ]
+        assert ("start", "features") == reported[0]
+        assert ("finish", "features") == reported[-1]
+        assert [
+            ("start", "features/import-cloudinit.analyze.show"),
+            ("finish", "features/import-cloudinit.analyze.show"),
+        ] == reported[1:-1]
+
     def test_all_stages_with_tty(self, mocker, fake_socket):
         """Ensure all stages get called when using a tty."""
         mocker.patch("cloudinit.cmd.main.os.isatty", return_value=True)
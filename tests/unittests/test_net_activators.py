@@ -1,4 +1,6 @@
 import logging
+import threading
+import time
 from collections import namedtuple
 from contextlib import ExitStack
 from unittest.mock import patch
@@ -15,6 +17,7 @@ from cloudinit.net.activators import (
     NetworkdActivator,
     NetworkManagerActivator,
     NoActivatorException,
+    _bring_up_order,
     search_activator,
     select_activator,
 )
@@ -327,6 +330,76 @@ class TestActivatorsBringUpAll:
             assert call in expected_call_list
 
 
+DEPENDENT_CONFIG = """\
+version: 1
+config:
+- type: physical
+  name: eth0
+- type: physical
+  name: eth1
+- type: physical
+  name: eth2
+- type: bond
+  name: bond0
+  bond_interfaces: [eth0, eth1]
+  params:
+    bond-mode: active-backup
+- type: vlan
+  name: bond0.100
+  vlan_link: bond0
+  vlan_id: 100
+- type: bridge
+  name: br0
+  bridge_interfaces: [eth2]
+- type: physical
+  name: eth3
+"""
+
+
+class TestBringUpAllInDependencyOrder:
+    def test_bring_up_order(self):
+        network_state = parse_net_config_data(yaml.safe_load(DEPENDENT_CONFIG))
+        assert [
+            ["eth0", "eth1", "eth2", "eth3"],
+            ["bond0", "br0"],
+            ["bond0.100"],
+        ] == _bring_up_order(network_state)
+
+    def test_independent_interfaces_are_brought_up_concurrently(self):
+        """Each group is brought up concurrently, with at most
+        MAX_BRING_UP_WORKERS at once, and every failure is reported."""
+        network_state = parse_net_config_data(yaml.safe_load(DEPENDENT_CONFIG))
+        lock = threading.Lock()
+        running = []
+        started = []
+        most_running = 0
+
+        def bring_up_interface(device_name):
+            nonlocal most_running
+            with lock:
+                started.append(device_name)
+                running.append(device_name)
+                most_running = max(most_running, len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(device_name)
+            return device_name != "eth1"
+
+        with patch(
+            "cloudinit.net.activators.MAX_BRING_UP_WORKERS", 3
+        ), patch.object(
+            IfUpDownActivator,
+            "bring_up_interface",
+            side_effect=bring_up_interface,
+        ):
+            assert not IfUpDownActivator.bring_up_all_interfaces(network_state)
+        assert 3 == most_running
+        assert ["bond0", "br0", "bond0.100"] == [
+            device for device in started if not device.startswith("eth")
+        ]
+        assert 7 == len(started)
+
+
 IF_UP_DOWN_BRING_DOWN_CALL_LIST: list = [
     ((["ifdown", "eth0"],), {}),
     ((["ifdown", "eth1"],), {}),
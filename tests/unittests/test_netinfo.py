@@ -2,13 +2,16 @@
 
 """Tests netinfo module functions and classes."""
 
+import errno
 import json
+import socket
 from copy import copy
 from unittest import mock
 
 import pytest
 
 from cloudinit import subp
+from cloudinit.net import netlink
 from cloudinit.netinfo import (
     _netdev_info_iproute_json,
     netdev_info,
@@ -376,3 +379,151 @@ class TestNetInfo:
     def test_netdev_info_iproute_json(self, input, expected):
         out = _netdev_info_iproute_json(json.dumps(input))
         assert out == expected
+
+
+def _fake_netlink_client(mocker, **dumps):
+    client = mock.Mock(spec=netlink.RtnetlinkClient)
+    client.__enter__ = mock.Mock(return_value=client)
+    client.__exit__ = mock.Mock(return_value=False)
+    for name, value in dumps.items():
+        if isinstance(value, Exception):
+            getattr(client, name).side_effect = value
+        elif isinstance(value, dict):
+            getattr(client, name).side_effect = value.get
+        else:
+            getattr(client, name).return_value = value
+    mocker.patch.object(netlink, "RtnetlinkClient", return_value=client)
+    return client
+
+
+LINKS = [
+    netlink.NetlinkLink(1, "lo", 772, 0x10049, "00:00:00:00:00:00"),
+    netlink.NetlinkLink(3, "wlp3s0", 1, 0x1003, "aa:bb:cc:dd:ee:ff"),
+    netlink.NetlinkLink(23, "enp0s25", 1, 0x11043, "50:7b:9d:2c:af:91"),
+]
+
+
+def _route(family, dst, dst_len, oif, **kwargs):
+    route = {
+        "family": family,
+        "dst_len": dst_len,
+        "table": 254,
+        "type": 1,
+        "dst": dst,
+        "gateway": None,
+        "oif": oif,
+        "priority": None,
+        "expires": 0,
+    }
+    route.update(kwargs)
+    return netlink.NetlinkRoute(**route)
+
+
+class TestNetInfoNetlink:
+    """netdev_info and route_info answer from rtnetlink like iproute2."""
+
+    @pytest.fixture(autouse=True)
+    def m_subp(self, mocker):
+        return mocker.patch(
+            "cloudinit.netinfo.subp.subp",
+            side_effect=AssertionError("Unexpected subp call"),
+        )
+
+    def test_netdev_info_matches_ip_json(self, mocker):
+        v4, v6 = socket.AF_INET, socket.AF_INET6
+        _fake_netlink_client(
+            mocker,
+            get_links=[LINKS[0], LINKS[2]],
+            get_addresses=[
+                netlink.NetlinkAddress(
+                    1, v4, 8, 254, "127.0.0.1", "127.0.0.1", None
+                ),
+                netlink.NetlinkAddress(
+                    23,
+                    v4,
+                    24,
+                    0,
+                    "192.168.2.18",
+                    "192.168.2.18",
+                    "192.168.2.255",
+                ),
+                netlink.NetlinkAddress(1, v6, 128, 254, "::1", None, None),
+                netlink.NetlinkAddress(
+                    23, v6, 64, 0, "fe80::7777:2222:1111:eeee", None, None
+                ),
+                netlink.NetlinkAddress(
+                    23, v6, 64, 253, "fe80::8107:2b92:867e:f8a6", None, None
+                ),
+            ],
+        )
+        expected = _netdev_info_iproute_json(SAMPLE_IPADDRSHOW_JSON)
+        assert expected == netdev_info()
+
+    def test_netdev_info_peer_address(self, mocker):
+        """Point-to-point peers are reported like ip --json addr."""
+        _fake_netlink_client(
+            mocker,
+            get_links=[LINKS[2]],
+            get_addresses=[
+                netlink.NetlinkAddress(
+                    23, socket.AF_INET6, 64, 0, "fd::2", "fd::1", None
+                ),
+            ],
+        )
+        assert [{"ip": "fd::1", "scope6": "global"}] == netdev_info()[
+            "enp0s25"
+        ]["ipv6"]
+
+    def test_route_pformat_matches_ip_route(self, mocker):
+        v4, v6 = socket.AF_INET, socket.AF_INET6
+        ra = "fe80::32ee:54de:cd43:b4e1"
+        routes = {
+            v4: [
+                _route(v4, None, 0, 23, gateway="192.168.2.1", priority=100),
+                _route(v4, None, 0, 3, gateway="192.168.2.1", priority=150),
+                _route(v4, "192.168.2.0", 24, 23, priority=100),
+                _route(v4, "127.0.0.1", 32, 1, table=255, type=2),
+            ],
+            v6: [
+                _route(
+                    v6,
+                    "2a00:abcd:82ae:cd33::657",
+                    128,
+                    23,
+                    priority=256,
+                    expires=2334,
+                ),
+                _route(v6, "2a00:abcd:82ae:cd33::", 64, 23, priority=100),
+                _route(
+                    v6,
+                    "2a00:abcd:82ae:cd33::",
+                    56,
+                    23,
+                    gateway=ra,
+                    priority=100,
+                ),
+                _route(v6, "fd81:123f:654::657", 128, 23, priority=256),
+                _route(v6, "fd81:123f:654::", 64, 23, priority=100),
+                _route(
+                    v6, "fd81:123f:654::", 48, 23, gateway=ra, priority=100
+                ),
+                _route(v6, "fe80::abcd:ef12:bc34:da21", 128, 23, priority=100),
+                _route(v6, "fe80::", 64, 23, priority=256),
+                _route(v6, None, 0, 23, gateway=ra, priority=100),
+                _route(v6, "::1", 128, 1, table=255, type=2, priority=0),
+            ],
+        }
+        _fake_netlink_client(mocker, get_links=LINKS, get_routes=routes)
+        assert ROUTE_FORMATTED_OUT == route_pformat()
+
+    @mock.patch("cloudinit.netinfo.subp.which", return_value="/sbin/ip")
+    def test_falls_back_to_ip_when_dump_fails(self, m_which, m_subp, mocker):
+        _fake_netlink_client(
+            mocker,
+            get_links=netlink.NetlinkRequestError("interrupted", errno.EINTR),
+        )
+        m_subp.side_effect = None
+        m_subp.return_value = (SAMPLE_IPADDRSHOW_JSON, "")
+        expected = _netdev_info_iproute_json(SAMPLE_IPADDRSHOW_JSON)
+        assert expected == netdev_info()
+        assert [mock.call(["ip", "--json", "addr"])] == m_subp.call_args_list
@@ -0,0 +1,72 @@
+# This file is part of cloud-init. See LICENSE file for license information.
+
+import importlib
+import sys
+
+import pytest
+
+from cloudinit import performance
+
+
+@pytest.fixture
+def fake_package(tmp_path, mocker):
+    """A throwaway package whose modules are imported fresh by each test."""
+    pkg = tmp_path / "fakepkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "inner.py").write_text("")
+    (pkg / "outer.py").write_text("from fakepkg import inner  # noqa\n")
+    mocker.patch.object(sys, "path", [str(tmp_path)] + sys.path)
+    mocker.patch.dict(sys.modules)
+    yield pkg
+
+
+class TestImportProfiler:
+    def test_records_nested_imports_under_top_level(self, fake_package):
+        profiler = performance.ImportProfiler()
+        profiler.start()
+        try:
+            importlib.import_module("fakepkg.outer")
+        finally:
+            profiler.stop()
+
+        timings = profiler.timings
+        assert [
+            ("fakepkg", 0),
+            ("fakepkg.inner", 1),
+            ("fakepkg.outer", 0),
+        ] == [(t.name, t.depth) for t in timings]
+        # The parent package import finishes before its submodule starts
+        assert ["fakepkg", "fakepkg.outer"] == [
+            t.name for t in profiler.collect()
+        ]
+        assert timings[2].duration >= timings[1].duration
+        assert [] == profiler.timings
+        assert [] == profiler.collect()
+
+    def test_stop_restores_finders(self, fake_package):
+        meta_path = list(sys.meta_path)
+        profiler = performance.ImportProfiler()
+        profiler.start()
+        profiler.start()
+        assert [profiler] == sys.meta_path
+        profiler.stop()
+        assert meta_path == sys.meta_path
+        importlib.import_module("fakepkg")
+        assert [] == profiler.timings
+
+    def test_unknown_module_is_looked_up_once(self, mocker):
+        finder = mocker.Mock(spec=["find_spec"])
+        finder.find_spec.return_value = None
+        mocker.patch.object(sys, "meta_path", [finder] + sys.meta_path)
+        profiler = performance.ImportProfiler()
+        profiler.start()
+        try:
+            with pytest.raises(ImportError):
+                importlib.import_module("fakepkg_does_not_exist")
+        finally:
+            profiler.stop()
+        assert [] == profiler.timings
+        finder.find_spec.assert_called_once_with(
+            "fakepkg_does_not_exist", None, None
+        )
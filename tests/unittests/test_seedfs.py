@@ -0,0 +1,361 @@
+# This file is part of cloud-init. See LICENSE file for license information.
+
+"""Tests for cloudinit.seedfs"""
+
+import os
+import struct
+from unittest import mock
+
+import pytest
+
+from cloudinit import seedfs, util
+
+M_PATH = "cloudinit.seedfs."
+
+SECTOR = 2048
+
+SEED = {
+    "meta-data": b"instance-id: iid-seedfs\n",
+    "user-data": b"#cloud-config\n",
+    "openstack": {"latest": {"meta_data.json": b'{"uuid": "1"}' * 200}},
+    "empty": b"",
+}
+
+
+def iso_record(extent, size, flags, name, system_use=b""):
+    pad = b"\0" if len(name) % 2 == 0 else b""
+    length = 33 + len(name) + len(pad) + len(system_use)
+    return (
+        struct.pack(
+            "<BBIIII7xBBBHHB",
+            length,
+            0,
+            extent,
+            0,
+            size,
+            0,
+            flags,
+            0,
+            0,
+            1,
+            1,
+            len(name),
+        )
+        + name
+        + pad
+        + system_use
+    )
+
+
+def nm_entry(name):
+    return b"NM" + bytes([5 + len(name), 1, 0]) + name
+
+
+def build_iso(tree, rock_ridge=False, joliet=False):
+    """Build an ISO9660 image of tree, a dict of names to bytes or dicts.
+
+    Each directory fits in a single sector. Plain ISO9660 names are the
+    uppercased names with a version.
+    """
+    sectors = {}
+    next_sector = [20]
+
+    def alloc(count):
+        start = next_sector[0]
+        next_sector[0] += max(count, 1)
+        return start
+
+    def add_dir(node, parent_extent, is_root, encode):
+        extent = alloc(1)
+        records = []
+        for name, value in sorted(node.items()):
+            if isinstance(value, dict):
+                child = add_dir(value, extent, False, encode)
+                records.append(
+                    iso_record(child, SECTOR, 2, *encode(name, True))
+                )
+            else:
+                data_extent = alloc(-(-len(value) // SECTOR)) if value else 0
+                if value:
+                    sectors[data_extent] = value
+                records.append(
+                    iso_record(
+                        data_extent, len(value), 0, *encode(name, False)
+                    )
+                )
+        dot_su = b""
+        if is_root and encode is plain:
+            dot_su = b"SP\x07\x01\xbe\xef\x00" if rock_ridge else b""
+        data = (
+            iso_record(extent, SECTOR, 2, b"\0", dot_su)
+            + iso_record(parent_extent or extent, SECTOR, 2, b"\1")
+            + b"".join(records)
+        )
+        assert len(data) <= SECTOR
+        sectors[extent] = data
+        return extent
+
+    def plain(name, is_dir):
+        iso_name = name.upper().encode()
+        if not is_dir:
+            iso_name += b";1"
+        return iso_name, nm_entry(name.encode()) if rock_ridge else b""
+
+    def ucs2(name, is_dir):
+        return (name + ("" if is_dir else ";1")).encode("utf-16-be"), b""
+
+    def descriptor(kind, root, escapes=b""):
+        desc = bytearray(SECTOR)
+        desc[0] = kind
+        desc[1:7] = b"CD001\x01"
+        desc[88 : 88 + len(escapes)] = escapes
+        struct.pack_into("<H", desc, 128, SECTOR)
+        record = iso_record(root, SECTOR, 2, b"\0")
+        desc[156 : 156 + len(record)] = record
+        return bytes(desc)
+
+    descriptors = [descriptor(1, add_dir(tree, None, True, plain))]
+    if joliet:
+        descriptors.append(
+            descriptor(2, add_dir(tree, None, True, ucs2), b"%/E")
+        )
+    descriptors.append(descriptor(255, 0))
+    for sector, data in enumerate(descriptors, 16):
+        sectors[sector] = data
+    image = bytearray(next_sector[0] * SECTOR)
+    for sector, data in sectors.items():
+        image[sector * SECTOR : sector * SECTOR + len(data)] = data
+    return bytes(image)
+
+
+def fat_entries(name, attr, cluster, size):
+    """Return the directory entries of a file, with long names if needed."""
+    base, _, ext = name.partition(".")
+    short = (base.upper()[:8].ljust(8) + ext.upper()[:3].ljust(3)).encode()
+    ntres = 0
+    if base.islower():
+        ntres |= 0x08
+    if ext.islower():
+        ntres |= 0x10
+    entry = short + struct.pack(
+        "<BB7xH4xHI", attr, ntres, cluster >> 16, cluster & 0xFFFF, size
+    )
+    if len(base) <= 8 and len(ext) <= 3 and "-" not in name:
+        return [entry]
+    checksum = 0
+    for byte in short:
+        checksum = (((checksum & 1) << 7) + (checksum >> 1) + byte) & 0xFF
+    chars = name.encode("utf-16-le") + b"\0\0"
+    chars += b"\xff" * (-len(chars) % 26)
+    entries: list = []
+    for index in range(len(chars) // 26):
+        part = chars[index * 26 : index * 26 + 26]
+        sequence = index + 1
+        if index == len(chars) // 26 - 1:
+            sequence |= 0x40
+        entries.insert(
+            0,
+            bytes([sequence])
+            + part[:10]
+            + bytes([0x0F, 0, checksum])
+            + part[10:22]
+            + b"\0\0"
+            + part[22:],
+        )
+    return entries + [entry]
+
+
+def build_fat12(tree):
+    """Build a FAT12 image of tree with 512 byte sectors and clusters."""
+    total_sectors = 128
+    fat = [0xFF8, 0xFFF]
+    clusters = {}
+
+    def alloc(data):
+        if not data:
+            return 0
+        first = len(fat)
+        count = -(-len(data) // 512)
+        for index in range(count):
+            fat.append(first + index + 1 if index < count - 1 else 0xFFF)
+            clusters[first + index] = data[index * 512 : index * 512 + 512]
+        return first
+
+    def directory(node):
+        entries = []
+        for name, value in sorted(node.items()):
+            if isinstance(value, dict):
+                children = b"".join(directory(value)) or b"\0" * 32
+                cluster = alloc(children)
+                entries.extend(fat_entries(name, 0x10, cluster, 0))
+            else:
+                entries.extend(
+                    fat_entries(name, 0x20, alloc(value), len(value))
+                )
+        return entries
+
+    label = b"CIDATA     " + bytes([0x08]) + b"\0" * 20
+    root = label + b"".join(directory(tree))
+    boot = bytearray(512)
+    boot[0:3] = b"\xeb\x3c\x90"
+    struct.pack_into("<HBHBHH", boot, 11, 512, 1, 1, 2, 16, total_sectors)
+    boot[21] = 0xF8
+    struct.pack_into("<H", boot, 22, 1)
+    boot[510:512] = b"\x55\xaa"
+    fat_bytes = bytearray(512)
+    for cluster, value in enumerate(fat):
+        offset = cluster + cluster // 2
+        current = struct.unpack_from("<H", fat_bytes, offset)[0]
+        if cluster & 1:
+            current = (current & 0x000F) | (value << 4)
+        else:
+            current = (current & 0xF000) | value
+        struct.pack_into("<H", fat_bytes, offset, current)
+    image = bytearray(total_sectors * 512)
+    image[0:512] = boot
+    image[512:1024] = fat_bytes
+    image[1024:1536] = fat_bytes
+    image[1536 : 1536 + len(root)] = root
+    for cluster, data in clusters.items():
+        offset = (4 + cluster - 2) * 512
+        image[offset : offset + len(data)] = data
+    return bytes(image)
+
+
+def read_tree(path):
+    tree = {}
+    for name in os.listdir(path):
+        child = os.path.join(path, name)
+        if os.path.isdir(child):
+            tree[name] = read_tree(child)
+        else:
+            with open(child, "rb") as stream:
+                tree[name] = stream.read()
+    return tree
+
+
+@pytest.fixture
+def device(tmp_path):
+    def _device(image):
+        path = tmp_path / "device"
+        path.write_bytes(image)
+        return str(path)
+
+    return _device
+
+
+class TestExtract:
+    @pytest.mark.parametrize(
+        "image",
+        [
+            pytest.param(build_iso(SEED, rock_ridge=True), id="rock_ridge"),
+            pytest.param(build_iso(SEED, joliet=True), id="joliet"),
+            pytest.param(
+                build_iso(SEED, rock_ridge=True, joliet=True),
+                id="rock_ridge_and_joliet",
+            ),
+            pytest.param(build_fat12(SEED), id="vfat"),
+        ],
+    )
+    def test_extracts_files(self, image, device, tmp_path):
+        target = tmp_path / "target"
+        target.mkdir()
+        fstype = seedfs.extract(device(image), str(target))
+        assert fstype in (seedfs.ISO9660, seedfs.VFAT)
+        assert SEED == read_tree(str(target))
+
+    def test_plain_iso9660_names_are_lowercased(self, device, tmp_path):
+        tree = {"meta-data": b"md", "seed": {"user-data": b"ud"}}
+        target = tmp_path / "target"
+        target.mkdir()
+        seedfs.extract(device(build_iso(tree)), str(target))
+        assert tree == read_tree(str(target))
+
+    def test_vfat_short_names_keep_their_case(self, device, tmp_path):
+        image = build_fat12({"CONTEXT.SH": b"A=1", "ovf.xml": b"<x/>"})
+        target = tmp_path / "target"
+        target.mkdir()
+        seedfs.extract(device(image), str(target))
+        assert {"CONTEXT.SH": b"A=1", "ovf.xml": b"<x/>"} == read_tree(
+            str(target)
+        )
+
+    @pytest.mark.parametrize(
+        "mtypes,image",
+        [
+            (["vfat"], build_iso(SEED, rock_ridge=True)),
+            (["iso9660"], build_fat12(SEED)),
+            (["ext4"], build_iso(SEED, rock_ridge=True)),
+            (None, b"\0" * 64 * 1024),
+        ],
+    )
+    def test_unsupported_filesystems_raise(
+        self, mtypes, image, device, tmp_path
+    ):
+        with pytest.raises(seedfs.UnsupportedFilesystem):
+            seedfs.extract(device(image), str(tmp_path), mtypes)
+
+    def test_too_large_raises(self, device, tmp_path):
+        with pytest.raises(seedfs.UnsupportedFilesystem, match="more than"):
+            seedfs.extract(
+                device(build_fat12(SEED)), str(tmp_path), max_size=100
+            )
+
+    def test_truncated_image_raises(self, device, tmp_path):
+        image = build_iso(SEED, rock_ridge=True)
+        with pytest.raises(seedfs.UnsupportedFilesystem, match="Short read"):
+            seedfs.extract(device(image[: 21 * SECTOR]), str(tmp_path))
+
+    def test_invalid_names_raise(self, device, tmp_path):
+        image = build_iso({"x": b"x"}, rock_ridge=True)
+        image = image.replace(nm_entry(b"x"), nm_entry(b"/"))
+        with pytest.raises(seedfs.UnsupportedFilesystem, match="Invalid"):
+            seedfs.extract(device(image), str(tmp_path))
+
+    def test_partial_extraction_is_removed(self, device, tmp_path):
+        target = tmp_path / "target"
+        target.mkdir()
+        with mock.patch(
+            M_PATH + "Filesystem.read_entry", side_effect=OSError("EIO")
+        ):
+            with pytest.raises(OSError):
+                seedfs.extract(device(build_fat12(SEED)), str(target))
+        assert [] == os.listdir(str(target))
+
+
+class TestReadableTypes:
+    @pytest.mark.parametrize(
+        "mtypes,expected",
+        [
+            (None, [seedfs.ISO9660, seedfs.VFAT]),
+            (["auto"], [seedfs.ISO9660, seedfs.VFAT]),
+            (["cd9660", "msdos"], [seedfs.ISO9660, seedfs.VFAT]),
+            (["vfat", "fat", "msdosfs"], [seedfs.VFAT]),
+            (["ntfs"], []),
+            (["udf"], []),
+        ],
+    )
+    def test_readable_types(self, mtypes, expected):
+        assert expected == seedfs.readable_types(mtypes)
+
+
+class TestMountCb:
+    def test_reads_without_mounting(self, device):
+        path = device(build_iso(SEED, joliet=True))
+
+        def callback(mountpoint):
+            return read_tree(mountpoint)
+
+        with mock.patch("cloudinit.util.subp.subp") as m_subp:
+            assert SEED == util.mount_cb(path, callback, mtype="iso9660")
+        assert 0 == m_subp.call_count
+
+    def test_falls_back_to_mount(self, device):
+        path = device(b"\0" * 64 * 1024)
+        with mock.patch("cloudinit.util.subp.subp") as m_subp:
+            util.mount_cb(path, mock.Mock(), mtype="iso9660")
+        mount, umount = m_subp.call_args_list
+        assert ["mount", "-o", "ro", "-t", "iso9660", path] == (
+            mount[0][0][:-1]
+        )
+        assert "umount" == umount[0][0][0]
@@ -300,3 +300,87 @@ class TestSubp:
             decode=False,
         )
         assert self.utf8_valid == out
+
+
+class TestProbe:
+    @pytest.fixture
+    def m_subp(self):
+        with mock.patch.object(
+            subp, "subp", return_value=subp.SubpResult("out", "")
+        ) as m_subp:
+            yield m_subp
+
+    def test_runs_every_call_when_disabled(self, m_subp):
+        """Without an enabled cache probe() is a plain subp() call."""
+        subp.probe(["blkid"], capture=True)
+        subp.probe(["blkid"], capture=True)
+        assert [
+            mock.call(["blkid"], capture=True),
+            mock.call(["blkid"], capture=True),
+        ] == m_subp.call_args_list
+
+    def test_replays_cached_result(self, m_subp):
+        subp.configure_probe_cache("stage")
+        assert ("out", "") == subp.probe(["blkid"], rcs=[0, 2])
+        assert ("out", "") == subp.probe(["blkid"], rcs=[0, 2])
+        assert 1 == m_subp.call_count
+        assert {
+            "hits": 1,
+            "misses": 1,
+            "entries": 1,
+        } == subp.probe_cache.stats()
+
+    def test_key_includes_args_env_and_options(self, m_subp):
+        subp.configure_probe_cache("stage")
+        subp.probe(["ip", "addr"])
+        subp.probe(["ip", "route"])
+        subp.probe(["ip", "addr"], rcs=[0, 1])
+        subp.probe(["ip", "addr"], update_env={"LANG": "C"})
+        with mock.patch.dict(os.environ, {"CI_PROBE_TEST": "1"}):
+            subp.probe(["ip", "addr"])
+        subp.probe(["ip", "addr"], logstring="ip addr")
+        assert 5 == m_subp.call_count
+
+    def test_replays_process_execution_error(self, m_subp):
+        m_subp.side_effect = subp.ProcessExecutionError(exit_code=1)
+        subp.configure_probe_cache("stage")
+        for _ in range(2):
+            with pytest.raises(subp.ProcessExecutionError):
+                subp.probe(["systemd-detect-virt", "--quiet", "--container"])
+        assert 1 == m_subp.call_count
+
+    def test_data_is_never_cached(self, m_subp):
+        subp.configure_probe_cache("stage")
+        subp.probe(["cat"], data="in")
+        subp.probe(["cat"], data="in")
+        assert 2 == m_subp.call_count
+
+    def test_invalidate_by_command_name(self, m_subp):
+        subp.configure_probe_cache("stage")
+        subp.probe(["/sbin/blkid", "-o", "full"])
+        subp.probe(["ip", "addr"])
+        subp.probe_cache.invalidate("blkid")
+        subp.probe(["/sbin/blkid", "-o", "full"])
+        subp.probe(["ip", "addr"])
+        assert [
+            mock.call(["/sbin/blkid", "-o", "full"]),
+            mock.call(["ip", "addr"]),
+            mock.call(["/sbin/blkid", "-o", "full"]),
+        ] == m_subp.call_args_list
+
+    @pytest.mark.parametrize(
+        "scope,calls", [("stage", 2), ("boot", 1), (None, 2)]
+    )
+    def test_scope_between_stages(self, scope, calls, m_subp):
+        """Only boot scope keeps results when the next stage configures."""
+        subp.configure_probe_cache(scope)
+        subp.probe(["dmidecode", "--string", "system-uuid"])
+        subp.configure_probe_cache(scope)
+        subp.probe(["dmidecode", "--string", "system-uuid"])
+        assert calls == m_subp.call_count
+
+    def test_invalid_scope_disables_cache(self, caplog, m_subp):
+        subp.configure_probe_cache("stage")
+        subp.configure_probe_cache("forever")
+        assert not subp.probe_cache.enabled
+        assert "Ignoring invalid probe_cache value 'forever'" in caplog.text
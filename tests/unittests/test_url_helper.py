@@ -3,6 +3,11 @@
 
 import logging
 import pathlib
+import socket
+import threading
+import time
+import urllib.request
+from contextlib import suppress
 from functools import partial
 from threading import Event
 from time import process_time
@@ -16,9 +21,14 @@ import responses
 from cloudinit import url_helper, util, version
 from cloudinit.url_helper import (
     REDACTED,
+    CancellableHTTPAdapter,
+    RequestCancellation,
+    SessionPool,
     UrlError,
     UrlResponse,
     _handle_error,
+    cancellable_requests,
+    cancellable_session,
     dual_stack,
     oauth_headers,
     read_file_or_url,
@@ -276,6 +286,7 @@ class TestReadFileOrUrl:
             assert "broke" == str(context_manager.value)
             # assert default headers, method, url and allow_redirects True
             # Success on 2nd call with FakeSession
+            url_helper.close_session_pool()
             response = read_file_or_url(url)
         assert m_response == response._response
 
@@ -712,6 +723,8 @@ class TestDualStack:
                     addr="you",
                     timeout=1,
                     event=ANY,
+                    session=ANY,
+                    cancellation=None,
                     delay=stagger * 0,
                 ),
                 call(
@@ -719,6 +732,8 @@ class TestDualStack:
                     addr="and",
                     timeout=1,
                     event=ANY,
+                    session=ANY,
+                    cancellation=None,
                     delay=stagger * 1,
                 ),
                 call(
@@ -726,6 +741,8 @@ class TestDualStack:
                     addr="me",
                     timeout=1,
                     event=ANY,
+                    session=ANY,
+                    cancellation=None,
                     delay=stagger * 2,
                 ),
                 call(
@@ -733,6 +750,8 @@ class TestDualStack:
                     addr="and",
                     timeout=1,
                     event=ANY,
+                    session=ANY,
+                    cancellation=None,
                     delay=stagger * 3,
                 ),
                 call(
@@ -740,6 +759,8 @@ class TestDualStack:
                     addr="dog",
                     timeout=1,
                     event=ANY,
+                    session=ANY,
+                    cancellation=None,
                     delay=stagger * 4,
                 ),
             ]
@@ -1004,6 +1025,196 @@ class TestWaitForUrl:
         raise UrlError("test")
 
 
+class TestSessionPool:
+    def test_sessions_are_keyed_by_scheme_host_and_port(self):
+        pool = SessionPool()
+        session = pool.get("http://169.254.169.254/latest/meta-data/")
+        assert session is pool.get("http://169.254.169.254/latest/user-data")
+        assert session is not pool.get("https://169.254.169.254/")
+        assert session is not pool.get("http://169.254.169.254:8080/")
+        assert session is not pool.get("http://[fd00:ec2::254]/")
+        assert 4 == len(pool)
+
+    def test_pool_maxsize_applies_to_adapters(self):
+        pool = SessionPool(pool_maxsize=3)
+        adapter = pool.get("http://myhost/").get_adapter("http://myhost/")
+        assert 3 == adapter._pool_maxsize
+
+    def test_sessions_do_not_retain_cookies(self):
+        pool = SessionPool()
+        session = pool.get("http://myhost/")
+        cookie = requests.cookies.create_cookie("k", "v", domain="myhost")
+        assert not session.cookies.get_policy().set_ok(
+            cookie, urllib.request.Request("http://myhost/")
+        )
+
+    def test_close_closes_and_drops_sessions(self):
+        pool = SessionPool()
+        session = pool.get("http://myhost/")
+        with mock.patch.object(session, "close") as m_close:
+            pool.close()
+        assert 1 == m_close.call_count
+        assert 0 == len(pool)
+        assert session is not pool.get("http://myhost/")
+
+    def test_readurl_reuses_pooled_session(self, mocker):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"yay"
+        m_request = mocker.patch("requests.Session.request", autospec=True)
+        m_request.return_value = response
+
+        readurl("http://myhost/one")
+        readurl("http://myhost/two")
+        assert m_request.call_args_list[0][0][0] is (
+            m_request.call_args_list[1][0][0]
+        )
+
+    def test_set_session_pool_maxsize(self):
+        orig_size = url_helper._session_pool.pool_maxsize
+        try:
+            url_helper.set_session_pool_maxsize(2)
+            session = url_helper._session_pool.get("http://myhost/")
+            assert 2 == session.get_adapter("http://myhost/")._pool_maxsize
+            with pytest.raises(ValueError):
+                url_helper.set_session_pool_maxsize(0)
+        finally:
+            url_helper.set_session_pool_maxsize(orig_size)
+
+
+@pytest.fixture
+def hanging_server():
+    """Local HTTP server which accepts requests but never responds."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(5)
+    accepted = threading.Event()
+    conns = []
+
+    def _serve():
+        with suppress(OSError):
+            while True:
+                conn, _addr = server.accept()
+                conns.append(conn)
+                accepted.set()
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d/" % server.getsockname()[1], accepted
+    server.close()
+    for conn in conns:
+        conn.close()
+
+
+class TestCancellableHTTPAdapter:
+    def test_cancel_aborts_in_flight_request(self, hanging_server):
+        url, accepted = hanging_server
+        session, adapter = cancellable_session()
+        assert isinstance(adapter, CancellableHTTPAdapter)
+        result = {}
+
+        def _read():
+            start = time.monotonic()
+            with pytest.raises(UrlError) as e:
+                readurl(url, timeout=20, session=session)
+            result["elapsed"] = time.monotonic() - start
+            result["error"] = e.value
+
+        thread = threading.Thread(target=_read)
+        thread.start()
+        assert accepted.wait(timeout=5)
+        adapter.cancel()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert result["elapsed"] < 10
+        assert adapter.cancelled
+
+    def test_requests_after_cancel_fail_without_connecting(
+        self, hanging_server
+    ):
+        url, accepted = hanging_server
+        session, adapter = cancellable_session()
+        adapter.cancel()
+        with pytest.raises(UrlError, match="Request cancelled"):
+            readurl(url, timeout=20, session=session)
+        assert not accepted.is_set()
+
+    def test_dual_stack_aborts_losing_readurl(self, hanging_server):
+        """The request still waiting on a response is aborted."""
+        url, accepted = hanging_server
+        finished = threading.Event()
+
+        def _func(addr, timeout):
+            if addr == "slow":
+                try:
+                    return readurl(url, timeout=timeout)
+                finally:
+                    finished.set()
+            assert accepted.wait(timeout=5)
+            return "fast"
+
+        assert ("fast", "fast") == dual_stack(
+            _func, ["slow", "fast"], stagger_delay=0, timeout=20
+        )
+        assert finished.wait(timeout=5)
+
+
+class TestRequestCancellation:
+    def test_cancel_stops_wait_for_url(self, hanging_server):
+        """Requests in flight and sleeps between retries are abandoned."""
+        url, accepted = hanging_server
+        cancellation = RequestCancellation()
+        result = {}
+
+        def _wait():
+            with cancellable_requests(cancellation):
+                result["found"] = wait_for_url(
+                    [url], max_wait=120, timeout=20, sleep_time=30
+                )
+
+        thread = threading.Thread(target=_wait)
+        thread.start()
+        assert accepted.wait(timeout=5)
+        cancellation.cancel()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert (False, None) == result["found"]
+
+    @mock.patch(M_PATH + "time.sleep")
+    def test_readurl_does_not_retry_once_cancelled(self, m_sleep):
+        cancellation = RequestCancellation()
+        cancellation.cancel()
+        with cancellable_requests(cancellation):
+            with pytest.raises(UrlError, match="Request cancelled"):
+                readurl("http://myhost/", retries=5, sec_between=10)
+        assert 0 == m_sleep.call_count
+
+    def test_dual_stack_requests_are_cancelled_with_caller(
+        self, hanging_server
+    ):
+        url, accepted = hanging_server
+        cancellation = RequestCancellation()
+        result = {}
+
+        def _read():
+            with cancellable_requests(cancellation):
+                with pytest.raises(UrlError) as e:
+                    dual_stack(
+                        lambda _addr, timeout: readurl(url, timeout=timeout),
+                        ["one"],
+                        timeout=20,
+                    )
+                result["error"] = e.value
+
+        thread = threading.Thread(target=_read)
+        thread.start()
+        assert accepted.wait(timeout=5)
+        cancellation.cancel()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert "error" in result
+
+
 class TestHandleError:
     def test_handle_error_no_cb(self):
         """Test no callback."""
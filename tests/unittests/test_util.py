@@ -2603,7 +2603,7 @@ class TestReadSeeded:
             ),
         ),
     )
-    @mock.patch(M_PATH + "url_helper.read_file_or_url")
+    @mock.patch("cloudinit.url_helper.read_file_or_url")
     def test_handle_http_urls(
         self, m_read, base, feature_flag, req_urls, tmpdir
     ):
@@ -3007,14 +3007,95 @@ class TestFindDevs:
             "",
         )
         devlist = util.find_devs_with()
-        assert devlist == [
-            '/dev/sda1: UUID="some-uuid" TYPE="ext4" PARTUUID="some-partid"'
-        ]
+        assert devlist == ["/dev/sda1"]
 
         devlist = util.find_devs_with("LABEL_FATBOOT=A_LABEL")
-        assert devlist == [
-            '/dev/sda1: UUID="some-uuid" TYPE="ext4" PARTUUID="some-partid"'
-        ]
+        assert devlist == []
+
+        devlist = util.find_devs_with("PARTUUID=some-partid")
+        assert devlist == ["/dev/sda1"]
+        assert [
+            mock.call(["blkid", "-o", "full"], rcs=[0, 2], decode="replace")
+        ] == m_subp.call_args_list
+
+    @mock.patch("cloudinit.subp.subp")
+    def test_find_devs_with_options_run_blkid(self, m_subp):
+        m_subp.return_value = ("/dev/sr0", "")
+        util.block_devices.find()
+        devlist = util.find_devs_with("TYPE=iso9660", path="/dev/sr0")
+        assert devlist == ["/dev/sr0"]
+        assert (
+            mock.call(
+                ["blkid", "-tTYPE=iso9660", "-odevice", "/dev/sr0"],
+                rcs=[0, 2],
+            )
+            == m_subp.call_args
+        )
+        # Probing a device adds it to the blkid cache, so scan again
+        util.find_devs_with("TYPE=iso9660")
+        assert 3 == m_subp.call_count
+
+
+class TestBlockDeviceInventory:
+    blkid_out = dedent(
+        """\
+        /dev/sda: PTUUID="disk-uuid" PTTYPE="gpt"
+        /dev/sda1: LABEL="cloudimg-rootfs" UUID="root-uuid" TYPE="ext4"
+        /dev/sr0: LABEL="config-2" TYPE="iso9660"
+        /dev/vdb: LABEL="CONFIG-2" TYPE="vfat"
+        """
+    )
+
+    @pytest.fixture
+    def inventory(self, mocker, tmp_path):
+        sys_block = tmp_path / "block"
+        for dev in ("sda", "sda1", "sr0", "vdb"):
+            (sys_block / dev).mkdir(parents=True)
+        link_dir = tmp_path / "by-label"
+        link_dir.mkdir()
+        mocker.patch.object(
+            util.BlockDeviceInventory, "SYS_BLOCK_DIR", str(sys_block)
+        )
+        mocker.patch.object(
+            util.BlockDeviceInventory, "UDEV_LINK_DIRS", (str(link_dir),)
+        )
+        m_subp = mocker.patch(
+            M_PATH + "subp.subp", return_value=(self.blkid_out, "")
+        )
+        inventory = util.BlockDeviceInventory()
+        inventory.link_dir = link_dir
+        inventory.m_subp = m_subp
+        return inventory
+
+    def test_find_answers_queries_from_one_scan(self, inventory):
+        assert ["/dev/sr0"] == inventory.find("LABEL=config-2")
+        assert ["/dev/vdb"] == inventory.find("LABEL=CONFIG-2")
+        assert ["/dev/sr0"] == inventory.find("TYPE=iso9660")
+        assert ["/dev/sda1"] == inventory.find("UUID=root-uuid")
+        assert [] == inventory.find("LABEL=cidata")
+        assert ["/dev/sda", "/dev/sda1", "/dev/sr0", "/dev/vdb"] == (
+            inventory.find()
+        )
+        assert 1 == inventory.scans
+        assert 1 == inventory.m_subp.call_count
+
+    def test_udev_changes_rescan(self, inventory):
+        inventory.find()
+        os.utime(str(inventory.link_dir), ns=(0, 0))
+        inventory.find()
+        assert 2 == inventory.scans
+
+    def test_invalidate_rescans(self, inventory):
+        inventory.find()
+        inventory.invalidate()
+        inventory.find()
+        assert 2 == inventory.scans
+
+    def test_missing_blkid_finds_nothing(self, inventory):
+        error = subp.ProcessExecutionError()
+        error.errno = errno.ENOENT
+        inventory.m_subp.side_effect = error
+        assert [] == inventory.find("TYPE=iso9660")
 
     @mock.patch("cloudinit.subp.subp")
     def test_find_devs_with_openbsd(self, m_subp):